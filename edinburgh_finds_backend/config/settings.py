@@ -1,4 +1,5 @@
 # config/settings.py
+from typing import Literal
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -10,13 +11,69 @@ class Settings(BaseSettings):
     LAOZHANG_API_KEY: str
     FIRECRAWL_API_KEY: str
 
+    # Firecrawl
+    FIRECRAWL_BASE_URL: str = "https://api.firecrawl.dev/v2"
+    SCRAPE_CACHE_DIR: str = "data/cache/scrapes"
+    SCRAPE_CACHE_TTL_HOURS: int = 7 * 24
+    SCRAPE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
     # LLM Model
     LLM_PROVIDER: str
     LLM_MODEL: str
+    LLM_BASE_URL: str | None = None      # override the OpenAI-protocol endpoint (e.g. a local stand-in)
+
+    # LLM throughput (async client: per-provider rate limits, retries, HTTP pool)
+    LLM_REQUESTS_PER_MINUTE: int = 50
+    LLM_TOKENS_PER_MINUTE: int = 400_000
+    LLM_MAX_RETRIES: int = 5
+    LLM_MAX_CONNECTIONS: int = 20
+
+    # Cheaper model for small extractions (rule pre-extraction leaves little for the LLM)
+    LLM_CHEAP_MODEL: str | None = None
+    LLM_CHEAP_MODEL_MAX_INPUT_TOKENS: int = 1500
+
+    # LLM pricing for run metrics (USD per million tokens; 0 = don't estimate cost)
+    LLM_INPUT_PRICE_PER_MTOK: float = 0.0
+    LLM_OUTPUT_PRICE_PER_MTOK: float = 0.0
 
     # Database URL
     DATABASE_URL: str
 
+    # Database engine / connection pool
+    DB_ECHO: bool | Literal["debug"] = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800          # seconds; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    DB_USE_NULLPOOL: bool = False        # True when PgBouncer does the pooling
+    DB_STATEMENT_TIMEOUT_MS: int = 0     # 0 = no statement_timeout
+
+    # LLM extraction cache (content-addressed, on disk)
+    LLM_CACHE_DIR: str = "data/cache/llm_extractions"
+    LLM_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    LLM_CACHE_TTL_DAYS: int = 90
+
+    # Search-query rewrites (utils/query_compressor.py), memoised on disk
+    QUERY_CACHE_DIR: str = "data/cache/query_rewrites"
+    QUERY_BATCH_SIZE: int = 25
+
+    # Proximity search (services/proximity_search.py): "geohash" queries the
+    # indexed geohash column, "memory" a KD-tree of all listings held in-process
+    GEO_SEARCH_BACKEND: Literal["geohash", "memory"] = "geohash"
+    GEO_INDEX_TTL_SECONDS: int = 300     # rebuild the in-memory tree after this
+
+    # Facet bitmaps over entity boolean columns (services/facet_index.py)
+    FACET_INDEX_TTL_SECONDS: int = 300   # rebuild from the DB after this
+
+    # Category taxonomy (canonical categories + synonyms, hot-reloaded on change)
+    CATEGORY_TAXONOMY_PATH: str = "data/taxonomy/categories.json"
+    CATEGORY_FUZZY_MAX_EDITS: int = 0   # typo correction off: real words sit one edit apart
+
+    # Per-run extraction metrics (JSON lines, see services/run_metrics.py)
+    METRICS_ENABLED: bool = True
+    METRICS_PATH: str = "data/metrics/extraction_runs.jsonl"
+
     class Config:
         # Load variables from a .env file automatically
         env_file = ".env"
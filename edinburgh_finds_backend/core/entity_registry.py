@@ -1,39 +1,109 @@
 # core/entity_registry.py
-from typing import Dict, Set, Type
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Type
+
+from pydantic import BaseModel
 from sqlmodel import SQLModel
+
 from database.db_models import Listing, Venue
 from schemas.venue_extraction_schema import VenueSchema
+from utils.listing_facets import venue_summary_facets
+from utils.normalisation import normalise_coordinate_fields, normalise_phone_fields
+
+# Where an extracted field is written
+LISTING = "listing"
+ENTITY = "entity"
 
+# Per-DTO metadata handled by the upsert itself, never routed as a value
+META_FIELDS = frozenset({"field_confidence", "source_info"})
 
-def get_entity_config(entity_type: str) -> Dict[str, object]:
+Normaliser = Callable[[Dict[str, object]], None]
+SummaryFacets = Callable[[Any], Dict[str, Any]]  # entity row → listing_summaries facet columns
+
+
+@dataclass(frozen=True)
+class EntityConfig:
+    """
+    Schema + table + field alignment for one entity type.
+    Built once at registration and shared by every upsert.
+    """
+
+    entity_type: str
+    schema: Type[BaseModel]
+    table: Type[SQLModel]
+    listing_fields: frozenset
+    entity_fields: frozenset
+    routing: Mapping[str, str]  # DTO field → LISTING | ENTITY
+    listing_normalisers: Tuple[Normaliser, ...] = ()
+    summary_facets: Optional[SummaryFacets] = None
+
+
+_REGISTRY: Dict[str, EntityConfig] = {}
+
+
+def register_entity_type(
+    entity_type: str,
+    *,
+    schema: Type[BaseModel],
+    table: Type[SQLModel],
+    listing_normalisers: Tuple[Normaliser, ...] = (),
+    summary_facets: Optional[SummaryFacets] = None,
+) -> EntityConfig:
+    """
+    Register (or replace) an entity type, e.g.
+
+        register_entity_type("retailer", schema=RetailerSchema, table=Retailer,
+                             listing_normalisers=(normalise_phone_fields,))
+    """
+    dto_fields = frozenset(schema.model_fields.keys())
+    listing_fields = frozenset(Listing.model_fields.keys()) & dto_fields
+    entity_fields = frozenset(table.model_fields.keys()) & dto_fields
+
+    routing = {field: ENTITY for field in entity_fields - META_FIELDS}
+    routing.update({field: LISTING for field in listing_fields - META_FIELDS})
+
+    config = EntityConfig(
+        entity_type=entity_type,
+        schema=schema,
+        table=table,
+        listing_fields=listing_fields,
+        entity_fields=entity_fields,
+        routing=MappingProxyType(routing),
+        listing_normalisers=tuple(listing_normalisers),
+        summary_facets=summary_facets,
+    )
+    _REGISTRY[entity_type] = config
+    return config
+
+
+def get_entity_config(entity_type: str) -> EntityConfig:
     """
     Return the schema + table + field alignment for a given entity type.
     """
+    config: Optional[EntityConfig] = _REGISTRY.get(entity_type)
+    if config is None:
+        raise ValueError(f"Unsupported entity_type '{entity_type}'. Add it to entity_registry.")
+    return config
+
+
+# -------------------------------------------------------
+# Registered entity types
+# -------------------------------------------------------
+register_entity_type(
+    "venue",
+    schema=VenueSchema,
+    table=Venue,
+    listing_normalisers=(normalise_phone_fields, normalise_coordinate_fields),
+    summary_facets=venue_summary_facets,
+)
 
-    if entity_type == "venue":
-        dto_fields: Set[str] = set(VenueSchema.model_fields.keys())
-        listing_fields: Set[str] = set(Listing.model_fields.keys()) & dto_fields
-        entity_fields: Set[str] = set(Venue.model_fields.keys()) & dto_fields
-
-        return {
-            "schema": VenueSchema,
-            "table": Venue,
-            "listing_fields": listing_fields,
-            "entity_fields": entity_fields,
-        }
-
-    # --- Add future types here later ---
-    # elif entity_type == "retailer":
-    #     from database.db_models import Retailer
-    #     from schemas.retailer_schema import RetailerSchema
-    #     dto_fields = set(RetailerSchema.model_fields.keys())
-    #     listing_fields = set(Listing.model_fields.keys()) & dto_fields
-    #     entity_fields = set(Retailer.model_fields.keys()) & dto_fields
-    #     return {
-    #         "schema": RetailerSchema,
-    #         "table": Retailer,
-    #         "listing_fields": listing_fields,
-    #         "entity_fields": entity_fields,
-    #     }
-
-    raise ValueError(f"Unsupported entity_type '{entity_type}'. Add it to entity_registry.")
+# --- Add future types here later ---
+# from database.db_models import Retailer
+# from schemas.retailer_schema import RetailerSchema
+# register_entity_type(
+#     "retailer",
+#     schema=RetailerSchema,
+#     table=Retailer,
+#     listing_normalisers=(normalise_phone_fields, normalise_coordinate_fields),
+# )
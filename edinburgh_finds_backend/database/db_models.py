@@ -7,11 +7,45 @@ These models work as BOTH:
 """
 from typing import Optional, List, Dict, Any
 from sqlmodel import SQLModel, Field, Column, Relationship
-from sqlalchemy import ARRAY, String, JSON, TIMESTAMP, Column, DateTime
+from sqlalchemy import ARRAY, DDL, String, JSON, TIMESTAMP, Column, DateTime, Index, Text, event, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from datetime import datetime
+from utils.geo import geohash_or_none
 from utils.id_generation import generate_listing_id, generate_slug
 
+# Postgres text[]; stored as JSON on SQLite (local benchmarks / tests)
+StringArray = ARRAY(String).with_variant(JSON, "sqlite")
+
+# Postgres jsonb (indexable, containment operators); plain JSON elsewhere.
+# Existing json columns are converted by scripts/migrate_jsonb_indexes.py
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+
+# ------------------------------------------------------------------
+# btree_gin: lets one GIN index cover a scalar column (city) together
+# with an array (canonical_categories). Created when the server ships
+# it; otherwise the composite index is skipped and Postgres combines the
+# city btree and the categories GIN index with a BitmapAnd instead.
+# ------------------------------------------------------------------
+def _btree_gin_available(ddl, target, bind, **kw) -> bool:
+    return bind.execute(
+        text("SELECT 1 FROM pg_available_extensions WHERE name = 'btree_gin'")
+    ).first() is not None
+
+
+def _btree_gin_installed(ddl, target, bind, **kw) -> bool:
+    return bind.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'btree_gin'")
+    ).first() is not None
+
+
+event.listen(
+    SQLModel.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gin").execute_if(dialect="postgresql", callable_=_btree_gin_available),
+)
+
 # ====================================================================
 # LISTINGS TABLE - Common fields for all entity types
 # ====================================================================
@@ -35,6 +69,27 @@ class Listing(SQLModel, table=True):
     """
     
     __tablename__ = "listings"
+    __table_args__ = (
+        # canonical_categories @> ARRAY['padel'] (category pages)
+        Index("ix_listings_canonical_categories_gin", "canonical_categories", postgresql_using="gin"),
+        # city = 'Edinburgh' AND canonical_categories @> ARRAY['padel'] in one index scan
+        Index(
+            "ix_listings_city_canonical_categories_gin", "city", "canonical_categories",
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql", callable_=_btree_gin_installed),
+        # other_attributes / opening_hours @> '{"key": ...}' lookups
+        Index(
+            "ix_listings_other_attributes_gin", "other_attributes",
+            postgresql_using="gin", postgresql_ops={"other_attributes": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_listings_opening_hours_gin", "opening_hours",
+            postgresql_using="gin", postgresql_ops={"opening_hours": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # geohash LIKE 'gcvwr%' prefix scans (proximity search); pattern ops
+        # so LIKE can use the index under any database collation
+        Index("ix_listings_geohash", "geohash", postgresql_ops={"geohash": "varchar_pattern_ops"}),
+    )
     
     # ------------------------------------------------------------------
     # IDENTIFICATION (internal)
@@ -78,12 +133,12 @@ class Listing(SQLModel, table=True):
     # ------------------------------------------------------------------    
     categories: Optional[List[str]] = Field(
         default=None,
-        sa_column=Column(ARRAY(String)),
+        sa_column=Column(StringArray),
         description="Raw free-form categories detected by the LLM (uncontrolled labels)"
     )
     canonical_categories: Optional[List[str]] = Field(
         default=None,
-        sa_column=Column(ARRAY(String)),
+        sa_column=Column(StringArray),
         description="Cleaned, controlled categories used for navigation and taxonomy",
         exclude=True
     )
@@ -93,7 +148,7 @@ class Listing(SQLModel, table=True):
     # ------------------------------------------------------------------    
     other_attributes: Optional[Dict[str, Any]] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONDocument),
         description="Dictionary containing any extra attributes not explicitly defined in Listing or Entity models"
     )
     
@@ -126,6 +181,12 @@ class Listing(SQLModel, table=True):
         None,
         description="WGS84 Longitude coordinate (decimal degrees)"
     )
+    geohash: Optional[str] = Field(
+        None,
+        max_length=12,
+        description="Geohash of latitude/longitude (set on save, used for proximity search)",
+        exclude=True
+    )
     
     # ------------------------------------------------------------------
     # CONTACT
@@ -164,7 +225,7 @@ class Listing(SQLModel, table=True):
     # ------------------------------------------------------------------
     opening_hours: Optional[Dict[str, Any]] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONDocument),
         description=(
             "Opening hours per day. May contain strings or nested open/close times. "
             "Example: {'monday': {'open': '05:30', 'close': '22:00'}, "
@@ -177,7 +238,7 @@ class Listing(SQLModel, table=True):
     # ------------------------------------------------------------------
     source_info: Dict[str, Any] = Field(
         default_factory=dict,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONDocument),
         description="Provenance metadata: URLs, method (tavily/manual), timestamps, notes"
     )
 
@@ -186,7 +247,7 @@ class Listing(SQLModel, table=True):
     # ------------------------------------------------------------------
     field_confidence: Dict[str, float] = Field(
         default_factory=dict,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONDocument),
         description="Per-field confidence scores used for overwrite decisions"
     )
 
@@ -214,7 +275,7 @@ class Listing(SQLModel, table=True):
     )
     external_ids: Optional[Dict[str, Any]] = Field(
         default=None,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONDocument),
         description="External system IDs (e.g., {'wordpress': 123, 'google': 'abc'})",
         exclude=True
     )
@@ -235,6 +296,13 @@ class Listing(SQLModel, table=True):
         if not self.slug:
             self.slug = generate_slug(self.entity_name)
 
+
+@event.listens_for(Listing, "before_insert")
+@event.listens_for(Listing, "before_update")
+def _set_geohash(mapper, connection, listing: Listing) -> None:
+    """Keep geohash in step with latitude/longitude on every ORM write."""
+    listing.geohash = geohash_or_none(listing.latitude, listing.longitude)
+
 # ====================================================================
 # ENTITY-SPECIFIC TABLES
 # ====================================================================
@@ -442,9 +510,120 @@ class Venue(SQLModel, table=True):
     # ===========================
     field_confidence: Dict[str, float] = Field(
         default_factory=dict,
-        sa_column=Column(JSON),
+        sa_column=Column(JSONDocument),
         description="Per-field confidence scores used for overwrite decisions"
     )
 
     # Relationship back to listing
     listing: Optional[Listing] = Relationship(back_populates="venue")
+
+
+# ====================================================================
+# READ MODELS
+# ====================================================================
+
+class ListingSummary(SQLModel, table=True):
+    """
+    Denormalised, narrow row per listing for listing / category / facet pages:
+    the Listing fields those pages show plus facets precomputed from the
+    entity row (sports offered, court counts, has_* flags), so a page reads
+    one row instead of joining listings and venues.
+
+    Maintained by services/listing_summaries.py: refreshed from the upsert
+    for the listings that changed; scripts/rebuild_listing_summaries.py
+    rebuilds it in full.
+    """
+
+    __tablename__ = "listing_summaries"
+    __table_args__ = (
+        # sports @> ARRAY['padel'] (facet pages)
+        Index("ix_listing_summaries_sports_gin", "sports", postgresql_using="gin"),
+        Index("ix_listing_summaries_canonical_categories_gin", "canonical_categories", postgresql_using="gin"),
+    )
+
+    listing_id: str = Field(
+        foreign_key="listings.listing_id",
+        primary_key=True,
+        ondelete="CASCADE",
+    )
+
+    # ------------------------------------------------------------------
+    # LISTING FIELDS
+    # ------------------------------------------------------------------
+    entity_name: str
+    entity_type: str = Field(index=True)
+    slug: str = Field(unique=True, index=True)
+    summary: Optional[str] = None
+    canonical_categories: Optional[List[str]] = Field(default=None, sa_column=Column(StringArray))
+    street_address: Optional[str] = None
+    city: Optional[str] = Field(default=None, index=True)
+    postcode: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    phone: Optional[str] = None
+    website_url: Optional[str] = None
+    opening_hours: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSONDocument))
+    average_rating: Optional[float] = None
+    review_count: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # FACETS (utils/listing_facets.py)
+    # ------------------------------------------------------------------
+    sports: List[str] = Field(default_factory=list, sa_column=Column(StringArray, nullable=False))
+    court_counts: Dict[str, int] = Field(default_factory=dict, sa_column=Column(JSONDocument, nullable=False))
+    total_courts: int = 0
+    has_pool: bool = False
+    has_gym: bool = False
+    has_classes: bool = False
+    has_spa: bool = False
+    has_food_and_drink: bool = False
+    has_creche: bool = False
+    has_parking: bool = False
+    has_ev_charging: bool = False
+
+    # ------------------------------------------------------------------
+    # FULL-TEXT SEARCH (utils/search_text.py; services/text_search.py)
+    # ------------------------------------------------------------------
+    search_keywords: Optional[str] = Field(default=None, sa_column=Column(Text))
+    search_body: Optional[str] = Field(default=None, sa_column=Column(Text))
+
+    refreshed_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+            onupdate=func.now(),
+        ),
+    )
+
+
+# ------------------------------------------------------------------
+# Postgres only: weighted tsvectors, generated (so every write path keeps
+# them current) and GIN-indexed. search_vector covers name / keywords /
+# body; search_head_vector just name / keywords, small enough to find name
+# matches first for very common terms. Not mapped on the model;
+# services/text_search.py queries them by name.
+# ------------------------------------------------------------------
+SEARCH_VECTOR_DDL = (
+    """
+    ALTER TABLE listing_summaries ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(entity_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(search_keywords, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(search_body, '')), 'C')
+    ) STORED
+    """,
+    """
+    ALTER TABLE listing_summaries ADD COLUMN IF NOT EXISTS search_head_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(entity_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(search_keywords, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_listing_summaries_search_vector ON listing_summaries USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_listing_summaries_search_head_vector ON listing_summaries USING gin (search_head_vector)",
+)
+
+for _statement in SEARCH_VECTOR_DDL:
+    event.listen(ListingSummary.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
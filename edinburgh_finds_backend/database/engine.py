@@ -1,8 +1,100 @@
 # database/engine.py
+import threading
+import time
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
 from sqlmodel import SQLModel, create_engine
 from config.settings import settings   # loads DATABASE_URL from .env
 
-engine = create_engine(settings.DATABASE_URL, echo=True)
+
+# ------------------------------------------------------------------
+# POOL STATS
+# ------------------------------------------------------------------
+class _PoolWaitStats:
+    """Process-wide checkout counters (survive pool.recreate() on dispose)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+
+    def record(self, waited: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_s += waited
+            self.max_wait_s = max(self.max_wait_s, waited)
+
+
+_wait_stats = _PoolWaitStats()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited (incl. connecting)."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            _wait_stats.record(time.perf_counter() - started)
+
+
+# ------------------------------------------------------------------
+# ENGINE
+# ------------------------------------------------------------------
+def _engine_kwargs(database_url: str) -> dict:
+    kwargs = {"echo": settings.DB_ECHO}
+
+    if make_url(database_url).get_backend_name() != "postgresql":
+        return kwargs  # e.g. SQLite for local benchmarks: driver defaults
+
+    if settings.DB_USE_NULLPOOL:
+        # External pooler (PgBouncer) owns the connections
+        kwargs["poolclass"] = NullPool
+    else:
+        kwargs.update(
+            poolclass=TimedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        # Startup option; PgBouncer needs ignore_startup_parameters=options
+        kwargs["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+
+    return kwargs
+
+
+engine = create_engine(settings.DATABASE_URL, **_engine_kwargs(settings.DATABASE_URL))
+
+
+def get_pool_stats() -> dict:
+    """Snapshot of connection-pool usage, for batch-run logging."""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+
+    if isinstance(pool, TimedQueuePool):
+        stats.update(
+            checkouts=_wait_stats.checkouts,
+            total_wait_s=round(_wait_stats.total_wait_s, 4),
+            max_wait_s=round(_wait_stats.max_wait_s, 4),
+        )
+
+    return stats
+
 
 def create_db_and_tables():
     # Ensure model definitions are imported before running create_all()
@@ -5,18 +5,60 @@ import json
 from pathlib import Path
 
 from services.extraction_pipeline import process_raw_text
-from schemas.venue_extraction_schema import VenueSchema 
+from schemas.venue_extraction_schema import VenueSchema
 
 def main():
     parser = argparse.ArgumentParser(description="Edinburgh Finds — Extraction Pipeline")
-    parser.add_argument("--entity-name", required=True)
-    parser.add_argument("--entity-type", required=True, choices=["venue", "club", "retailer"])
+    parser.add_argument("--entity-name")
+    parser.add_argument("--entity-type", choices=["venue", "club", "retailer"])
     parser.add_argument("--file", help="Optional path to a raw text file")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the LLM (ignore the extraction cache)")
+    parser.add_argument("--incremental", action="store_true", help="Skip or narrow extraction when the text barely changed")
+    parser.add_argument("--chunked", action="store_true", help="Extract per field group in parallel instead of one large call")
+    parser.add_argument("--no-compact", action="store_true", help="Send the gather text to the LLM without compaction")
+    parser.add_argument("--no-pre-extract", action="store_true", help="Let the LLM extract contact/location fields too (no rule pre-extraction)")
+
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument("--manifest", help="JSON manifest of {entity_name, entity_type, file} entries")
+    batch.add_argument("--gather-dir", help="Folder of gather files, e.g. data/venues (uses --entity-type)")
+    batch.add_argument("--concurrency", type=int, default=4, help="Max extractions in flight")
+    batch.add_argument("--resume", help="Existing run log to resume (skips entities that succeeded)")
     args = parser.parse_args()
 
     entity_type = args.entity_type
     entity_name = args.entity_name
 
+    # ------------------------------------------
+    # BATCH MODE
+    # ------------------------------------------
+    if args.manifest or args.gather_dir:
+        from services.batch_runner import RunLog, discover_gather_files, load_manifest, run_batch
+
+        if args.manifest:
+            items = load_manifest(args.manifest)
+        else:
+            if not entity_type:
+                parser.error("--gather-dir requires --entity-type")
+            items = discover_gather_files(args.gather_dir, entity_type)
+
+        run_log = RunLog(args.resume) if args.resume else None
+        summary = run_batch(
+            items,
+            concurrency=args.concurrency,
+            run_log=run_log,
+            use_cache=not args.no_cache,
+            incremental=args.incremental,
+            chunked=args.chunked,
+            compact=not args.no_compact,
+            pre_extract=not args.no_pre_extract,
+        )
+
+        print(f"\nCOMPLETED (Batch Mode): {json.dumps(summary)}")
+        return
+
+    if not (entity_name and entity_type):
+        parser.error("--entity-name and --entity-type are required (or use --manifest / --gather-dir)")
+
     # ------------------------------------------
     # MANUAL INPUT MODE
     # ------------------------------------------
@@ -32,7 +74,12 @@ def main():
             entity_name=entity_name,
             entity_type=entity_type,
             raw_text=raw_text,
-            source_type="manual_file"
+            source_type="manual_file",
+            use_cache=not args.no_cache,
+            incremental=args.incremental,
+            chunked=args.chunked,
+            compact=not args.no_compact,
+            pre_extract=not args.no_pre_extract,
         )
 
         print(f"\nCOMPLETED (Manual File Mode): {result}")
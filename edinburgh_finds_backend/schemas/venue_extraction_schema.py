@@ -6,8 +6,68 @@ This schema is generated directly from the SQLModel database definitions
 It provides a safe, pure Pydantic model for use with Instructor and APIs.
 """
 
+from functools import lru_cache
+from pydantic import BaseModel
 from database.db_models import Venue, Listing
-from utils.model_conversion import to_pydantic_model
+from utils.model_conversion import to_partial_model, to_pydantic_model
 
 # ✅ Dynamically generate a pure Pydantic model
 VenueSchema = to_pydantic_model([Listing, Venue])
+
+
+# ====================================================================
+# TOPICAL FIELD GROUPS (for chunked extraction)
+# ====================================================================
+# Mirrors the section comments in db_models.Venue. Each Venue field is
+# assigned to the first group with a matching name prefix; Listing fields
+# form the "listing" group. Adding a Venue field that matches no prefix
+# fails loudly at import time so the groups never silently drift.
+
+META_FIELDS = ("field_confidence", "source_info")
+
+VENUE_GROUP_PREFIXES = {
+    "racquet_sports": ("tennis", "padel", "pickleball", "badminton", "squash", "table_tennis"),
+    "football": ("football",),
+    "swimming": ("swimming", "indoor_pool", "outdoor_pool", "family_swim", "adult_only_swim"),
+    "gym_classes": ("gym", "classes", "hiit_classes", "yoga_classes", "pilates_classes",
+                    "strength_classes", "cycling_studio", "functional_training_zone"),
+    "spa": ("spa", "sauna", "steam_room", "hydro_pool", "hot_tub", "outdoor_spa",
+            "ice_cold_plunge", "relaxation_area"),
+    "amenities": ("amenities", "restaurant", "bar", "cafe", "childrens_menu", "wifi"),
+    "family": ("family_summary", "creche", "kids", "holiday_club", "play_area"),
+    "parking_transport": ("parking", "disabled_parking", "parent_child_parking", "ev_charging",
+                          "public_transport_nearby", "nearest_railway_station"),
+    "reviews": ("reviews", "average_rating", "review_count", "google_review_count", "facebook_likes"),
+}
+
+
+def _build_field_groups() -> dict[str, tuple[str, ...]]:
+    groups: dict[str, list[str]] = {"listing": []}
+    groups.update({group: [] for group in VENUE_GROUP_PREFIXES})
+
+    for field_name in VenueSchema.model_fields:
+        if field_name in META_FIELDS:
+            continue
+        if field_name in Listing.model_fields:
+            groups["listing"].append(field_name)
+            continue
+        group = next(
+            (g for g, prefixes in VENUE_GROUP_PREFIXES.items() if field_name.startswith(prefixes)),
+            None,
+        )
+        if group is None:
+            raise ValueError(f"Venue field '{field_name}' is not in any VENUE_GROUP_PREFIXES group")
+        groups[group].append(field_name)
+
+    return {group: tuple(fields) for group, fields in groups.items()}
+
+
+VENUE_FIELD_GROUPS = _build_field_groups()
+
+
+@lru_cache(maxsize=None)
+def get_group_schema(group: str) -> type[BaseModel]:
+    """Partial VenueSchema for one field group (+ field_confidence, and source_info for 'listing')."""
+    fields = VENUE_FIELD_GROUPS[group] + (("field_confidence", "source_info") if group == "listing" else ("field_confidence",))
+    name = "VenueSchema_" + "".join(part.capitalize() for part in group.split("_"))
+    return to_partial_model(VenueSchema, fields, name)
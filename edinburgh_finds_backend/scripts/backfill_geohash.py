@@ -0,0 +1,113 @@
+# scripts/backfill_geohash.py
+
+"""
+Add listings.geohash to an existing database and fill it in for every
+listing with coordinates (new writes get it from the Listing save hook):
+
+    1. ALTER TABLE listings ADD COLUMN IF NOT EXISTS geohash
+    2. geohash for every listing, in primary-key order (keyset pagination),
+       one UPDATE ... FROM jsonb_to_recordset(...) per batch
+    3. ix_listings_geohash, built CONCURRENTLY, then ANALYZE
+
+Idempotent: a re-run only touches rows whose geohash is missing or stale.
+
+    python -m scripts.backfill_geohash [--batch-size 1000] [--dry-run]
+"""
+
+import argparse
+import json
+import time
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateIndex
+from sqlmodel import Session, select
+
+from database.db_models import Listing
+from database.engine import engine
+from utils.geo import geohash_or_none
+
+ADD_COLUMN_SQL = "ALTER TABLE listings ADD COLUMN IF NOT EXISTS geohash VARCHAR(12)"
+
+UPDATE_BATCH_SQL = text("""
+    UPDATE listings AS l
+    SET geohash = v.geohash
+    FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS v(listing_id text, geohash text)
+    WHERE l.listing_id = v.listing_id
+""")
+
+
+def _index_sql() -> str:
+    index = next(i for i in Listing.__table__.indexes if i.name == "ix_listings_geohash")
+    ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect))
+    return ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+
+
+def backfill_geohash(batch_size: int = 1000, dry_run: bool = False) -> dict:
+    print(f"🌍 Backfilling listings.geohash (batch size {batch_size}){' (dry run)' if dry_run else ''}")
+    started = time.perf_counter()
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        has_column = any(c["name"] == "geohash" for c in inspect(conn).get_columns("listings"))
+        print(f"   {ADD_COLUMN_SQL};")
+        if not dry_run:
+            conn.execute(text(ADD_COLUMN_SQL))
+            has_column = True
+
+    columns = [Listing.listing_id, Listing.latitude, Listing.longitude]
+    if has_column:
+        columns.append(Listing.geohash)
+
+    scanned = changed = 0
+    last_id = ""
+    with Session(engine) as session:
+        while True:
+            rows = session.exec(
+                select(*columns)
+                .where(Listing.listing_id > last_id)
+                .order_by(Listing.listing_id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            updates = []
+            for row in rows:
+                listing_id, lat, lon = row[:3]
+                geohash = geohash_or_none(lat, lon)
+                current = row[3] if has_column else None
+                if geohash != current:
+                    updates.append({"listing_id": listing_id, "geohash": geohash})
+
+            if updates and not dry_run:
+                session.execute(UPDATE_BATCH_SQL, {"rows": json.dumps(updates)})
+                session.commit()
+
+            scanned += len(rows)
+            changed += len(updates)
+            last_id = rows[-1][0]
+            print(f"   … {scanned} scanned, {changed} changed")
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for statement in (_index_sql(), "ANALYZE listings"):
+            print(f"   {statement};")
+            if not dry_run:
+                conn.execute(text(statement))
+
+    summary = {
+        "scanned": scanned,
+        "changed": changed,
+        "dry_run": dry_run,
+        "duration_s": round(time.perf_counter() - started, 2),
+    }
+    print(f"✅ Done: {summary}")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add and backfill listings.geohash for proximity search")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="Print the SQL and count changes without writing")
+    args = parser.parse_args()
+
+    backfill_geohash(batch_size=args.batch_size, dry_run=args.dry_run)
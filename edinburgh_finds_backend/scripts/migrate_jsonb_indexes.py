@@ -0,0 +1,104 @@
+# scripts/migrate_jsonb_indexes.py
+
+"""
+Bring an existing database in line with the indexes declared on
+db_models.Listing (create_all() only creates missing tables, it never
+alters existing ones):
+
+    1. json → jsonb for every JSON column of listings / venues
+       (ALTER ... TYPE jsonb USING col::jsonb; rewrites the table and holds an
+       ACCESS EXCLUSIVE lock while it runs — fine at our size, schedule it
+       for a quiet moment on a big table)
+    2. CREATE EXTENSION btree_gin, when the server offers it
+    3. the GIN indexes, built CONCURRENTLY (reads and writes continue)
+    4. ANALYZE, so the planner sees the new indexes straight away
+
+Every step is idempotent; re-running is a no-op.
+
+    python -m scripts.migrate_jsonb_indexes [--dry-run]
+"""
+
+import argparse
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.schema import CreateIndex
+
+from database.db_models import Listing, Venue
+from database.engine import engine
+
+TABLES = (Listing.__table__, Venue.__table__)
+
+
+def _json_columns_to_convert(conn) -> list[tuple[str, str]]:
+    """(table, column) pairs declared jsonb in the models but still json in the DB."""
+    current = {
+        (table, column): data_type
+        for table, column, data_type in conn.execute(text("""
+            SELECT table_name, column_name, data_type
+            FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name IN ('listings', 'venues')
+        """))
+    }
+    pending = []
+    for table in TABLES:
+        for column in table.columns:
+            declared = column.type.dialect_impl(engine.dialect)
+            if isinstance(declared, JSONB) and current.get((table.name, column.name)) == "json":
+                pending.append((table.name, column.name))
+    return pending
+
+
+def _gin_indexes():
+    for table in TABLES:
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            if index.dialect_options["postgresql"]["using"] == "gin":
+                yield index
+
+
+def migration_statements(conn) -> list[str]:
+    statements = [
+        f"ALTER TABLE {table} ALTER COLUMN {column} TYPE jsonb USING {column}::jsonb"
+        for table, column in _json_columns_to_convert(conn)
+    ]
+
+    btree_gin_available = conn.execute(
+        text("SELECT 1 FROM pg_available_extensions WHERE name = 'btree_gin'")
+    ).first() is not None
+    if btree_gin_available:
+        statements.append("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    else:
+        print("⚠️  btree_gin is not available on this server: skipping the city + category "
+              "composite index (Postgres will BitmapAnd the city and category indexes instead)")
+
+    for index in _gin_indexes():
+        if len(index.expressions) > 1 and not btree_gin_available:
+            continue
+        ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect))
+        statements.append(ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1))
+
+    statements += [f"ANALYZE {table.name}" for table in TABLES]
+    return statements
+
+
+def migrate(dry_run: bool = False) -> list[str]:
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        statements = migration_statements(conn)
+        print(f"🛠️  {len(statements)} migration statement(s){' (dry run)' if dry_run else ''}")
+        for statement in statements:
+            print(f"   {statement};")
+            if not dry_run:
+                conn.execute(text(statement))
+
+    if not dry_run:
+        print("✅ Migration done")
+    return statements
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="json → jsonb and GIN indexes for listings / venues")
+    parser.add_argument("--dry-run", action="store_true", help="Print the SQL without running it")
+    args = parser.parse_args()
+
+    migrate(dry_run=args.dry_run)
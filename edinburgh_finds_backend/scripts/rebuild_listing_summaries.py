@@ -0,0 +1,88 @@
+# scripts/rebuild_listing_summaries.py
+
+"""
+Rebuild listing_summaries from listings + their entity rows. Upserts keep
+the table current for the listings they change; run this once after
+creating the table, and again whenever utils/listing_facets.py or
+utils/search_text.py changes. Creates the table, or adds columns introduced
+since it was created (full-text search), first.
+
+Listings are read in primary-key order (keyset pagination); each batch loads
+its entity rows with one query per entity table and writes only the summary
+rows whose values differ. Summary rows of deleted listings go with them
+(ON DELETE CASCADE).
+
+    python -m scripts.rebuild_listing_summaries [--batch-size 1000] [--dry-run]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import inspect, text
+from sqlmodel import Session, select
+
+from database.db_models import SEARCH_VECTOR_DDL, Listing, ListingSummary
+from database.engine import engine
+from services.listing_summaries import refresh_listing_summaries, summary_rows
+
+
+def _ensure_schema() -> None:
+    table = ListingSummary.__table__
+    table.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+        for column in ("search_keywords", "search_body"):
+            if column not in existing:
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column} TEXT"))
+        if conn.dialect.name == "postgresql":
+            for statement in SEARCH_VECTOR_DDL:
+                conn.execute(text(statement))
+
+
+def rebuild_listing_summaries(batch_size: int = 1000, dry_run: bool = False) -> dict:
+    _ensure_schema()
+    print(f"🧾 Rebuilding listing summaries (batch size {batch_size}){' (dry run)' if dry_run else ''}")
+
+    scanned = written = 0
+    last_id = ""
+    started = time.perf_counter()
+
+    with Session(engine) as session:
+        while True:
+            listings = session.exec(
+                select(Listing)
+                .where(Listing.listing_id > last_id)
+                .order_by(Listing.listing_id)
+                .limit(batch_size)
+            ).all()
+            if not listings:
+                break
+            scanned += len(listings)
+            last_id = listings[-1].listing_id
+
+            written += refresh_listing_summaries(session, summary_rows(session, listings))
+            if dry_run:
+                session.rollback()
+            else:
+                session.commit()
+            # Identity map is not needed across batches
+            session.expunge_all()
+            print(f"   … {scanned} scanned, {written} written")
+
+    summary = {
+        "scanned": scanned,
+        "written": written,
+        "dry_run": dry_run,
+        "duration_s": round(time.perf_counter() - started, 2),
+    }
+    print(f"✅ Done: {summary}")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild listing_summaries from listings + entity rows")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="Count changes without writing rows")
+    args = parser.parse_args()
+
+    rebuild_listing_summaries(batch_size=args.batch_size, dry_run=args.dry_run)
@@ -0,0 +1,90 @@
+# scripts/recanonicalize_listings.py
+
+"""
+Recompute `canonical_categories` for every listing from its stored raw
+`categories`, using the current taxonomy file. No LLM calls.
+
+Listings are read in primary-key order (keyset pagination) and each batch
+of changed rows is written back with a single UPDATE ... FROM
+jsonb_to_recordset(...) statement. Their listing_summaries rows (canonical
+categories, search keywords) are refreshed in the same transaction.
+
+    python -m scripts.recanonicalize_listings [--batch-size 1000] [--dry-run]
+"""
+
+import argparse
+import json
+import time
+
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from database.db_models import Listing
+from database.engine import engine
+from services.listing_summaries import refresh_summaries_for
+from utils.category_mapping import get_category_matcher, get_taxonomy
+
+UPDATE_BATCH_SQL = text("""
+    UPDATE listings AS l
+    SET canonical_categories = ARRAY(SELECT jsonb_array_elements_text(v.canonical_categories)),
+        updated_at = now()
+    FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS v(listing_id text, canonical_categories jsonb)
+    WHERE l.listing_id = v.listing_id
+""")
+
+
+def recanonicalize_listings(batch_size: int = 1000, dry_run: bool = False) -> dict:
+    matcher = get_category_matcher()
+    taxonomy = get_taxonomy()
+    print(f"🏷️  Re-canonicalising listings with taxonomy v{taxonomy.version} (batch size {batch_size})")
+
+    scanned = changed = 0
+    last_id = ""
+    started = time.perf_counter()
+
+    with Session(engine) as session:
+        while True:
+            rows = session.exec(
+                select(Listing.listing_id, Listing.categories, Listing.canonical_categories)
+                .where(Listing.listing_id > last_id)
+                .order_by(Listing.listing_id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            updates = []
+            for listing_id, categories, current in rows:
+                canonical = matcher.map(categories or [])
+                if canonical != sorted(current or []):
+                    updates.append({"listing_id": listing_id, "canonical_categories": canonical})
+
+            if updates and not dry_run:
+                session.execute(UPDATE_BATCH_SQL, {"rows": json.dumps(updates)})
+                refresh_summaries_for(session, [update["listing_id"] for update in updates])
+                session.commit()
+                session.expunge_all()
+
+            scanned += len(rows)
+            changed += len(updates)
+            last_id = rows[-1][0]
+            print(f"   … {scanned} scanned, {changed} changed")
+
+    summary = {
+        "taxonomy_version": taxonomy.version,
+        "scanned": scanned,
+        "changed": changed,
+        "dry_run": dry_run,
+        "duration_s": round(time.perf_counter() - started, 2),
+    }
+    print(f"✅ Done: {summary}")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute canonical_categories for all listings")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="Count changes without writing")
+    args = parser.parse_args()
+
+    recanonicalize_listings(batch_size=args.batch_size, dry_run=args.dry_run)
@@ -0,0 +1,159 @@
+# scripts/replay_processed.py
+
+"""
+Rebuild the database from stored processed JSON — no LLM calls.
+
+Every data/<type>s/<slug>/processed/*.json holds the listing + entity state
+written by the extraction pipeline. This job streams those files in
+timestamp order, turns each back into its extraction DTO and feeds them
+through upsert_many in batches, so confidence merging behaves exactly as it
+did originally. Use it to:
+
+    - rebuild a fresh database
+    - re-apply data after a schema migration
+    - backfill derived columns (canonical_categories is recomputed from the
+      raw categories with the current taxonomy)
+
+Files written before entity_name / entity_type were stored in the JSON get
+them from the folder layout (slug → "Title Case Name", "venues" → "venue").
+
+    python -m scripts.replay_processed [--root data] [--entity-type venue]
+                                       [--latest-only] [--batch-size 500]
+"""
+
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from core.entity_registry import get_entity_config
+from database.engine import create_db_and_tables
+from services.batch_runner import slug_to_entity_name
+from services.upsert_entity import upsert_many
+
+TIMESTAMP_RE = re.compile(r"(\d{8}_\d{6})\.json$")
+
+
+def processed_timestamp(path: Path) -> str:
+    """'slug__processed__20251125_112124.json' → '20251125_112124' ('' if absent)."""
+    match = TIMESTAMP_RE.search(path.name)
+    return match.group(1) if match else ""
+
+
+def discover_processed_files(
+    root: str | Path = "data",
+    entity_type: Optional[str] = None,
+    latest_only: bool = False,
+) -> list[Path]:
+    """All processed JSON files under `root`, oldest first."""
+    pattern = f"{entity_type}s/*/processed/*.json" if entity_type else "*/*/processed/*.json"
+    files = sorted(Path(root).glob(pattern), key=lambda p: (processed_timestamp(p), str(p)))
+
+    if latest_only:
+        # Each dump is the full merged state, so the newest one per entity is enough
+        latest = {p.parent.parent: p for p in files}
+        files = sorted(latest.values(), key=lambda p: (processed_timestamp(p), str(p)))
+    return files
+
+
+def load_replay_item(path: Path) -> Optional[dict]:
+    """Turn one processed JSON file into an upsert_many item (None if unsupported)."""
+    doc = json.loads(path.read_text(encoding="utf-8"))
+
+    slug_dir = path.parent.parent
+    entity_type = doc.get("entity_type") or slug_dir.parent.name.removesuffix("s")
+    entity_name = doc.get("entity_name") or slug_to_entity_name(slug_dir.name)
+
+    try:
+        config = get_entity_config(entity_type)
+    except ValueError:
+        print(f"⏭️  {path.name}: unsupported entity type '{entity_type}'")
+        return None
+
+    listing = doc.get("listing") or {}
+    entity = doc.get("entity") or {}
+
+    values = {**entity, **listing}
+    payload = {k: v for k, v in values.items() if k in config.schema.model_fields}
+    payload["field_confidence"] = {
+        **(entity.get("field_confidence") or {}),
+        **(listing.get("field_confidence") or {}),
+    }
+    payload["source_info"] = listing.get("source_info") or {}
+
+    return {
+        "data": config.schema.model_validate(payload),
+        "entity_name": entity_name,
+        "entity_type": entity_type,
+    }
+
+
+def _chunks(items: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def replay_processed(
+    root: str | Path = "data",
+    *,
+    entity_type: Optional[str] = None,
+    latest_only: bool = False,
+    batch_size: int = 500,
+) -> dict:
+    files = discover_processed_files(root, entity_type, latest_only)
+    print(f"\n♻️  Replaying {len(files)} processed file(s) from {root} (batch size {batch_size})")
+
+    create_db_and_tables()
+
+    started = time.perf_counter()
+    failed: list[str] = []
+
+    def items() -> Iterator[dict]:
+        for path in files:
+            try:
+                item = load_replay_item(path)
+            except Exception as e:  # bad file shouldn't stop the rebuild
+                print(f"❌ {path}: {e}")
+                failed.append(str(path))
+                continue
+            if item is not None:
+                yield item
+
+    upserted = 0
+    for chunk in _chunks(items(), batch_size):
+        upsert_many(chunk, batch_size=batch_size)
+        upserted += len(chunk)
+        print(f"   … {upserted} upserted")
+
+    summary = {
+        "files": len(files),
+        "upserted": upserted,
+        "failed": failed,
+        "duration_s": round(time.perf_counter() - started, 2),
+    }
+    print(f"✅ Replay done: {summary}")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the DB from processed JSON (no LLM calls)")
+    parser.add_argument("--root", default="data", help="Data folder containing <type>s/<slug>/processed/")
+    parser.add_argument("--entity-type", choices=["venue", "club", "retailer"])
+    parser.add_argument("--latest-only", action="store_true", help="Only the newest file per entity")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    replay_processed(
+        args.root,
+        entity_type=args.entity_type,
+        latest_only=args.latest_only,
+        batch_size=args.batch_size,
+    )
@@ -0,0 +1,276 @@
+# services/batch_runner.py
+
+"""
+Batch extraction runner.
+
+Runs many entities through `process_raw_text` using a bounded thread pool so
+total wall-clock time is bounded by LLM concurrency rather than the sum of
+every call.
+
+Inputs:
+    - a JSON manifest: [{"entity_name": ..., "entity_type": ..., "file": ...}, ...]
+    - a gather directory: data/<type>s/<slug>/gather/*.txt (latest file per slug)
+
+Every finished entity is appended to a JSON-lines run log, so an interrupted
+run can be resumed and will skip entities that already succeeded.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, TypedDict
+
+from database.engine import get_pool_stats
+from services.extraction_pipeline import process_raw_text
+from services.run_metrics import RunSummary, summarise_runs
+
+RUN_LOG_DIR = Path("data") / "runs"
+
+
+class BatchSummary(TypedDict):
+    run_log: str
+    processed: int
+    succeeded: int
+    failed: int
+    skipped: int
+    wall_time_s: float
+    db_pool: dict
+    metrics: RunSummary
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    entity_name: str
+    entity_type: str
+    file: Path
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used by the run log to detect finished work."""
+        return f"{self.entity_type}:{self.entity_name}:{self.file.as_posix()}"
+
+
+# -------------------------------------------------------
+# INPUT DISCOVERY
+# -------------------------------------------------------
+def slug_to_entity_name(slug: str) -> str:
+    """'edinburgh_sports_club' -> 'Edinburgh Sports Club'"""
+    return " ".join(part.capitalize() for part in slug.split("_") if part)
+
+
+def load_manifest(manifest_path: str | Path) -> list[BatchItem]:
+    """
+    Load a JSON manifest of entities to process.
+    Relative file paths are resolved against the manifest's folder.
+    """
+    manifest_path = Path(manifest_path)
+    entries = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    items = []
+    for entry in entries:
+        file_path = Path(entry["file"])
+        if not file_path.is_absolute():
+            file_path = manifest_path.parent / file_path
+        items.append(
+            BatchItem(
+                entity_name=entry["entity_name"],
+                entity_type=entry["entity_type"],
+                file=file_path,
+            )
+        )
+    return items
+
+
+def _gather_timestamp(path: Path) -> str:
+    # <slug>__gather__<source>__YYYYMMDD_HHMM.txt → "YYYYMMDD_HHMM"
+    parts = path.stem.split("__")
+    return parts[-1] if len(parts) >= 4 else ""
+
+
+def discover_gather_files(root: str | Path, entity_type: str) -> list[BatchItem]:
+    """
+    Find the latest gather file for every entity under `root`.
+
+    Supports both layouts:
+        root/<slug>/gather/*.txt   (e.g. data/venues)
+        root/*.txt                 (a flat folder of gather files)
+    """
+    root = Path(root)
+    latest: dict[str, Path] = {}
+
+    candidates = list(root.glob("*/gather/*.txt")) + list(root.glob("*.txt"))
+    for path in candidates:
+        slug = path.parent.parent.name if path.parent.name == "gather" else path.stem.split("__")[0]
+        current = latest.get(slug)
+        if current is None or _gather_timestamp(path) > _gather_timestamp(current):
+            latest[slug] = path
+
+    return [
+        BatchItem(entity_name=slug_to_entity_name(slug), entity_type=entity_type, file=path)
+        for slug, path in sorted(latest.items())
+    ]
+
+
+# -------------------------------------------------------
+# RUN LOG
+# -------------------------------------------------------
+class RunLog:
+    """Append-only JSON-lines log of per-entity outcomes (thread-safe)."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def new(cls) -> "RunLog":
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return cls(RUN_LOG_DIR / f"batch__{timestamp}.jsonl")
+
+    def completed_keys(self) -> set[str]:
+        """Keys of entities that already finished successfully."""
+        if not self.path.exists():
+            return set()
+
+        done = set()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # tolerate a half-written last line after a crash
+                if record.get("status") == "ok":
+                    done.add(record["key"])
+        return done
+
+    def write(self, record: dict):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+
+# -------------------------------------------------------
+# EXECUTION
+# -------------------------------------------------------
+def _run_item(item: BatchItem, source_type: str, options: dict) -> dict:
+    started = time.perf_counter()
+    record = {
+        "key": item.key,
+        "entity_name": item.entity_name,
+        "entity_type": item.entity_type,
+        "file": str(item.file),
+    }
+
+    try:
+        raw_text = item.file.read_text(encoding="utf-8")
+        result = process_raw_text(
+            entity_name=item.entity_name,
+            entity_type=item.entity_type,
+            raw_text=raw_text,
+            source_type=source_type,
+            **options,
+        )
+        record.update(status="ok", json_path=result["json_path"], skipped=result.get("skipped", False))
+        record["metrics"] = result["metrics"]
+    except Exception as exc:  # one failing entity must not stop the batch
+        record.update(status="error", error=f"{type(exc).__name__}: {exc}")
+
+    record["duration_s"] = round(time.perf_counter() - started, 3)
+    record["finished_at"] = datetime.now().isoformat(timespec="seconds")
+    return record
+
+
+def _run_group(items: list[BatchItem], source_type: str, options: dict, run_log: RunLog) -> list[dict]:
+    """Run all items for one entity sequentially so upserts never race."""
+    records = []
+    for item in items:
+        record = _run_item(item, source_type, options)
+        run_log.write(record)
+        records.append(record)
+    return records
+
+
+def run_batch(
+    items: Iterable[BatchItem],
+    *,
+    concurrency: int = 4,
+    run_log: RunLog | None = None,
+    source_type: str = "batch_file",
+    use_cache: bool = True,
+    incremental: bool = False,
+    chunked: bool = False,
+    compact: bool = True,
+    pre_extract: bool = True,
+) -> BatchSummary:
+    """
+    Process every item with at most `concurrency` extractions in flight.
+    Items already marked "ok" in the run log are skipped (resume).
+    """
+    run_log = run_log or RunLog.new()
+    options = {"use_cache": use_cache, "incremental": incremental, "chunked": chunked,
+               "compact": compact, "pre_extract": pre_extract}
+    done = run_log.completed_keys()
+
+    # Group by entity: different entities run in parallel,
+    # repeated entries for the same entity run in order.
+    groups: dict[tuple[str, str], list[BatchItem]] = {}
+    skipped = 0
+    for item in items:
+        if item.key in done:
+            skipped += 1
+            continue
+        groups.setdefault((item.entity_type, item.entity_name), []).append(item)
+
+    print(f"\n📦 Batch run: {sum(len(g) for g in groups.values())} to process, "
+          f"{skipped} already done, concurrency={concurrency}")
+    print(f"   Run log: {run_log.path}")
+
+    started = time.perf_counter()
+    records: list[dict] = []
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [
+            pool.submit(_run_group, group, source_type, options, run_log)
+            for group in groups.values()
+        ]
+        for future in as_completed(futures):
+            for record in future.result():
+                records.append(record)
+                if record["status"] == "ok" and record["skipped"]:
+                    print(f"⏭️  {record['entity_name']} unchanged ({record['duration_s']}s)")
+                elif record["status"] == "ok":
+                    print(f"✅ {record['entity_name']} ({record['duration_s']}s)")
+                else:
+                    print(f"❌ {record['entity_name']}: {record['error']}")
+
+    succeeded = sum(1 for r in records if r["status"] == "ok")
+    summary: BatchSummary = {
+        "run_log": str(run_log.path),
+        "processed": len(records),
+        "succeeded": succeeded,
+        "failed": len(records) - succeeded,
+        "skipped": skipped,
+        "wall_time_s": round(time.perf_counter() - started, 3),
+        "db_pool": get_pool_stats(),
+        "metrics": summarise_runs(r["metrics"] for r in records if "metrics" in r),
+    }
+
+    print(f"\n📊 Batch summary: {summary['succeeded']} ok, {summary['failed']} failed, "
+          f"{summary['skipped']} skipped in {summary['wall_time_s']}s")
+    print(f"   DB pool: {summary['db_pool']}")
+    metrics = summary["metrics"]
+    if metrics["runs"]:
+        llm = metrics["llm"]
+        print(f"   Stage time: " + ", ".join(f"{name} {seconds}s" for name, seconds in metrics["stages_s"].items()))
+        print(f"   LLM: {llm['calls']} calls, {llm['retries']} retries, "
+              f"{llm['input_tokens']} in / {llm['output_tokens']} out tokens, ${llm['cost_usd']}; "
+              f"{metrics['cache_hits']} cache hits, {metrics['db_round_trips']} DB round-trips, "
+              f"~{metrics['input_tokens_saved_est']} input tokens saved by compaction")
+    return summary
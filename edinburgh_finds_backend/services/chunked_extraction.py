@@ -0,0 +1,204 @@
+# services/chunked_extraction.py
+
+"""
+Section-aware chunked extraction.
+
+Instead of one huge call (full text × 100+ field VenueSchema), the input is
+split by GRADE section and by topical sub-heading, and each field group
+(schemas.venue_extraction_schema.VENUE_FIELD_GROUPS) gets:
+
+    - a partial schema with only its fields
+    - only the passages that mention its topic (grade headers kept, so the
+      prompt's confidence rules still apply)
+
+Group calls run in parallel on the async Instructor client and are merged
+back into one VenueSchema DTO: a field keeps the value with the highest
+confidence. Each group call is cached on its own, so unchanged groups are
+free on re-runs even when other parts of the text changed.
+"""
+
+import asyncio
+import re
+from typing import Optional
+
+from pydantic import BaseModel
+
+from config.settings import settings
+from schemas.venue_extraction_schema import VENUE_FIELD_GROUPS, VenueSchema, get_group_schema
+from services.extraction_cache import extraction_cache_key, get_cached_extraction, store_extraction
+from services.instructor_client import acreate_with_limits, run_async
+from utils.gather_sections import is_subheading, split_grade_sections
+from utils.prompt_builder import generate_system_prompt
+
+GROUP_MAX_TOKENS = 8000
+
+# Passages are routed to a group when they mention one of its keywords.
+# The "listing" group (identity, contact, hours, summary) always sees the full text.
+GROUP_KEYWORDS = {
+    "racquet_sports": r"tennis|padel|pickleball|badminton|squash|table[ -]tennis|ping[ -]pong|rac(?:k|qu)et|court",
+    "football": r"football|soccer|\d+[ -]a[ -]side|pitch",
+    "swimming": r"swim|pool|aqua|lane",
+    "gym_classes": r"gym|class|hiit|yoga|pilates|strength|cycl|spin|fitness|studio|training|workout",
+    "spa": r"spa\b|sauna|steam|hydro|hot tub|plunge|relax|wellness|treatment",
+    "amenities": r"restaurant|bar\b|caf[eé]|food|dining|menu|wi-?fi|lounge|coffee|drink",
+    "family": r"famil|cr[eè]che|kid|child|junior|holiday club|play ?area|toddler|parent",
+    "parking_transport": r"park|\bev\b|charg|bus\b|train|rail|station|transport|tram|cycle|bike",
+    "reviews": r"review|rating|\bstars?\b|likes|followers|tripadvisor|trustpilot|google",
+}
+_GROUP_PATTERNS = {group: re.compile(pattern, re.IGNORECASE) for group, pattern in GROUP_KEYWORDS.items()}
+
+
+# -------------------------------------------------------
+# TEXT ROUTING
+# -------------------------------------------------------
+def route_text(raw_text: str, pattern: re.Pattern) -> str:
+    """
+    Keep only the lines matching `pattern`, preserving their GRADE header and
+    the sub-heading they sit under. Everything under a matching sub-heading is
+    kept, and indented bullets follow their parent line. GRADE X is dropped.
+    """
+    out = []
+    for section in split_grade_sections(raw_text):
+        if section.grade == "X":
+            continue
+
+        kept: list[str] = []
+        heading: Optional[str] = None
+        heading_matches = heading_emitted = parent_kept = False
+
+        for line in section.body.splitlines():
+            if not line.strip():
+                continue
+
+            if is_subheading(line):
+                heading, heading_emitted = line.strip(), False
+                heading_matches = bool(pattern.search(line))
+                if heading_matches:
+                    kept.append(heading)
+                    heading_emitted = True
+                continue
+
+            if line[:1].isspace() and kept:
+                keep = parent_kept  # nested bullet / continuation
+            else:
+                keep = parent_kept = heading_matches or bool(pattern.search(line))
+
+            if keep:
+                if heading and not heading_emitted:
+                    kept.append(heading)
+                    heading_emitted = True
+                kept.append(line.rstrip())
+
+        if kept:
+            out.append("\n".join(([section.header] if section.header else []) + kept))
+
+    return "\n\n".join(out)
+
+
+def split_for_groups(raw_text: str) -> dict[str, str]:
+    """Text for every field group that has relevant passages."""
+    chunks = {"listing": raw_text}
+    for group, pattern in _GROUP_PATTERNS.items():
+        text = route_text(raw_text, pattern)
+        if text.strip():
+            chunks[group] = text
+    return chunks
+
+
+# -------------------------------------------------------
+# MERGING
+# -------------------------------------------------------
+def merge_group_results(results: list[BaseModel]) -> BaseModel:
+    """
+    Merge partial DTOs into one VenueSchema.
+    Same confidence rule as the upsert: the higher-confidence value wins
+    (ties keep the first seen).
+    """
+    merged: dict = {}
+    confidences: dict[str, float] = {}
+    sources: list[str] = []
+    notes: list[str] = []
+
+    for result in results:
+        data = result.model_dump(exclude_none=True)
+        result_conf = data.pop("field_confidence", None) or {}
+        source_info = data.pop("source_info", None) or {}
+
+        for field, value in data.items():
+            conf = float(result_conf.get(field, 0.0))
+            if field not in merged or conf > confidences.get(field, 0.0):
+                merged[field] = value
+                if field in result_conf:
+                    confidences[field] = conf
+
+        sources.extend(s for s in source_info.get("sources", []) if s not in sources)
+        if source_info.get("note"):
+            notes.append(source_info["note"])
+
+    return VenueSchema(
+        **merged,
+        field_confidence=confidences,
+        source_info={"sources": sources, "note": "; ".join(notes)},
+    )
+
+
+# -------------------------------------------------------
+# EXTRACTION
+# -------------------------------------------------------
+def _group_prompt(entity_name: str, entity_type: str, group: str) -> str:
+    base = generate_system_prompt(entity_name=entity_name, entity_type=entity_type)
+    if group == "listing":
+        return base
+    return (
+        f"{base}\n"
+        f"FOCUS: only the '{group}' fields in this schema. The input contains only "
+        f"the passages relevant to them; leave anything not stated as null."
+    )
+
+
+async def _extract_group(entity_name: str, entity_type: str, group: str, text: str, use_cache: bool):
+    schema = get_group_schema(group)
+    system_message = _group_prompt(entity_name, entity_type, group)
+
+    cache_key = extraction_cache_key(
+        model=settings.LLM_MODEL,
+        system_prompt=system_message,
+        response_model=schema,
+        raw_text=text,
+    )
+    if use_cache:
+        cached = get_cached_extraction(cache_key, schema)
+        if cached is not None:
+            return cached
+
+    dto, _ = await acreate_with_limits(
+        response_model=schema,
+        max_tokens=GROUP_MAX_TOKENS,
+        messages=[
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": text},
+        ],
+    )
+    store_extraction(cache_key, dto)
+    return dto
+
+
+async def extract_chunked_async(
+    entity_name: str,
+    entity_type: str,
+    raw_text: str,
+    use_cache: bool = True,
+) -> BaseModel:
+    chunks = split_for_groups(raw_text)
+    print(f"🧩 Chunked extraction: {len(chunks)}/{len(VENUE_FIELD_GROUPS)} field groups have relevant text")
+
+    results = await asyncio.gather(*(
+        _extract_group(entity_name, entity_type, group, text, use_cache)
+        for group, text in chunks.items()
+    ))
+    return merge_group_results(list(results))
+
+
+def extract_chunked(entity_name: str, entity_type: str, raw_text: str, use_cache: bool = True) -> BaseModel:
+    """Blocking entry point used by process_raw_text (runs on the shared LLM event loop)."""
+    return run_async(extract_chunked_async(entity_name, entity_type, raw_text, use_cache))
@@ -0,0 +1,225 @@
+# services/crawl_pipeline.py
+
+"""
+Streaming crawl → extraction pipeline.
+
+    FirecrawlClient.iter_crawl()  →  dedupe  →  concatenate  →  process_raw_text()
+
+Pages are consumed as Firecrawl reports them. Duplicate pages (same URL or
+same content) are dropped, and so is page boilerplate (nav bars, footers,
+cookie banners): a paragraph already seen on an earlier page under the same
+heading, or on BOILERPLATE_MIN_PAGES earlier pages under any heading.
+Repeats within one page ("Monday / - 09:00 Yoga / Tuesday / - 09:00 Yoga")
+are always kept, and so are paragraphs that only share some lines with
+another page (a table with the same header row). As soon as `min_chars` of new text has
+arrived, the buffer is handed to the extraction pipeline; confidence-based
+upserts merge successive batches into the same listing.
+
+With a ScrapeCache, pages whose content is identical to the previous crawl's
+copy are marked unchanged, and a batch made only of unchanged pages skips extraction.
+"""
+
+import asyncio
+import hashlib
+from collections import Counter
+from typing import Callable, Iterable, Optional
+
+from services.extraction_pipeline import process_raw_text
+from services.firecrawl_client import FirecrawlClient
+from services.scrape_cache import ScrapeCache
+
+# Pages come from the entity's own website, so they are labelled GRADE A
+# for the confidence rules in the system prompt.
+CRAWL_SECTION_HEADER = "GRADE A — High Confidence (Directly Verified from official website crawl)"
+
+# A paragraph on this many earlier pages is site chrome wherever it sits
+BOILERPLATE_MIN_PAGES = 2
+
+
+def _blocks(markdown: str) -> list[list[str]]:
+    """Paragraphs (runs of non-blank lines); a markdown heading is a block of its own."""
+    blocks, current = [], []
+    for line in markdown.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            if current:
+                blocks.append(current)
+                current = []
+            if line.strip():
+                blocks.append([line])
+            continue
+        current.append(line)
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+class _PageBuffer:
+    """Accumulates deduplicated page text until it is large enough to extract."""
+
+    def __init__(self):
+        self.seen_urls: set[str] = set()
+        self.seen_pages: set[str] = set()
+        self.seen_blocks: set[tuple[str, str]] = set()  # (heading, paragraph)
+        self.block_pages: Counter = Counter()  # paragraph → pages it appeared on
+        self.parts: list[str] = []
+        self.urls: list[str] = []
+        self.size = 0
+        self.changed = False
+
+    def add(self, page: dict, unchanged: bool = False) -> bool:
+        """Add a page; returns False if it contributed nothing new."""
+        markdown = page.get("markdown") or ""
+        url = page.get("metadata", {}).get("sourceURL") or page.get("url") or ""
+
+        page_hash = hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+        if not markdown.strip() or url in self.seen_urls or page_hash in self.seen_pages:
+            return False
+        self.seen_urls.add(url)
+        self.seen_pages.add(page_hash)
+
+        # Only earlier pages count, so repeats within this page are kept
+        kept, page_blocks, heading = [], set(), ""
+        for block in _blocks(markdown):
+            key = "\n".join(line.strip() for line in block)
+            if block[0].lstrip().startswith("#"):
+                heading = key
+                kept.append(block)
+                continue
+            page_blocks.add((heading, key))
+            if (heading, key) in self.seen_blocks or self.block_pages[key] >= BOILERPLATE_MIN_PAGES:
+                continue  # boilerplate repeated across pages
+            kept.append(block)
+        self.seen_blocks |= page_blocks
+        self.block_pages.update({key for _, key in page_blocks})
+
+        if all(block[0].lstrip().startswith("#") for block in kept):
+            return False  # headings only
+        text = "\n\n".join("\n".join(block) for block in kept).strip()
+
+        self.parts.append(f"SOURCE: {url}\n\n{text}")
+        self.urls.append(url)
+        self.size += len(text)
+        self.changed = self.changed or not unchanged
+        return True
+
+    def drain(self) -> tuple[str, list[str]]:
+        """Return the buffered text (with grade header) and its URLs, then reset."""
+        body = "\n\n---\n\n".join(self.parts)
+        urls = self.urls
+        self.parts, self.urls, self.size, self.changed = [], [], 0, False
+        return f"{CRAWL_SECTION_HEADER}\n\n{body}", urls
+
+
+def stream_pages_to_extraction(
+    entity_name: str,
+    entity_type: str,
+    pages: Iterable[dict],
+    *,
+    min_chars: int = 8000,
+    source_type: str = "firecrawl_crawl",
+    use_cache: bool = True,
+    scrape_cache: Optional[ScrapeCache] = None,
+    extract: Callable[..., dict] = process_raw_text,
+) -> list[dict]:
+    """
+    Feed streamed pages into `extract` (process_raw_text by default) in
+    batches of at least `min_chars` characters. Returns one result per
+    extracted batch; batches with no changed pages are skipped.
+    """
+    buffer = _PageBuffer()
+    results = []
+
+    def is_unchanged(page: dict) -> bool:
+        if "cache" in page:  # scraped through a cached FirecrawlClient
+            return page["cache"]["unchanged"]
+        if scrape_cache is None:
+            return False
+        metadata = page.get("metadata", {})
+        url = metadata.get("sourceURL") or page.get("url") or ""
+        return scrape_cache.remember_page(url, page.get("markdown") or "", metadata.get("statusCode"))
+
+    def flush():
+        changed = buffer.changed
+        raw_text, urls = buffer.drain()
+        if not changed:
+            print(f"⏭️  {len(urls)} crawled page(s) unchanged for '{entity_name}' — skipping extraction")
+            return
+        print(f"🕸️  Extracting {len(urls)} crawled page(s) for '{entity_name}'")
+        results.append(
+            extract(
+                entity_name=entity_name,
+                entity_type=entity_type,
+                raw_text=raw_text,
+                source_type=source_type,
+                use_cache=use_cache,
+            )
+        )
+
+    for page in pages:
+        if buffer.add(page, unchanged=is_unchanged(page)) and buffer.size >= min_chars:
+            flush()
+
+    if buffer.parts:
+        flush()
+
+    return results
+
+
+def crawl_and_extract(
+    entity_name: str,
+    entity_type: str,
+    url: str,
+    *,
+    max_pages: int = 20,
+    min_chars: int = 8000,
+    client: Optional[FirecrawlClient] = None,
+    use_cache: bool = True,
+) -> list[dict]:
+    """Crawl `url` with Firecrawl and stream the pages into extraction."""
+    client = client or FirecrawlClient(cache=ScrapeCache())
+    return stream_pages_to_extraction(
+        entity_name,
+        entity_type,
+        client.iter_crawl(url, max_pages=max_pages),
+        min_chars=min_chars,
+        use_cache=use_cache,
+        scrape_cache=client.cache,
+    )
+
+
+def scrape_and_extract(
+    entity_name: str,
+    entity_type: str,
+    urls: list[str],
+    *,
+    min_chars: int = 8000,
+    client: Optional[FirecrawlClient] = None,
+    use_cache: bool = True,
+) -> list[dict]:
+    """
+    Scrape a known list of pages (cached, concurrently) and extract them.
+    If every page is unchanged since the last scrape, no LLM call is made.
+    """
+    client = client or FirecrawlClient(cache=ScrapeCache())
+
+    async def collect() -> list[dict]:
+        pages = []
+        async for url, result in client.scrape_many(urls):
+            if not result.get("success", True):
+                print(f"❌ Scrape failed for {url}: {result.get('error')}")
+                continue
+            pages.append({
+                "markdown": result.get("data", {}).get("markdown"),
+                "metadata": {"sourceURL": url},
+                "cache": result.get("cache", {"unchanged": False}),
+            })
+        return pages
+
+    return stream_pages_to_extraction(
+        entity_name,
+        entity_type,
+        asyncio.run(collect()),
+        min_chars=min_chars,
+        use_cache=use_cache,
+        source_type="firecrawl_scrape",
+    )
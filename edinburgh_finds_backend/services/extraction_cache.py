@@ -0,0 +1,67 @@
+# services/extraction_cache.py
+
+"""
+Content-addressed on-disk cache for LLM extractions.
+
+The key is a SHA-256 over everything that determines the LLM output:
+provider, model, system prompt, response-model JSON schema and raw text.
+Identical inputs therefore return the stored DTO without spending tokens.
+
+Backed by diskcache (SQLite + files under data/cache/), with:
+    - size-based LRU eviction (LLM_CACHE_MAX_BYTES)
+    - age-based expiry (LLM_CACHE_TTL_DAYS)
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Optional
+
+from diskcache import Cache
+from pydantic import BaseModel
+
+from config.settings import settings
+from utils.model_conversion import schema_json
+
+
+def extraction_cache_key(
+    *,
+    model: str,
+    system_prompt: str,
+    response_model: type[BaseModel],
+    raw_text: str,
+) -> str:
+    """Hash every input that can change the extraction result."""
+    schema = schema_json(response_model)
+
+    digest = hashlib.sha256()
+    for part in (settings.LLM_PROVIDER, model, system_prompt, schema, raw_text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")  # separator so parts can't run into each other
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def get_extraction_cache() -> Cache:
+    """Open (once per process) the shared extraction cache."""
+    return Cache(
+        settings.LLM_CACHE_DIR,
+        size_limit=settings.LLM_CACHE_MAX_BYTES,
+        eviction_policy="least-recently-used",
+    )
+
+
+def get_cached_extraction(key: str, response_model: type[BaseModel]) -> Optional[BaseModel]:
+    """Return the cached DTO for `key`, or None on a miss."""
+    payload = get_extraction_cache().get(key)
+    if payload is None:
+        return None
+    return response_model.model_validate_json(payload)
+
+
+def store_extraction(key: str, dto: BaseModel) -> None:
+    """Store a DTO as JSON; expires after LLM_CACHE_TTL_DAYS."""
+    get_extraction_cache().set(
+        key,
+        dto.model_dump_json(),
+        expire=settings.LLM_CACHE_TTL_DAYS * 24 * 60 * 60,
+    )
@@ -4,9 +4,14 @@ import json
 from datetime import datetime
 from pathlib import Path
 from schemas.venue_extraction_schema import VenueSchema
-from services.instructor_client import instructor_client
+from services.instructor_client import acreate_with_limits, run_async
+from services.extraction_cache import extraction_cache_key, get_cached_extraction, store_extraction
 from services.upsert_entity import upsert_from_schema
+from services.pre_extraction import choose_model, get_remainder_schema, pre_extract_fields
+from services.run_metrics import current_run, stage, track_run
 from utils.prompt_builder import generate_system_prompt
+from utils.gather_sections import changed_sections, render_sections, text_fingerprint
+from utils.input_compaction import compact_gather_text
 from config.settings import settings
 
 def merge_source_info(llm_info: dict, source_type: str) -> dict:
@@ -31,8 +36,8 @@ def merge_source_info(llm_info: dict, source_type: str) -> dict:
         if isinstance(url, str) and url.startswith(("http://", "https://"))
     ]
 
-    # Merge + dedupe URLs
-    merged_urls = [{*llm_urls, *system_provenance["sources"]}]
+    # Merge + dedupe URLs (order kept; must stay JSON-serialisable)
+    merged_urls = list(dict.fromkeys([*llm_urls, *system_provenance["sources"]]))
 
     # Merge notes (short + controlled)
     llm_note = llm_info.get("note", "").strip()
@@ -59,21 +64,73 @@ def get_entity_dirs(entity_type: str, entity_slug: str):
         p.mkdir(parents=True, exist_ok=True)
     return paths
 
+def latest_raw_snapshot(raw_dir: Path, entity_slug: str) -> Path | None:
+    """Most recent raw/*.txt snapshot for an entity (timestamped names sort in order)."""
+    snapshots = sorted(raw_dir.glob(f"{entity_slug}__raw__*.txt"))
+    return snapshots[-1] if snapshots else None
+
 def process_raw_text(
     entity_name: str,
     entity_type: str,
     raw_text: str,
-    source_type: str = "unknown"
+    source_type: str = "unknown",
+    use_cache: bool = True,
+    incremental: bool = False,
+    chunked: bool = False,
+    compact: bool = True,
+    pre_extract: bool = True,
 ):
     """
     Core extraction pipeline:
         raw_text → LLM extraction → structured DTO → DB upsert → JSON + debug logs
 
+    With use_cache=True, identical (prompt, schema, model, raw_text) inputs
+    reuse the previous LLM result from the on-disk extraction cache.
+
+    With incremental=True, raw_text is compared with the latest raw snapshot:
+    no material change → the run is skipped (result has "skipped": True);
+    otherwise only the changed GRADE sections are sent to the LLM.
+
+    With chunked=True, the text is routed by topic to smaller per-field-group
+    schemas that are extracted in parallel and merged
+    (see services/chunked_extraction.py).
+
+    With compact=True, the text sent to the LLM is compacted first: GRADE X
+    and repeated lines are dropped and whitespace/unicode normalised
+    (see utils/input_compaction.py). The raw snapshot is always saved as-is.
+
+    With pre_extract=True, contact/location fields (phone, email, postcode,
+    coordinates, opening hours, URLs) are parsed by rules first; the LLM is
+    asked only for the remaining fields, on the remaining text, and may be
+    routed to LLM_CHEAP_MODEL when that is small (see services/pre_extraction.py).
+
+    Every call is instrumented (stage timings, LLM attempts/tokens/cost,
+    DB round-trips, bytes written): the record is appended to the metrics
+    sink and returned as result["metrics"] (see services/run_metrics.py).
+
     This is the single unified pipeline used by:
         - main.py (Tavily or manual single file)
         - services/extraction.py (batch raw-text folder)
     """
+    with track_run(entity_name=entity_name, entity_type=entity_type, source_type=source_type) as metrics:
+        result = _run_pipeline(entity_name, entity_type, raw_text, source_type, use_cache, incremental, chunked, compact, pre_extract)
+        metrics.status = "skipped" if result["skipped"] else "ok"
+
+    result["metrics"] = metrics.to_dict()
+    return result
 
+
+def _run_pipeline(
+    entity_name: str,
+    entity_type: str,
+    raw_text: str,
+    source_type: str,
+    use_cache: bool,
+    incremental: bool,
+    chunked: bool,
+    compact: bool,
+    pre_extract: bool,
+) -> dict:
     print(f"\n🔧 Running extraction pipeline for '{entity_name}' ({entity_type})")
     print(f"   Source type: {source_type}")
 
@@ -91,28 +148,113 @@ def process_raw_text(
     # ensure folder structure exists
     # -------------------------------
     dirs = get_entity_dirs(f"{entity_type}s", entity_slug)
-    
+
+    # -----------------------------------------------------
+    # Incremental mode: diff against the last raw snapshot
+    # -----------------------------------------------------
+    metrics = current_run()
+    llm_text = raw_text
+    if incremental:
+        with stage("incremental_diff"):
+            previous_snapshot = latest_raw_snapshot(dirs["raw"], entity_slug)
+            if previous_snapshot is not None:
+                previous_text = previous_snapshot.read_text(encoding="utf-8")
+                sections = changed_sections(previous_text, raw_text)
+        if previous_snapshot is not None:
+            if text_fingerprint(previous_text) == text_fingerprint(raw_text) or sections == []:
+                print(f"⏭️  No material change since {previous_snapshot.name} — skipping extraction")
+                return {
+                    "listing": None,
+                    "entity": None,
+                    "report": None,
+                    "json_path": None,
+                    "log_path": str(previous_snapshot),
+                    "skipped": True,
+                }
+
+            if sections is not None:
+                llm_text = render_sections(sections)
+                print(f"✂️  Re-extracting changed sections only: "
+                      f"{', '.join(s.grade or 'preamble' for s in sections)}")
+
+    # -----------------------------------------------------
+    # Compact the LLM input (deterministic, fact-preserving)
+    # -----------------------------------------------------
+    if compact:
+        with stage("compact"):
+            llm_text, compaction = compact_gather_text(llm_text)
+        print(f"🗜️  Compacted input: {compaction.describe()}")
+        if metrics is not None:
+            metrics.input_compaction = compaction.to_dict()
+
+    # -----------------------------------------------------
+    # Rule-based pre-extraction (no LLM needed for these fields)
+    # -----------------------------------------------------
+    rules = None
+    if pre_extract:
+        with stage("pre_extract"):
+            rules = pre_extract_fields(llm_text)
+        if rules.values:
+            print(f"📐 Rule pre-extraction: {rules.describe()}")
+
     # -----------------------------------------------------
     # Build the system prompt from your Pydantic schema
     # -----------------------------------------------------
-    system_message = generate_system_prompt(
-        entity_name=entity_name,
-        entity_type=entity_type,
-    )
+    with stage("prompt"):
+        system_message = generate_system_prompt(
+            entity_name=entity_name,
+            entity_type=entity_type,
+        )
 
     # -----------------------------------------------------
     # Call the LLM (Instructor client enforces schema)
     # -----------------------------------------------------
-    dto = instructor_client.chat.completions.create(
-        model=settings.LLM_MODEL,
-        response_model=VenueSchema,
-        max_tokens=30000,   # REQUIRED for long schemas
-        temperature=0,
-        messages=[
-            {"role": "system", "content": system_message},
-            {"role": "user", "content": raw_text},
-        ],
-    )
+    if chunked:
+        # Per-field-group calls in parallel (each group is cached separately)
+        from services.chunked_extraction import extract_chunked
+
+        with stage("extract"):
+            dto = extract_chunked(entity_name, entity_type, llm_text, use_cache=use_cache)
+    else:
+        # Reduced schema + input when the rules already filled some fields
+        response_model, llm_input = VenueSchema, llm_text
+        if rules is not None and rules.values:
+            response_model = get_remainder_schema(frozenset(rules.values))
+            llm_input = rules.remaining_text
+        model = choose_model(llm_input)
+        if metrics is not None:
+            metrics.labels["model"] = model
+
+        with stage("cache_lookup"):
+            cache_key = extraction_cache_key(
+                model=model,
+                system_prompt=system_message,
+                response_model=response_model,
+                raw_text=llm_input,
+            )
+            dto = get_cached_extraction(cache_key, response_model) if use_cache else None
+
+        if dto is not None:
+            print(f"⚡ Extraction cache hit ({cache_key[:12]}) — skipping LLM call")
+            if metrics is not None:
+                metrics.cache_hit = True
+        else:
+            # Same RPM/TPM limiter and 429/5xx backoff as the chunked path
+            with stage("extract"):
+                dto, _ = run_async(acreate_with_limits(
+                    model=model,
+                    response_model=response_model,
+                    max_tokens=30000,   # REQUIRED for long schemas
+                    messages=[
+                        {"role": "system", "content": system_message},
+                        {"role": "user", "content": llm_input},
+                    ],
+                ))
+            # Cache the raw LLM output (before provenance is injected)
+            store_extraction(cache_key, dto)
+
+    if rules is not None:
+        dto = rules.merge_into(dto)
 
     # -----------------------------------------------------
     # Inject provenance into the DTO
@@ -122,39 +264,46 @@ def process_raw_text(
     # -----------------------------------------------------
     # Persist into the database (Listing + Entity)
     # -----------------------------------------------------
-    listing, entity, report = upsert_from_schema(
-        data=dto,
-        entity_name=entity_name,
-        entity_type=entity_type,
-    )
+    with stage("upsert"):
+        listing, entity, report = upsert_from_schema(
+            data=dto,
+            entity_name=entity_name,
+            entity_type=entity_type,
+        )
 
     # ---------------------------------------------------
     # Save processed JSON 
     # ---------------------------------------------------
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_json = dirs["processed"] / f"{entity_slug}__processed__{timestamp}.json"
+    raw_log = dirs["raw"] / f"{entity_slug}__raw__{timestamp}.txt"
 
-    with open(output_json, "w", encoding="utf-8") as f:
-        json.dump(
-            {
-                "listing": listing.model_dump(),
-                "entity": entity.model_dump(),
-                "extraction_report": report,
-                "source_type": source_type,
-            },
-            f,
-            indent=2
-        )
+    with stage("write"):
+        with open(output_json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "entity_name": entity_name,
+                    "entity_type": entity_type,
+                    "listing": listing.model_dump(),
+                    "entity": entity.model_dump(),
+                    "extraction_report": report,
+                    "source_type": source_type,
+                },
+                f,
+                indent=2
+            )
 
-    print(f"📄 Saved structured JSON → {output_json}")
+        print(f"📄 Saved structured JSON → {output_json}")
 
-    # -----------------------------------------------------
-    # Save raw text snapshot for reproducibility/debug
-    # -----------------------------------------------------
-    raw_log = dirs["raw"] / f"{entity_slug}__raw__{timestamp}.txt"
-    raw_log.write_text(raw_text, encoding="utf-8")
-    
-    print(f"🧾 Saved debug raw text snapshot into {raw_log}")
+        # -----------------------------------------------------
+        # Save raw text snapshot for reproducibility/debug
+        # -----------------------------------------------------
+        raw_log.write_text(raw_text, encoding="utf-8")
+
+        print(f"🧾 Saved debug raw text snapshot into {raw_log}")
+
+    if metrics is not None:
+        metrics.bytes_written += output_json.stat().st_size + raw_log.stat().st_size
 
     # -----------------------------------------------------
     # Return results
@@ -165,4 +314,5 @@ def process_raw_text(
         "report": report,
         "json_path": str(output_json),
         "log_path": str(raw_log),
+        "skipped": False,
     }
@@ -0,0 +1,310 @@
+# services/facet_index.py
+
+"""
+In-process bitmap index over the boolean columns of an entity table
+(venues: padel, sauna, creche_available, ev_charging_available, ...) for
+faceted search: AND / OR / NOT filtering and per-facet counts for any result
+set, without touching the database.
+
+    with Session(engine) as session:
+        result = facet_search(session, all_of=["padel", "sauna"], any_of=["cafe", "restaurant"])
+        result.listing_ids, result.total, result.counts["creche_available"]
+
+Each listing gets a dense position; each facet is a Python int used as a bit
+set (bit i set ⇔ listing i has the facility), so a filter is a few big-int
+ANDs / ORs and a count is int.bit_count(). 10k listings x 60 facets is
+~75 KB.
+
+Only True sets a bit: unknown (None) and False both read as "not offered".
+
+The index is built from the database on first use, kept current by the
+upserts (record_entity_change(), after commit) and rebuilt after
+FACET_INDEX_TTL_SECONDS to pick up writes from other processes.
+FacetIndex.to_json() / from_json() give a snapshot the web tier can cache
+(keyed on `version`, which changes with every update).
+"""
+
+import base64
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from sqlmodel import Session, SQLModel, select
+
+from config.settings import settings
+from core.entity_registry import get_entity_config
+
+SNAPSHOT_FORMAT = 1
+
+
+def boolean_fields(table: type[SQLModel]) -> tuple[str, ...]:
+    """Columns of `table` declared as (Optional) bool: the facets."""
+    return tuple(
+        name for name, info in table.model_fields.items()
+        if info.annotation in (bool, Optional[bool])
+    )
+
+
+def _bits_to_text(bits: int) -> str:
+    return base64.b64encode(bits.to_bytes((bits.bit_length() + 7) // 8, "little")).decode("ascii")
+
+
+def _bits_from_text(text: str) -> int:
+    return int.from_bytes(base64.b64decode(text), "little")
+
+
+@dataclass
+class FacetResult:
+    listing_ids: List[str]
+    total: int
+    counts: Dict[str, int] = field(default_factory=dict)  # facet → matches within the result
+
+    def to_dict(self) -> dict:
+        return {"listing_ids": self.listing_ids, "total": self.total, "counts": self.counts}
+
+
+class FacetIndex:
+    """Bitmaps for `facets` over a growing set of listings (not thread-safe; see _FacetIndexStore)."""
+
+    def __init__(self, facets: Sequence[str]):
+        self.facets: tuple[str, ...] = tuple(facets)
+        self.bitmaps: Dict[str, int] = {facet: 0 for facet in self.facets}
+        self.listing_ids: List[Optional[str]] = []  # position → listing_id (None once removed)
+        self.positions: Dict[str, int] = {}
+        self.live = 0  # bit set of positions in use
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    # ---------------------------------------------------
+    # Updates
+    # ---------------------------------------------------
+    def set(self, listing_id: str, values: Mapping[str, Any]) -> None:
+        """Insert or replace a listing's facets (values: facet → bool / None)."""
+        position = self.positions.get(listing_id)
+        if position is None:
+            position = len(self.listing_ids)
+            self.listing_ids.append(listing_id)
+            self.positions[listing_id] = position
+            self.live |= 1 << position
+        bit = 1 << position
+        for facet in self.facets:
+            if values.get(facet) is True:
+                self.bitmaps[facet] |= bit
+            else:
+                self.bitmaps[facet] &= ~bit
+        self.version += 1
+
+    def set_row(self, row: Any) -> None:
+        self.set(row.listing_id, {facet: getattr(row, facet, None) for facet in self.facets})
+
+    @classmethod
+    def from_rows(cls, facets: Sequence[str], rows: Iterable[Any]) -> "FacetIndex":
+        """Bulk build (byte arrays, one int per facet at the end) from rows with listing_id + facet attributes."""
+        index = cls(facets)
+        rows = list(rows)
+        size = (len(rows) + 7) // 8
+        arrays = {facet: bytearray(size) for facet in index.facets}
+        for position, row in enumerate(rows):
+            index.listing_ids.append(row.listing_id)
+            index.positions[row.listing_id] = position
+            for facet in index.facets:
+                if getattr(row, facet, None) is True:
+                    arrays[facet][position >> 3] |= 1 << (position & 7)
+        index.bitmaps = {facet: int.from_bytes(array, "little") for facet, array in arrays.items()}
+        index.live = (1 << len(rows)) - 1
+        return index
+
+    def remove(self, listing_id: str) -> None:
+        position = self.positions.pop(listing_id, None)
+        if position is None:
+            return
+        mask = ~(1 << position)
+        self.listing_ids[position] = None
+        self.live &= mask
+        for facet in self.facets:
+            self.bitmaps[facet] &= mask
+        self.version += 1
+
+    # ---------------------------------------------------
+    # Queries
+    # ---------------------------------------------------
+    def _bitmap(self, facet: str) -> int:
+        try:
+            return self.bitmaps[facet]
+        except KeyError:
+            raise ValueError(f"Unknown facet '{facet}'") from None
+
+    def match(self, all_of: Iterable[str] = (), any_of: Iterable[str] = (),
+              none_of: Iterable[str] = (), within: Optional[int] = None) -> int:
+        """Bit set of listings with every `all_of`, at least one `any_of` and no `none_of` facet."""
+        bits = self.live if within is None else self.live & within
+        for facet in all_of:
+            bits &= self._bitmap(facet)
+        any_of = list(any_of)
+        if any_of:
+            union = 0
+            for facet in any_of:
+                union |= self._bitmap(facet)
+            bits &= union
+        for facet in none_of:
+            bits &= ~self._bitmap(facet)
+        return bits
+
+    def bits_for(self, listing_ids: Iterable[str]) -> int:
+        """Bit set of the given listings (e.g. a text or proximity search result)."""
+        array = bytearray((len(self.listing_ids) + 7) // 8)
+        for listing_id in listing_ids:
+            position = self.positions.get(listing_id)
+            if position is not None:
+                array[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(array, "little")
+
+    def ids(self, bits: int, limit: Optional[int] = None) -> List[str]:
+        """listing_ids of the set bits, in position order (first `limit` only, if given)."""
+        ids = []
+        # Walk the bytes rather than peeling bits off the int: each big-int
+        # operation copies the whole number
+        for byte_index, byte in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, "little")):
+            while byte:
+                low = byte & -byte
+                ids.append(self.listing_ids[byte_index * 8 + low.bit_length() - 1])
+                if limit and len(ids) >= limit:
+                    return ids
+                byte ^= low
+        return ids
+
+    def counts(self, bits: Optional[int] = None, facets: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Per-facet number of listings within `bits` (default: all) that have it."""
+        bits = self.live if bits is None else bits
+        return {facet: (self._bitmap(facet) & bits).bit_count() for facet in (facets or self.facets)}
+
+    def search(self, all_of: Iterable[str] = (), any_of: Iterable[str] = (),
+               none_of: Iterable[str] = (), within: Optional[Iterable[str]] = None,
+               limit: Optional[int] = None) -> FacetResult:
+        within_bits = None if within is None else self.bits_for(within)
+        bits = self.match(all_of, any_of, none_of, within_bits)
+        return FacetResult(
+            listing_ids=self.ids(bits, limit),
+            total=bits.bit_count(),
+            counts=self.counts(bits),
+        )
+
+    # ---------------------------------------------------
+    # Snapshot
+    # ---------------------------------------------------
+    def to_dict(self) -> dict:
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "version": self.version,
+            "facets": list(self.facets),
+            "listing_ids": self.listing_ids,
+            "live": _bits_to_text(self.live),
+            "bitmaps": {facet: _bits_to_text(bits) for facet, bits in self.bitmaps.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, doc: dict) -> "FacetIndex":
+        if doc.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported facet index snapshot format {doc.get('format')!r}")
+        index = cls(doc["facets"])
+        index.version = doc["version"]
+        index.listing_ids = list(doc["listing_ids"])
+        index.positions = {lid: pos for pos, lid in enumerate(index.listing_ids) if lid is not None}
+        index.live = _bits_from_text(doc["live"])
+        index.bitmaps = {facet: _bits_from_text(text) for facet, text in doc["bitmaps"].items()}
+        return index
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> "FacetIndex":
+        return cls.from_dict(json.loads(text))
+
+
+def build_facet_index(session: Session, entity_type: str = "venue") -> FacetIndex:
+    """Index every row of the entity type's table (one SELECT of the boolean columns)."""
+    table = get_entity_config(entity_type).table
+    facets = boolean_fields(table)
+    columns = [table.listing_id] + [getattr(table, facet) for facet in facets]
+    return FacetIndex.from_rows(facets, session.exec(select(*columns)))
+
+
+# -------------------------------------------------------
+# PROCESS-WIDE INDEXES
+# -------------------------------------------------------
+class _FacetIndexStore:
+    """One FacetIndex per entity type, built lazily and rebuilt when stale."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, tuple[float, FacetIndex]] = {}
+
+    def _fresh(self, entity_type: str) -> Optional[FacetIndex]:
+        entry = self._indexes.get(entity_type)
+        if entry is None or time.monotonic() - entry[0] >= settings.FACET_INDEX_TTL_SECONDS:
+            return None
+        return entry[1]
+
+    def get(self, session: Session, entity_type: str) -> FacetIndex:
+        index = self._fresh(entity_type)
+        if index is not None:
+            return index
+        with self._lock:
+            index = self._fresh(entity_type)
+            if index is None:
+                index = build_facet_index(session, entity_type)
+                self._indexes[entity_type] = (time.monotonic(), index)
+            return index
+
+    def apply(self, entity_type: str, rows: Iterable[Any]) -> None:
+        with self._lock:
+            entry = self._indexes.get(entity_type)
+            if entry is None:
+                return  # not built in this process: nothing to keep current
+            for row in rows:
+                entry[1].set_row(row)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+
+_store = _FacetIndexStore()
+
+
+def get_facet_index(session: Session, entity_type: str = "venue") -> FacetIndex:
+    return _store.get(session, entity_type)
+
+
+def record_entity_change(entity_type: str, rows: Iterable[Any]) -> None:
+    """Upsert hook: fold committed entity rows into this process's index, if built."""
+    _store.apply(entity_type, rows)
+
+
+def refresh_facet_index() -> None:
+    """Drop the built indexes; the next search rebuilds them."""
+    _store.clear()
+
+
+def facet_search(
+    session: Session,
+    *,
+    all_of: Iterable[str] = (),
+    any_of: Iterable[str] = (),
+    none_of: Iterable[str] = (),
+    within: Optional[Iterable[str]] = None,
+    limit: Optional[int] = None,
+    entity_type: str = "venue",
+) -> FacetResult:
+    """
+    Listings matching the facet filter (optionally restricted to the
+    listing_ids in `within`), with per-facet counts over the matches.
+    """
+    index = get_facet_index(session, entity_type)
+    with _store._lock:
+        return index.search(all_of, any_of, none_of, within, limit)
@@ -1,29 +1,99 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import AsyncIterator, Iterator
+from urllib.parse import urlparse
+
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from config.settings import settings
+from services.scrape_cache import ScrapeCache, entry_to_result
+
+# Site responses that usually mean "bot blocked" → retry through stealth proxy
+STEALTH_RETRY_STATUS_CODES = {401, 403, 500}
+
+
+class FirecrawlError(RuntimeError):
+    """Firecrawl reported a failed or cancelled job."""
+
+
+def _scrape_payload(url: str, proxy: str | None) -> dict:
+    payload = {"url": url}
+    if proxy:
+        payload["proxy"] = proxy  # "basic" | "stealth" | "auto"
+    return payload
+
+
+def _needs_stealth(result: dict) -> bool:
+    status_code = result.get("data", {}).get("metadata", {}).get("statusCode", 200)
+    return status_code in STEALTH_RETRY_STATUS_CODES
 
 
 class FirecrawlClient:
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        pool_maxsize: int = 10,
+        cache: ScrapeCache | None = None,
+        refresh: str = "if_stale",
+    ):
         self.api_key = api_key or settings.FIRECRAWL_API_KEY
-        self.base_url = "https://api.firecrawl.dev/v2"
+        self.base_url = (base_url or settings.FIRECRAWL_BASE_URL).rstrip("/")
+        self.pool_maxsize = pool_maxsize
+
+        # Optional scrape cache; refresh = "never" | "if_stale" | "always"
+        self.cache = cache
+        self.refresh = refresh
+
+        # Persistent keep-alive session: one TLS handshake, reused for every call
+        self.session = requests.Session()
+        self.session.headers.update(self._headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @property
+    def _headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    def close(self):
+        self.session.close()
+
+    # ----------------------------
+    # SCRAPE CACHE HELPERS
+    # ----------------------------
+    def _from_cache(self, url: str, proxy: str | None) -> dict | None:
+        if self.cache is None:
+            return None
+        entry = self.cache.lookup(url, proxy, refresh=self.refresh)
+        return entry_to_result(entry, hit=True) if entry is not None else None
+
+    def _remember(self, url: str, proxy: str | None, result: dict) -> dict:
+        if self.cache is None or not result.get("success", True):
+            return result
+        data = result.get("data", {})
+        metadata = data.get("metadata", {})
+        entry = self.cache.put(url, proxy, data.get("markdown") or "", metadata.get("statusCode"), metadata)
+        result["cache"] = {"hit": False, "unchanged": entry["unchanged"], "fetched_at": entry["fetched_at"]}
+        return result
 
     # ----------------------------
     # BASIC SCRAPE with optional stealth proxy
     # ----------------------------
     def scrape(self, url: str, proxy: str | None = None) -> dict:
-        payload = {"url": url}
+        cached = self._from_cache(url, proxy)
+        if cached is not None:
+            return cached
 
-        if proxy:
-            payload["proxy"] = proxy  # "basic" | "stealth" | "auto"
-
-        resp = requests.post(
+        resp = self.session.post(
             f"{self.base_url}/scrape",
-            json=payload,
-            headers={"Authorization": f"Bearer {self.api_key}"},
+            json=_scrape_payload(url, proxy),
             timeout=90,
         )
         resp.raise_for_status()
-        return resp.json()
+        return self._remember(url, proxy, resp.json())
 
     # ----------------------------
     # SCRAPE WITH AUTOMATIC STEALTH RETRY
@@ -32,10 +102,144 @@ class FirecrawlClient:
         # 1. Try without stealth
         result = self.scrape(url)
 
-        status_code = result.get("data", {}).get("metadata", {}).get("statusCode", 200)
-
-        if status_code in [401, 403, 500]:
+        if _needs_stealth(result):
             # Retry with stealth
             return self.scrape(url, proxy="stealth")
 
         return result
+
+    # ----------------------------
+    # CONCURRENT SCRAPE (async, results as they complete)
+    # ----------------------------
+    async def scrape_many(
+        self,
+        urls: list[str],
+        *,
+        concurrency: int = 5,
+        per_host: int = 2,
+        host_interval: float = 1.0,
+    ) -> AsyncIterator[tuple[str, dict]]:
+        """
+        Scrape many URLs concurrently, yielding (url, result) as each finishes.
+
+        - at most `concurrency` requests in flight overall
+        - politeness: at most `per_host` in flight per target host, and
+          requests to the same host start at least `host_interval` s apart
+        - stealth-proxy fallback applied per URL
+        - with a scrape cache, unchanged pages are served without a Firecrawl call
+        - a failed URL yields {"success": False, "error": "..."} instead of raising
+        """
+        overall = asyncio.Semaphore(concurrency)
+        host_slots: dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(per_host))
+        host_locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        host_next_start: dict[str, float] = defaultdict(float)
+
+        async def polite_post(client: httpx.AsyncClient, url: str, proxy: str | None) -> dict:
+            cached = await asyncio.to_thread(self._from_cache, url, proxy)
+            if cached is not None:
+                return cached
+
+            host = urlparse(url).netloc
+            async with host_slots[host]:
+                # Space out request starts per host (without holding a global slot)
+                async with host_locks[host]:
+                    loop_time = asyncio.get_running_loop().time()
+                    delay = host_next_start[host] - loop_time
+                    host_next_start[host] = max(loop_time, host_next_start[host]) + host_interval
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                async with overall:
+                    resp = await client.post(f"{self.base_url}/scrape", json=_scrape_payload(url, proxy))
+                    resp.raise_for_status()
+            return await asyncio.to_thread(self._remember, url, proxy, resp.json())
+
+        async def scrape_one(client: httpx.AsyncClient, url: str) -> tuple[str, dict]:
+            try:
+                result = await polite_post(client, url, None)
+                if _needs_stealth(result):
+                    result = await polite_post(client, url, "stealth")
+                return url, result
+            except Exception as exc:
+                return url, {"success": False, "error": f"{type(exc).__name__}: {exc}"}
+
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(headers=self._headers, limits=limits, timeout=90) as client:
+            tasks = [asyncio.create_task(scrape_one(client, url)) for url in dict.fromkeys(urls)]
+            try:
+                for finished in asyncio.as_completed(tasks):
+                    yield await finished
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    # ----------------------------
+    # CRAWL (async job, streamed page by page)
+    # ----------------------------
+    def start_crawl(self, url: str, max_pages: int = 10) -> str:
+        """Start a crawl job and return its id."""
+        payload = {
+            "url": url,
+            "limit": max_pages,
+            "scrapeOptions": {"formats": ["markdown"]},
+        }
+        resp = self.session.post(
+            f"{self.base_url}/crawl",
+            json=payload,
+            timeout=30,
+        )
+        resp.raise_for_status()
+        return resp.json()["id"]
+
+    def iter_crawl(
+        self,
+        url: str,
+        max_pages: int = 10,
+        poll_interval: float = 2.0,
+        timeout: float = 600,
+    ) -> Iterator[dict]:
+        """
+        Yield crawled pages as soon as Firecrawl reports them.
+
+        Polls the job status, follows `next` pagination links and yields each
+        page (markdown + metadata) once, so callers never hold the whole crawl
+        in memory.
+        """
+        job_id = self.start_crawl(url, max_pages=max_pages)
+        status_url = f"{self.base_url}/crawl/{job_id}"
+        deadline = time.monotonic() + timeout
+        yielded: set[str] = set()
+
+        while True:
+            next_url = status_url
+            status = None
+
+            # Walk every result page currently available for the job
+            while next_url:
+                resp = self.session.get(next_url, timeout=30)
+                resp.raise_for_status()
+                body = resp.json()
+                status = body.get("status")
+
+                for page in body.get("data", []):
+                    metadata = page.get("metadata", {})
+                    page_id = metadata.get("sourceURL") or page.get("url") or str(len(yielded))
+                    if page_id in yielded:
+                        continue  # status polls repeat pages scraped so far
+                    yielded.add(page_id)
+                    yield page
+
+                next_url = body.get("next")
+
+            if status == "completed":
+                return
+            if status in ("failed", "cancelled"):
+                raise FirecrawlError(f"Crawl {job_id} {status}")
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Crawl {job_id} still '{status}' after {timeout}s")
+
+            time.sleep(poll_interval)
+
+    def crawl(self, url: str, max_pages: int = 10) -> dict:
+        """Blocking convenience wrapper: collect every page into {"data": [...]}."""
+        return {"data": list(self.iter_crawl(url, max_pages=max_pages))}
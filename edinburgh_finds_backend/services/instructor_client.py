@@ -1,54 +1,303 @@
 # services/instructor_client.py
 
-import instructor
-from google import genai
-from anthropic import Anthropic
-from openai import OpenAI
+"""
+Instructor clients for the configured LLM_PROVIDER.
+
+Provider SDKs (openai / google-genai) and instructor itself are imported
+lazily, the first time a client is needed, so runs that never call the LLM
+(cache hits, skipped incremental runs, DB scripts) don't pay for them.
+"""
+
+import asyncio
+import atexit
+import inspect
+import threading
+import weakref
+from functools import lru_cache
+from json import JSONDecodeError
+
 from config.settings import settings
+from services.rate_limiter import estimate_request_tokens, get_rate_limiter
+from services.run_metrics import attach_llm_hooks, record_llm_call
+from utils.model_conversion import schema_json
 
 llm_provider = settings.LLM_PROVIDER
 llm_model = settings.LLM_MODEL
 
-print(f"Using {llm_provider} {llm_model} via Instructor")
 
-# ============================================================
-# 1. CLAUDE via LaoZhang.ai (OpenAI protocol)
-# ============================================================
+@lru_cache(maxsize=1)
+def get_instructor_client():
+    """Sync Instructor client for LLM_PROVIDER (built once per process)."""
+    return attach_llm_hooks(_build_sync_client())
 
-if llm_provider == "laozhang-claude":
-    client = OpenAI(
-        api_key=settings.LAOZHANG_API_KEY,
-        base_url="https://api.laozhang.ai/v1",
-    )
-    instructor_client = instructor.from_openai(client)
 
+def _build_sync_client():
+    import instructor
 
-# ============================================================
-# 2. GEMINI via Google GenAI
-# ============================================================
+    print(f"Using {llm_provider} {llm_model} via Instructor")
 
-elif llm_provider == "gemini":
-    client = genai.Client(api_key=settings.GEMINI_API_KEY)
-    instructor_client = instructor.from_genai(
-        client=client,
-        mode=instructor.Mode.GENAI_TOOLS,
-    )
+    # ============================================================
+    # 1. CLAUDE via LaoZhang.ai (OpenAI protocol)
+    # ============================================================
 
+    if llm_provider == "laozhang-claude":
+        from openai import OpenAI
 
-# ============================================================
-# 3. DIRECT ANTHROPIC
-# ============================================================
+        client = OpenAI(
+            api_key=settings.LAOZHANG_API_KEY,
+            base_url=settings.LLM_BASE_URL or "https://api.laozhang.ai/v1",
+        )
+        return instructor.from_openai(client)
+
+    # ============================================================
+    # 2. GEMINI via Google GenAI
+    # ============================================================
+
+    if llm_provider == "gemini":
+        from google import genai
+
+        client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        return instructor.from_genai(
+            client=client,
+            mode=instructor.Mode.GENAI_TOOLS,
+        )
+
+    # ============================================================
+    # 3. DIRECT ANTHROPIC
+    # ============================================================
+
+    if llm_provider == "claude":
+        from openai import OpenAI
+
+        client = OpenAI(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.LLM_BASE_URL or "https://api.anthropic.com/v1"
+        )
+        return instructor.from_openai(client)
+
+    # ============================================================
+    # 4. FAIL FAST IF UNKNOWN
+    # ============================================================
+
+    raise ValueError(f"Unknown LLM_PROVIDER: {llm_provider}")
+
+
+def __getattr__(name: str):
+    # Backwards compatible `from services.instructor_client import instructor_client`
+    if name == "instructor_client":
+        return get_instructor_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=None)
+def prepare_response_model(response_model):
+    """
+    Instructor wraps plain Pydantic models in a fresh OpenAISchema subclass on
+    every call, which defeats its per-class schema caches. Wrap each model
+    once and pass the wrapped class instead, so the tool/JSON schema is
+    generated a single time per process.
+    """
+    from instructor.processing.schema import generate_openai_schema
+    from instructor.utils.core import prepare_response_model as _prepare
+
+    prepared = _prepare(response_model)
+    generate_openai_schema(prepared)  # warm Instructor's schema cache
+    return prepared
 
-elif llm_provider == "claude":
-    client = OpenAI(
-        api_key=settings.ANTHROPIC_API_KEY,
-        base_url="https://api.anthropic.com/v1"
-    )
-    instructor_client = instructor.from_openai(client)
 
 # ============================================================
-# 4. FAIL FAST IF UNKNOWN
+# ASYNC CLIENT (same provider switch)
 # ============================================================
+#
+# - one AsyncInstructor per event loop, each with a pooled keep-alive
+#   HTTP client (httpx connections are bound to the loop that opened them)
+# - sync callers share one background event loop (run_async), so the whole
+#   process uses a single client + pool; it is closed at exit
+# - per-provider RPM/TPM token buckets (services/rate_limiter.py)
+# - jittered exponential backoff on 429 / 5xx / connection errors
+#
+# Instructor's own retry loop is limited to schema validation re-asks,
+# so API errors surface here and get the backoff + limiter treatment.
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, object]" = (
+    weakref.WeakKeyDictionary()
+)
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+def _build_async_client():
+    import instructor
+
+    if llm_provider in ("laozhang-claude", "claude"):
+        import httpx
+        from openai import AsyncOpenAI
+
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(600.0, connect=10.0),
+        )
+        if llm_provider == "laozhang-claude":
+            api_key, base_url = settings.LAOZHANG_API_KEY, "https://api.laozhang.ai/v1"
+        else:
+            api_key, base_url = settings.ANTHROPIC_API_KEY, "https://api.anthropic.com/v1"
+        base_url = settings.LLM_BASE_URL or base_url
+
+        async_client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=http_client,
+            max_retries=0,  # backoff is handled below
+        )
+        return instructor.from_openai(async_client)
+
+    if llm_provider == "gemini":
+        from google import genai
+
+        return instructor.from_genai(
+            client=genai.Client(api_key=settings.GEMINI_API_KEY),
+            mode=instructor.Mode.GENAI_TOOLS,
+            use_async=True,
+        )
 
-else:
     raise ValueError(f"Unknown LLM_PROVIDER: {llm_provider}")
+
+
+def get_async_instructor_client():
+    """Async Instructor client for the running event loop (created once per loop)."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = attach_llm_hooks(_build_async_client())
+        _async_clients[loop] = client
+    return client
+
+
+async def _aclose_client(client) -> None:
+    """Close the provider SDK client behind an AsyncInstructor (its HTTP pool)."""
+    sdk = getattr(client, "client", None)
+    close = getattr(getattr(sdk, "aio", None), "aclose", None) or getattr(sdk, "close", None)
+    if close is not None:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+
+
+_shared_loop: asyncio.AbstractEventLoop | None = None
+_shared_thread: threading.Thread | None = None
+_shared_lock = threading.Lock()
+
+
+def _get_shared_loop() -> asyncio.AbstractEventLoop:
+    global _shared_loop, _shared_thread
+    with _shared_lock:
+        if _shared_loop is None:
+            _shared_loop = asyncio.new_event_loop()
+            _shared_thread = threading.Thread(target=_shared_loop.run_forever, name="llm-event-loop", daemon=True)
+            _shared_thread.start()
+        return _shared_loop
+
+
+def run_async(coro):
+    """
+    Run `coro` on the process-wide LLM event loop and wait for the result.
+    Safe from any number of threads (batch_runner workers); all of them
+    share the loop's client, connection pool and rate limiter.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_shared_loop()).result()
+
+
+@atexit.register
+def close_async_clients() -> None:
+    """Close the shared loop's client and stop the loop (runs at exit)."""
+    global _shared_loop, _shared_thread
+    with _shared_lock:
+        loop, thread = _shared_loop, _shared_thread
+        _shared_loop = _shared_thread = None
+    if loop is None:
+        return
+    client = _async_clients.pop(loop, None)
+    if client is not None:
+        asyncio.run_coroutine_threadsafe(_aclose_client(client), loop).result(timeout=30)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    import httpx
+    from openai import APIConnectionError, APITimeoutError
+
+    if isinstance(exc, (APIConnectionError, APITimeoutError, httpx.TransportError)):
+        return True
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    return isinstance(status, int) and status in RETRYABLE_STATUS_CODES
+
+
+def _total_tokens(completion) -> int | None:
+    """Token usage from an OpenAI-style or GenAI raw response."""
+    usage = getattr(completion, "usage", None)
+    if usage is not None:
+        return getattr(usage, "total_tokens", None)
+    usage = getattr(completion, "usage_metadata", None)
+    if usage is not None:
+        return getattr(usage, "total_token_count", None)
+    return None
+
+
+async def acreate_with_limits(
+    *,
+    response_model,
+    messages: list[dict],
+    max_tokens: int,
+    temperature: float = 0,
+    model: str | None = None,
+    validation_retries: int = 3,
+):
+    """
+    Rate-limited, retried async structured extraction.
+    Returns (dto, raw_completion).
+    """
+    from instructor.core import AsyncValidationError, ValidationError as InstructorValidationError
+    from pydantic import ValidationError
+    from tenacity import (
+        AsyncRetrying,
+        retry_if_exception,
+        retry_if_exception_type,
+        stop_after_attempt,
+        wait_random_exponential,
+    )
+
+    client = get_async_instructor_client()
+    limiter = get_rate_limiter(llm_provider)
+    record_llm_call()
+    estimated = estimate_request_tokens(messages, schema_json(response_model), max_tokens)
+
+    retrying = AsyncRetrying(
+        retry=retry_if_exception(_is_retryable),
+        wait=wait_random_exponential(multiplier=1, max=60),
+        stop=stop_after_attempt(settings.LLM_MAX_RETRIES),
+        reraise=True,
+    )
+
+    async for attempt in retrying:
+        with attempt:
+            await limiter.acquire(estimated)
+            dto, completion = await client.chat.completions.create_with_completion(
+                model=model or llm_model,
+                response_model=prepare_response_model(response_model),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                messages=messages,
+                max_retries=AsyncRetrying(
+                    stop=stop_after_attempt(validation_retries),
+                    retry=retry_if_exception_type(
+                        (ValidationError, JSONDecodeError, InstructorValidationError, AsyncValidationError)
+                    ),
+                ),
+            )
+            limiter.reconcile(estimated, _total_tokens(completion))
+            return dto, completion
@@ -0,0 +1,83 @@
+# services/listing_queries.py
+
+"""
+Read helpers for listing lookups, written so Postgres can answer them from
+the indexes declared on db_models.Listing:
+
+    category    canonical_categories @> ARRAY[...]   GIN  ix_listings_canonical_categories_gin
+    city        city = ...                           btree ix_listings_city
+    category + city                                  GIN  ix_listings_city_canonical_categories_gin
+                                                     (btree_gin), else BitmapAnd of the two above
+    attributes  other_attributes @> '{...}'          GIN  ix_listings_other_attributes_gin
+    open_on     opening_hours @> '{"sunday": {}}'   GIN  ix_listings_opening_hours_gin
+
+    with Session(engine) as session:
+        padel = find_listings(session, category="padel", city="Edinburgh")
+        print(explain_listings(session, category="padel", city="Edinburgh"))
+"""
+
+from typing import Any, Optional
+
+from sqlalchemy import String, type_coerce
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+from sqlmodel import Session, select
+
+from database.db_models import Listing
+
+
+def listings_query(
+    *,
+    category: Optional[str] = None,
+    city: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    attributes: Optional[dict[str, Any]] = None,
+    open_on: Optional[str] = None,
+    limit: Optional[int] = None,
+):
+    """SELECT for listings matching every given filter, ordered by name."""
+    stmt = select(Listing)
+    if category:
+        stmt = stmt.where(Listing.canonical_categories.op("@>")(type_coerce([category], ARRAY(String))))
+    if city:
+        stmt = stmt.where(Listing.city == city)
+    if entity_type:
+        stmt = stmt.where(Listing.entity_type == entity_type)
+    if attributes:
+        stmt = stmt.where(Listing.other_attributes.op("@>")(type_coerce(attributes, JSONB)))
+    if open_on:
+        # {"sunday": "CLOSED"} is stored too, so require an open/close object
+        stmt = stmt.where(Listing.opening_hours.op("@>")(type_coerce({open_on.lower(): {}}, JSONB)))
+    stmt = stmt.order_by(Listing.entity_name)
+    if limit:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def find_listings(session: Session, **filters) -> list[Listing]:
+    return list(session.exec(listings_query(**filters)).all())
+
+
+# -------------------------------------------------------
+# EXPLAIN
+# -------------------------------------------------------
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement, analyze: bool = False):
+        self.statement = statement
+        self.analyze = analyze
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    prefix = "EXPLAIN (ANALYZE, BUFFERS) " if element.analyze else "EXPLAIN "
+    return prefix + compiler.process(element.statement, **kw)
+
+
+def explain_listings(session: Session, analyze: bool = False, **filters) -> str:
+    """Postgres query plan for find_listings(**filters) (to check index use)."""
+    rows = session.execute(_Explain(listings_query(**filters), analyze=analyze)).all()
+    return "\n".join(row[0] for row in rows)
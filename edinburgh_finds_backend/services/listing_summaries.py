@@ -0,0 +1,154 @@
+# services/listing_summaries.py
+
+"""
+Keeps listing_summaries (db_models.ListingSummary) in step with listings +
+their entity rows, and reads from it.
+
+Incremental refresh: upsert_from_schema / upsert_many call
+refresh_listing_summaries() with the listings they changed, inside the same
+transaction, so a summary row is never older than its listing. A full
+rebuild (new table, facet or search text definitions changed) is
+scripts/rebuild_listing_summaries.py.
+
+    with Session(engine) as session:
+        row = get_listing_summary(session, "powerleague-portobello")
+        padel_with_parking = find_summaries(session, sport="padel", flags=["has_parking"])
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import String, type_coerce
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import Session, select
+
+from core.entity_registry import EntityConfig, get_entity_config
+from database.db_models import Listing, ListingSummary
+from utils.search_text import search_fields
+
+# Listing columns copied as-is (facet columns come from the entity config)
+LISTING_COLUMNS = (
+    "listing_id", "entity_name", "entity_type", "slug", "summary", "canonical_categories",
+    "street_address", "city", "postcode", "latitude", "longitude", "phone", "website_url",
+    "opening_hours",
+)
+ENTITY_COLUMNS = ("average_rating", "review_count")
+FLAG_COLUMNS = tuple(
+    name for name in ListingSummary.model_fields if name.startswith("has_")
+)
+
+
+# -------------------------------------------------------
+# REFRESH
+# -------------------------------------------------------
+def summary_values(listing: Listing, entity: Any, config: EntityConfig) -> Dict[str, Any]:
+    """Column values of the listing_summaries row for one listing."""
+    values = {column: getattr(listing, column) for column in LISTING_COLUMNS}
+    values.update({column: getattr(entity, column, None) for column in ENTITY_COLUMNS})
+    values.update({"sports": [], "court_counts": {}, "total_courts": 0})
+    values.update({column: False for column in FLAG_COLUMNS})
+    if entity is not None and config.summary_facets is not None:
+        values.update(config.summary_facets(entity))
+    values.update(search_fields(listing, entity, values["sports"]))
+    return values
+
+
+def refresh_listing_summaries(session: Session, rows: Iterable[Tuple[Listing, Any, EntityConfig]]) -> int:
+    """
+    Create / update the summary rows for (listing, entity, config) triples in
+    the caller's transaction: one SELECT for the existing rows, then the
+    changes go out with the caller's flush. Returns the number of rows written.
+    """
+    rows = list({listing.listing_id: (listing, entity, config) for listing, entity, config in rows}.values())
+    if not rows:
+        return 0
+
+    existing = {
+        summary.listing_id: summary
+        for summary in session.exec(
+            select(ListingSummary).where(ListingSummary.listing_id.in_([listing.listing_id for listing, _, _ in rows]))
+        )
+    }
+
+    written = 0
+    for listing, entity, config in rows:
+        values = summary_values(listing, entity, config)
+        summary = existing.get(listing.listing_id)
+        if summary is None:
+            session.add(ListingSummary(**values))
+            written += 1
+            continue
+        changed = False
+        for column, value in values.items():
+            if getattr(summary, column) != value:
+                setattr(summary, column, value)
+                changed = True
+        written += changed
+    return written
+
+
+def summary_rows(session: Session, listings: Iterable[Listing]) -> List[Tuple[Listing, Any, EntityConfig]]:
+    """(listing, entity, config) triples for refresh_listing_summaries: one query per entity table."""
+    listings = list(listings)
+    ids_by_type: Dict[str, List[str]] = {}
+    for listing in listings:
+        ids_by_type.setdefault(listing.entity_type, []).append(listing.listing_id)
+    entities = {}
+    for entity_type, ids in ids_by_type.items():
+        table = get_entity_config(entity_type).table
+        entities.update({e.listing_id: e for e in session.exec(select(table).where(table.listing_id.in_(ids)))})
+    return [
+        (listing, entities.get(listing.listing_id), get_entity_config(listing.entity_type))
+        for listing in listings
+    ]
+
+
+def refresh_summaries_for(session: Session, listing_ids: Iterable[str]) -> int:
+    """
+    refresh_listing_summaries for listings changed outside the ORM (bulk
+    UPDATEs): reloads them, in the caller's transaction, and their entity rows.
+    """
+    listing_ids = list(listing_ids)
+    if not listing_ids:
+        return 0
+    listings = session.exec(select(Listing).where(Listing.listing_id.in_(listing_ids))).all()
+    return refresh_listing_summaries(session, summary_rows(session, listings))
+
+
+# -------------------------------------------------------
+# READ
+# -------------------------------------------------------
+def get_listing_summary(session: Session, slug: str) -> Optional[ListingSummary]:
+    return session.exec(select(ListingSummary).where(ListingSummary.slug == slug)).one_or_none()
+
+
+def summaries_query(
+    *,
+    category: Optional[str] = None,
+    sport: Optional[str] = None,
+    city: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    flags: Iterable[str] = (),
+    limit: Optional[int] = None,
+):
+    """SELECT for summary rows matching every given filter (flags: has_* columns), ordered by name."""
+    stmt = select(ListingSummary)
+    if category:
+        stmt = stmt.where(ListingSummary.canonical_categories.op("@>")(type_coerce([category], ARRAY(String))))
+    if sport:
+        stmt = stmt.where(ListingSummary.sports.op("@>")(type_coerce([sport], ARRAY(String))))
+    if city:
+        stmt = stmt.where(ListingSummary.city == city)
+    if entity_type:
+        stmt = stmt.where(ListingSummary.entity_type == entity_type)
+    for flag in flags:
+        if flag not in FLAG_COLUMNS:
+            raise ValueError(f"Unknown summary flag '{flag}' (expected one of {', '.join(FLAG_COLUMNS)})")
+        stmt = stmt.where(getattr(ListingSummary, flag).is_(True))
+    stmt = stmt.order_by(ListingSummary.entity_name)
+    if limit:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def find_summaries(session: Session, **filters) -> List[ListingSummary]:
+    return list(session.exec(summaries_query(**filters)).all())
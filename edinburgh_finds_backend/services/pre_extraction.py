@@ -0,0 +1,362 @@
+# services/pre_extraction.py
+
+"""
+Rule-based pre-extraction of the fields that don't need an LLM.
+
+Contact and location fields are written in gather files as labelled lines
+("Phone: 0131 561 4500", "Latitude: 55.95473", "Monday: 9:00 AM - 10:30 PM"),
+so they can be parsed directly:
+
+    phone, email, postcode, latitude, longitude, opening_hours,
+    website_url, instagram_url, facebook_url, twitter_url, linkedin_url
+
+Only GRADE A/B/C sections are read. Each field takes its value from the
+highest grade it appears in, with that grade's confidence (same scale as
+the extraction prompt: A 1.0, B 0.8, C 0.5). Different values within that
+grade count as a conflict: the first one is kept at 0.5.
+
+The LLM then gets a reduced schema without the pre-filled fields, and the
+input without the lines fully explained by them. When what's left is
+small, the call can go to LLM_CHEAP_MODEL instead of LLM_MODEL.
+Rule values and the LLM result are merged with the usual confidence rule
+(services/chunked_extraction.merge_group_results).
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+from config.settings import settings
+from schemas.venue_extraction_schema import META_FIELDS, VenueSchema
+from services.chunked_extraction import merge_group_results
+from services.rate_limiter import estimate_tokens
+from utils.gather_sections import ZERO_WIDTH_RE, split_grade_sections
+from utils.model_conversion import to_partial_model
+from utils.normalisation import normalise_phone_number
+
+GRADE_CONFIDENCE = {"A": 1.0, "B": 0.8, "C": 0.5}
+CONFLICT_CONFIDENCE = 0.5
+
+RULE_FIELDS = (
+    "phone", "email", "postcode", "latitude", "longitude", "opening_hours",
+    "website_url", "instagram_url", "facebook_url", "twitter_url", "linkedin_url",
+)
+
+# -------------------------------------------------------
+# PATTERNS
+# -------------------------------------------------------
+PHONE_LABEL_RE = re.compile(r"\b(?:phone|telephone|tel|call)\b", re.IGNORECASE)
+PHONE_RE = re.compile(r"(?:\+44\s?(?:\(0\)\s?)?|\b0)\d{2,4}[\s-]?\d{3,4}[\s-]?\d{3,4}\b")
+
+EMAIL_LABEL_RE = re.compile(r"\be-?mail\b", re.IGNORECASE)
+EMAIL_RE = re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b")
+
+POSTCODE_LABEL_RE = re.compile(r"\b(?:postcode|address)\b", re.IGNORECASE)
+POSTCODE_RE = re.compile(r"\b([A-Z]{1,2}\d[A-Z\d]?) ?(\d[A-Z]{2})\b")
+
+LATITUDE_RE = re.compile(r"\blat(?:itude)?\s*[:=]\s*(-?\d{1,2}\.\d{3,})", re.IGNORECASE)
+LONGITUDE_RE = re.compile(r"\b(?:lon|lng|longitude)\s*[:=]\s*(-?\d{1,3}\.\d{3,})", re.IGNORECASE)
+COORD_PAIR_RE = re.compile(
+    r"\b(?:coordinates?|lat(?:itude)?\s*/\s*(?:lon|lng|long|longitude))\b[^:\n]*:\s*(-?\d{1,2}\.\d{3,})\s*°?\s*([NS])?\s*,\s*(-?\d{1,3}\.\d{3,})\s*°?\s*([EW])?",
+    re.IGNORECASE,
+)
+
+URL_RE = re.compile(r"https?://[^\s<>\[\]()\"'\u200b\u200c\u200d\u2060\ufeff]+")
+WEBSITE_LABEL_RE = re.compile(r"\b(?:website|web ?site|homepage|primary url|official url|url)\b", re.IGNORECASE)
+SOCIAL_DOMAINS = {
+    "instagram.com": "instagram_url",
+    "facebook.com": "facebook_url",
+    "twitter.com": "twitter_url",
+    "x.com": "twitter_url",
+    "linkedin.com": "linkedin_url",
+}
+# Paths that point at a post rather than a profile/page
+NON_PROFILE_PATH_RE = re.compile(r"^/(?:reel|reels|stories|explore|status|posts|events|sharer|share|hashtag|search)", re.IGNORECASE)
+INSTAGRAM_POST_PATH_RE = re.compile(r"^/p/[^/]+/?$")  # facebook.com/p/<name-id> is a page
+
+DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+_DAY = r"(mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun)[a-z]*"
+_TIME = r"(\d{1,2})(?:[:.](\d{2}))?\s*([ap]\.?m\.?)?"
+HOURS_LINE_RE = re.compile(
+    rf"^\W*{_DAY}(?:\s*(?:-|–|—|to)\s*{_DAY})?\s*:?\s*"
+    rf"(?:(closed)|{_TIME}\s*(?:-|–|—|to)\s*{_TIME})\s*\.?$",
+    re.IGNORECASE,
+)
+OTHER_DAYS_CLOSED_RE = re.compile(r"^\W*(?:all\s+)?other\s+days\s*:?\s*closed\s*\.?$", re.IGNORECASE)
+# Lines about days that parse_hours_line can't read ("Saturday & Sunday: 8am - 8pm", "Weekends: ...")
+DAY_LINE_RE = re.compile(r"^\W*(?:(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*|weekends?|weekdays?|daily)\b", re.IGNORECASE)
+
+# Words that may surround a value on a line the rules fully explain
+LABEL_WORDS_RE = re.compile(
+    r"\b(?:primary|main|alternative|official|general|reception|club|venue|contact|"
+    r"phone|telephone|tel|number|landline|e-?mail|address|postcode|website|web|site|homepage|url|"
+    r"gps|coordinates?|lat|latitude|lon|lng|longitude|instagram|facebook|twitter|x|linkedin|page|profile|"
+    r"[NSEW])\b",
+    re.IGNORECASE,
+)
+
+
+# -------------------------------------------------------
+# LINE RULES
+# -------------------------------------------------------
+def _phones(line: str) -> list[str]:
+    if not PHONE_LABEL_RE.search(line):
+        return []
+    phones = (normalise_phone_number(m.group(0)) for m in PHONE_RE.finditer(line))
+    return [p for p in phones if p and p.startswith("+")]
+
+
+def _emails(line: str) -> list[str]:
+    if not EMAIL_LABEL_RE.search(line):
+        return []
+    return [m.group(0).lower() for m in EMAIL_RE.finditer(line)]
+
+
+def _postcodes(line: str) -> list[str]:
+    if not POSTCODE_LABEL_RE.search(line):
+        return []
+    return [f"{m.group(1)} {m.group(2)}" for m in POSTCODE_RE.finditer(line)]
+
+
+def _coordinates(line: str) -> dict[str, float]:
+    found = {}
+    pair = COORD_PAIR_RE.search(line)
+    if pair:
+        lat, lat_hemi, lon, lon_hemi = pair.groups()
+        found["latitude"] = -abs(float(lat)) if (lat_hemi or "").upper() == "S" else float(lat)
+        found["longitude"] = -abs(float(lon)) if (lon_hemi or "").upper() == "W" else float(lon)
+    else:
+        if lat := LATITUDE_RE.search(line):
+            found["latitude"] = float(lat.group(1))
+        if lon := LONGITUDE_RE.search(line):
+            found["longitude"] = float(lon.group(1))
+
+    # UK bounds guard against misread numbers
+    if not 49.0 <= found.get("latitude", 55.0) <= 61.0:
+        found.pop("latitude")
+    if not -9.0 <= found.get("longitude", -3.0) <= 2.0:
+        found.pop("longitude")
+    return found
+
+
+def _urls(line: str) -> dict[str, str]:
+    found = {}
+    line = ZERO_WIDTH_RE.sub("", line)
+    for match in URL_RE.finditer(line):
+        url = match.group(0).rstrip(".,;:")
+        host, _, path = url.split("://", 1)[1].partition("/")
+        host = host.lower().removeprefix("www.").removeprefix("m.")
+        social = SOCIAL_DOMAINS.get(host)
+        if social:
+            post = NON_PROFILE_PATH_RE.match("/" + path) or (
+                social == "instagram_url" and INSTAGRAM_POST_PATH_RE.match("/" + path)
+            )
+            if not post:
+                found.setdefault(social, url)
+        elif WEBSITE_LABEL_RE.search(line):
+            found.setdefault("website_url", url)
+    return found
+
+
+def line_values(line: str) -> dict[str, Any]:
+    """All rule-field values found on one line (first of each kind)."""
+    values: dict[str, Any] = {}
+    for name, matches in (("phone", _phones(line)), ("email", _emails(line)), ("postcode", _postcodes(line))):
+        if matches:
+            values[name] = matches[0]
+    values.update(_coordinates(line))
+    values.update(_urls(line))
+    return values
+
+
+def _clock(hour: str, minute: Optional[str], meridiem: Optional[str]) -> Optional[str]:
+    h, m = int(hour), int(minute or 0)
+    meridiem = (meridiem or "").lower().replace(".", "")
+    if meridiem == "pm" and h < 12:
+        h += 12
+    elif meridiem == "am" and h == 12:
+        h = 0
+    if h > 24 or m > 59:
+        return None
+    return f"{h:02d}:{m:02d}"
+
+
+def _day_index(token: str) -> int:
+    return next(i for i, day in enumerate(DAYS) if day.startswith(token.lower()[:3]))
+
+
+def parse_hours_line(line: str) -> Optional[dict[str, Any]]:
+    """'Monday - Friday: 6am-10pm' → {'monday': {'open': '06:00', 'close': '22:00'}, ...}."""
+    match = HOURS_LINE_RE.match(line.strip())
+    if not match:
+        return None
+    first, last, closed, oh, om, omer, ch, cm, cmer = match.groups()
+
+    if closed:
+        value: Any = "CLOSED"
+    else:
+        # "9-5pm": the opening time takes the closing meridiem when it has none
+        opens, closes = _clock(oh, om, omer or (cmer if cmer and int(oh) < int(ch) else None)), _clock(ch, cm, cmer)
+        if not opens or not closes:
+            return None
+        value = {"open": opens, "close": closes}
+
+    start = _day_index(first)
+    end = _day_index(last) if last else start
+    span = range(start, end + 1) if end >= start else [*range(start, 7), *range(0, end + 1)]
+    return {DAYS[i]: value for i in span}
+
+
+# -------------------------------------------------------
+# PRE-EXTRACTION
+# -------------------------------------------------------
+@dataclass
+class PreExtraction:
+    values: dict[str, Any] = field(default_factory=dict)
+    field_confidence: dict[str, float] = field(default_factory=dict)
+    remaining_text: str = ""
+    consumed_lines: int = 0
+
+    def to_model(self) -> BaseModel:
+        """Partial DTO (rule fields + field_confidence) for merge_group_results."""
+        return get_rule_schema()(**self.values, field_confidence=self.field_confidence)
+
+    def merge_into(self, dto: BaseModel) -> BaseModel:
+        """Full VenueSchema from the rule values and the LLM result (higher confidence wins)."""
+        return merge_group_results([self.to_model(), dto]) if self.values else dto
+
+    def describe(self) -> str:
+        return (
+            f"{len(self.values)} field(s) pre-filled "
+            f"({', '.join(f'{k} {self.field_confidence[k]}' for k in self.values)}), "
+            f"{self.consumed_lines} line(s) removed from the LLM input"
+        )
+
+
+def _hours_blocks(lines: list[str]) -> list[tuple[dict, list[int]]]:
+    """
+    Consecutive runs of opening-hours lines (blank lines between allowed)
+    that give the whole week → (merged hours, line indexes). "Other days:
+    closed" fills the missing days. A run missing days, or next to a day
+    line the rules can't parse, is left to the LLM: pre-filling part of
+    the week would take opening_hours out of its schema.
+    """
+    blocks, hours, indexes = [], {}, []
+    other_days_closed, before = False, ""
+    for i, line in enumerate(lines + ["end"]):
+        if not line.strip():
+            continue
+        parsed = parse_hours_line(line)
+        if parsed:
+            for day, value in parsed.items():
+                hours.setdefault(day, value)
+            indexes.append(i)
+        elif hours and OTHER_DAYS_CLOSED_RE.match(line.strip()):
+            other_days_closed = True
+            indexes.append(i)
+        elif hours:
+            if other_days_closed:
+                hours.update({day: "CLOSED" for day in DAYS if day not in hours})
+            if len(hours) == len(DAYS) and not (DAY_LINE_RE.match(before) or DAY_LINE_RE.match(line)):
+                blocks.append(({day: hours[day] for day in DAYS}, indexes))
+            hours, indexes, other_days_closed = {}, [], False
+        if not indexes:
+            before = line
+    return blocks
+
+
+def _is_fully_explained(line: str, values: dict[str, Any], chosen: dict[str, Any]) -> bool:
+    """Line holds only labels plus values identical to the chosen ones."""
+    if not values or any(chosen.get(k) != v for k, v in values.items()):
+        return False
+    residue = URL_RE.sub(" ", line)
+    residue = EMAIL_RE.sub(" ", residue)
+    residue = PHONE_RE.sub(" ", residue)
+    residue = POSTCODE_RE.sub(" ", residue)
+    residue = re.sub(r"-?\d+\.\d+\s*°?", " ", residue)
+    residue = LABEL_WORDS_RE.sub(" ", residue)
+    return not re.search(r"[^\W_]", residue)
+
+
+def pre_extract_fields(text: str) -> PreExtraction:
+    """Fill RULE_FIELDS from the GRADE A/B/C sections of `text`."""
+    sections = [(s, s.body.splitlines()) for s in split_grade_sections(text)]
+
+    # field → [(rank, value)] in document order
+    candidates: dict[str, list[tuple[int, Any]]] = {}
+    line_hits: dict[tuple[int, int], dict[str, Any]] = {}
+    hours_hits: dict[tuple[int, int], dict] = {}
+
+    for s_index, (section, lines) in enumerate(sections):
+        if section.grade not in GRADE_CONFIDENCE:
+            continue
+        rank = "ABC".index(section.grade)
+        for l_index, line in enumerate(lines):
+            values = line_values(line)
+            if values:
+                line_hits[(s_index, l_index)] = values
+                for name, value in values.items():
+                    candidates.setdefault(name, []).append((rank, value))
+        for hours, indexes in _hours_blocks(lines):
+            candidates.setdefault("opening_hours", []).append((rank, hours))
+            for l_index in indexes:
+                hours_hits[(s_index, l_index)] = hours
+
+    result = PreExtraction()
+    for name, found in candidates.items():
+        best_rank = min(rank for rank, _ in found)
+        values = [value for rank, value in found if rank == best_rank]
+        result.values[name] = values[0]
+        conflict = any(value != values[0] for value in values[1:])
+        result.field_confidence[name] = CONFLICT_CONFIDENCE if conflict else GRADE_CONFIDENCE["ABC"[best_rank]]
+
+    # Lat/lon only make sense together
+    if ("latitude" in result.values) != ("longitude" in result.values):
+        for name in ("latitude", "longitude"):
+            result.values.pop(name, None)
+            result.field_confidence.pop(name, None)
+
+    # LLM input: everything except the lines the chosen values fully explain
+    out = []
+    for s_index, (section, lines) in enumerate(sections):
+        kept = []
+        for l_index, line in enumerate(lines):
+            hours = hours_hits.get((s_index, l_index))
+            values = line_hits.get((s_index, l_index))
+            if hours is not None and hours is result.values.get("opening_hours"):
+                result.consumed_lines += 1
+                continue
+            if values and _is_fully_explained(line, values, result.values):
+                result.consumed_lines += 1
+                continue
+            kept.append(line)
+        body = "\n".join(kept).strip()
+        if body or section.header:
+            out.append("\n".join(filter(None, [section.header, body])))
+    result.remaining_text = "\n\n".join(out)
+    return result
+
+
+# -------------------------------------------------------
+# SCHEMAS + MODEL ROUTING
+# -------------------------------------------------------
+@lru_cache(maxsize=1)
+def get_rule_schema() -> type[BaseModel]:
+    return to_partial_model(VenueSchema, RULE_FIELDS + ("field_confidence",), "VenueSchema_Rules")
+
+
+@lru_cache(maxsize=64)
+def get_remainder_schema(prefilled: frozenset[str]) -> type[BaseModel]:
+    """VenueSchema without the pre-filled fields (one class per combination)."""
+    fields = [name for name in VenueSchema.model_fields if name not in prefilled or name in META_FIELDS]
+    return to_partial_model(VenueSchema, fields, "VenueSchema")
+
+
+def choose_model(llm_text: str) -> str:
+    """LLM_CHEAP_MODEL for small remainders (when configured), else LLM_MODEL."""
+    if settings.LLM_CHEAP_MODEL and estimate_tokens(llm_text) <= settings.LLM_CHEAP_MODEL_MAX_INPUT_TOKENS:
+        return settings.LLM_CHEAP_MODEL
+    return settings.LLM_MODEL
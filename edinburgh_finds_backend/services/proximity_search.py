@@ -0,0 +1,205 @@
+# services/proximity_search.py
+
+"""
+Radius and k-nearest searches over listing coordinates.
+
+    with Session(engine) as session:
+        for listing, km in listings_within(session, 55.9533, -3.1883, 3.0, category="padel"):
+            ...
+        closest = nearest_listings(session, 55.9533, -3.1883, k=5)
+
+Both return [(Listing, distance_km), ...], nearest first. Extra keyword
+filters are those of listing_queries.listings_query (category, city,
+entity_type, attributes, open_on).
+
+Two backends (GEO_SEARCH_BACKEND, or backend=... per call):
+
+    geohash   prefix scans on the indexed listings.geohash column: the 3x3
+              block of cells covering the circle, narrowed by a lat/lon
+              bounding box; exact haversine distances on what's left
+    memory    a GeoKDTree of every listing with coordinates, built on first
+              use and rebuilt after GEO_INDEX_TTL_SECONDS (or after
+              refresh_geo_index()); works before the geohash column is
+              backfilled (scripts/backfill_geohash.py)
+
+The geohash column rather than PostGIS: it needs no server extension and
+runs the same on SQLite (local benchmarks).
+"""
+
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlmodel import Session, select
+
+from config.settings import settings
+from database.db_models import Listing
+from services.listing_queries import listings_query
+from utils.geo import (
+    GeoKDTree,
+    bounding_box,
+    cell_min_side_km,
+    covering_cells,
+    haversine_km,
+)
+
+# nearest_listings() starts at cells of ~100 m and widens one precision at a time
+KNN_START_PRECISION = 7
+
+Hit = tuple[Listing, float]
+
+
+def _backend(backend: Optional[str]) -> str:
+    backend = backend or settings.GEO_SEARCH_BACKEND
+    if backend not in ("geohash", "memory"):
+        raise ValueError(f"Unknown geo search backend '{backend}' (expected 'geohash' or 'memory')")
+    return backend
+
+
+# -------------------------------------------------------
+# GEOHASH BACKEND
+# -------------------------------------------------------
+def _cell_candidates(session: Session, lat: float, lon: float, radius_km: float,
+                     cells: list[str], filters: dict) -> list[Hit]:
+    """Listings in `cells` (and the circle's bounding box) within radius_km, nearest first."""
+    stmt = listings_query(**filters).order_by(None).where(
+        or_(*(Listing.geohash.like(f"{cell}%") for cell in cells))
+    )
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    stmt = stmt.where(Listing.latitude.between(min_lat, max_lat))
+    if -180.0 <= min_lon and max_lon <= 180.0:
+        stmt = stmt.where(Listing.longitude.between(min_lon, max_lon))
+
+    hits = []
+    for listing in session.exec(stmt):
+        km = haversine_km(lat, lon, listing.latitude, listing.longitude)
+        if km <= radius_km:
+            hits.append((listing, km))
+    hits.sort(key=lambda hit: hit[1])
+    return hits
+
+
+def _nearest_by_geohash(session: Session, lat: float, lon: float, k: int, filters: dict) -> list[Hit]:
+    # The 3x3 block at a precision holds every listing within one cell side
+    # of the point; once k of them fall inside that distance, they are the k nearest.
+    for precision in range(KNN_START_PRECISION, 0, -1):
+        reach_km = cell_min_side_km(precision, lat)
+        cells = covering_cells(lat, lon, reach_km, max_precision=precision)
+        hits = _cell_candidates(session, lat, lon, reach_km, cells, filters)
+        if len(hits) >= k:
+            return hits[:k]
+
+    # Fewer than k listings within a few thousand km: rank them all
+    stmt = listings_query(**filters).order_by(None).where(Listing.geohash.is_not(None))
+    hits = [(listing, haversine_km(lat, lon, listing.latitude, listing.longitude))
+            for listing in session.exec(stmt)]
+    hits.sort(key=lambda hit: hit[1])
+    return hits[:k]
+
+
+# -------------------------------------------------------
+# IN-MEMORY BACKEND
+# -------------------------------------------------------
+class _GeoIndexStore:
+    """Holds the KD-tree of listing coordinates and rebuilds it when stale."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built_at: float | None = None
+        self.tree: GeoKDTree | None = None
+
+    def _fresh(self) -> bool:
+        return self.tree is not None and time.monotonic() - self._built_at < settings.GEO_INDEX_TTL_SECONDS
+
+    def get(self, session: Session) -> GeoKDTree:
+        if self._fresh():
+            return self.tree
+
+        with self._lock:
+            if self._fresh():
+                return self.tree
+            rows = session.exec(
+                select(Listing.latitude, Listing.longitude, Listing.listing_id).where(
+                    Listing.latitude.is_not(None), Listing.longitude.is_not(None)
+                )
+            ).all()
+            self.tree = GeoKDTree(rows)
+            self._built_at = time.monotonic()
+            return self.tree
+
+    def clear(self) -> None:
+        with self._lock:
+            self.tree, self._built_at = None, None
+
+
+_store = _GeoIndexStore()
+
+
+def get_geo_index(session: Session) -> GeoKDTree:
+    """In-process KD-tree of all listing coordinates (payload: listing_id)."""
+    return _store.get(session)
+
+
+def refresh_geo_index() -> None:
+    """Drop the in-memory tree; the next memory-backend search rebuilds it."""
+    _store.clear()
+
+
+def _load_hits(session: Session, tree_hits: list[tuple[float, str]], filters: dict) -> list[Hit]:
+    """Fetch the Listing rows for KD-tree hits, keeping order and applying filters."""
+    if not tree_hits:
+        return []
+    ids = [listing_id for _, listing_id in tree_hits]
+    stmt = listings_query(**filters).order_by(None).where(Listing.listing_id.in_(ids))
+    rows = {listing.listing_id: listing for listing in session.exec(stmt)}
+    return [(rows[listing_id], km) for km, listing_id in tree_hits if listing_id in rows]
+
+
+def _nearest_in_memory(session: Session, lat: float, lon: float, k: int, filters: dict) -> list[Hit]:
+    tree = get_geo_index(session)
+    want = k
+    while True:
+        hits = _load_hits(session, tree.nearest(lat, lon, want), filters)
+        # Filters can reject tree hits: widen until k survive or the tree is exhausted
+        if len(hits) >= k or want >= len(tree):
+            return hits[:k]
+        want *= 4
+
+
+# -------------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------------
+def listings_within(
+    session: Session,
+    lat: float,
+    lon: float,
+    radius_km: float,
+    *,
+    limit: Optional[int] = None,
+    backend: Optional[str] = None,
+    **filters,
+) -> list[Hit]:
+    """Listings within radius_km of (lat, lon), nearest first."""
+    if _backend(backend) == "memory":
+        hits = _load_hits(session, get_geo_index(session).within(lat, lon, radius_km), filters)
+    else:
+        hits = _cell_candidates(session, lat, lon, radius_km, covering_cells(lat, lon, radius_km), filters)
+    return hits[:limit] if limit else hits
+
+
+def nearest_listings(
+    session: Session,
+    lat: float,
+    lon: float,
+    k: int = 10,
+    *,
+    backend: Optional[str] = None,
+    **filters,
+) -> list[Hit]:
+    """The k listings closest to (lat, lon), nearest first."""
+    if k <= 0:
+        return []
+    if _backend(backend) == "memory":
+        return _nearest_in_memory(session, lat, lon, k, filters)
+    return _nearest_by_geohash(session, lat, lon, k, filters)
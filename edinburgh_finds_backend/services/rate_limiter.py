@@ -0,0 +1,96 @@
+# services/rate_limiter.py
+
+"""
+Provider-agnostic token-bucket rate limiting for LLM calls.
+
+Each provider gets one limiter holding two buckets:
+    - requests per minute (RPM)
+    - tokens per minute (TPM)
+
+Buckets use a "debt" model: a caller reserves what it needs immediately
+(the balance may go negative) and then sleeps until the balance would have
+refilled. State is guarded by a threading lock, so one limiter can be shared
+by every thread and every event loop in the process.
+"""
+
+import asyncio
+import threading
+import time
+
+from config.settings import settings
+
+
+class TokenBucket:
+    """Continuous-refill token bucket (capacity = one minute of budget)."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0  # refill per second
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` now and return how many seconds the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def refund(self, amount: float):
+        """Return (or, if negative, charge) tokens after the real cost is known."""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateLimiter:
+    """RPM + TPM limiter for a single provider."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    async def acquire(self, estimated_tokens: int):
+        wait = max(self.requests.reserve(1), self.tokens.reserve(estimated_tokens))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int | None):
+        """Correct the TPM bucket once the provider reports real usage."""
+        if actual_tokens is not None:
+            self.tokens.refund(estimated_tokens - actual_tokens)
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str | None = None) -> RateLimiter:
+    """Shared limiter for `provider` (defaults to settings.LLM_PROVIDER)."""
+    provider = provider or settings.LLM_PROVIDER
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = RateLimiter(
+                requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+                tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+            )
+        return _limiters[provider]
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Cheap token estimate (~4 characters per token)."""
+    return sum(len(t) for t in texts if t) // 4 + 1
+
+
+def estimate_request_tokens(messages: list[dict], schema_json: str = "", max_tokens: int = 0) -> int:
+    """
+    TPM reservation for one call: the messages and the tool schema (both
+    billed as input) plus the output budget. reconcile() refunds the
+    difference once real usage is known.
+    """
+    return estimate_tokens(*(m["content"] for m in messages), schema_json) + max_tokens
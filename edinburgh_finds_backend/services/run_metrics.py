@@ -0,0 +1,269 @@
+# services/run_metrics.py
+
+"""
+Structured per-run instrumentation for the extraction pipeline.
+
+One record per process_raw_text() call, appended as a JSON line to
+settings.METRICS_PATH (default data/metrics/extraction_runs.jsonl):
+
+    {
+      "run_id": "...", "entity_name": "...", "entity_type": "venue",
+      "source_type": "manual_file", "status": "ok" | "skipped" | "error",
+      "started_at": "2025-12-18T10:02:11", "duration_s": 41.2,
+      "stages": {"prompt": 0.0001, "extract": 40.1, "upsert": 0.09, "write": 0.004, ...},
+      "llm": {"calls": 1, "attempts": 1, "retries": 0, "validation_errors": 0,
+              "request_s": 39.8, "input_tokens": 9120, "output_tokens": 3500, "cost_usd": 0.0798},
+      "cache_hit": false, "db_round_trips": 6, "bytes_written": 61234,
+      "input_compaction": {"original_tokens": 4645, "compact_tokens": 2965, ...}
+    }
+
+How the numbers are collected:
+    - stages: `with stage("name"):` blocks in the pipeline (no-op outside a run)
+    - llm: Instructor hooks on every client (completion:kwargs / :response /
+      parse:error), so sync, async and chunked calls are all counted;
+      extract − llm.request_s is the time spent parsing/validating
+    - db_round_trips: SQLAlchemy before_cursor_execute on the shared engine
+      (an executemany batch counts once)
+
+The current run travels in a ContextVar, so concurrent batch threads (and
+the asyncio tasks they start) each update their own record.
+"""
+
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TypedDict
+
+from sqlalchemy import event
+
+from config.settings import settings
+from database.engine import engine
+
+
+class RunMetrics:
+    def __init__(self, **labels):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.labels = labels
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.duration_s = 0.0
+        self.stages: dict[str, float] = {}
+        self.llm = {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,  # derived in to_dict()
+            "validation_errors": 0,
+            "request_s": 0.0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cost_usd": 0.0,
+        }
+        self.cache_hit = False
+        self.db_round_trips = 0
+        self.bytes_written = 0
+        self.input_compaction: Optional[dict] = None
+        self._lock = threading.Lock()  # chunked extraction updates from parallel tasks
+
+    def add_stage(self, name: str, seconds: float):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_llm(self, **values):
+        with self._lock:
+            for key, value in values.items():
+                self.llm[key] += value
+
+    def add_db_round_trip(self):
+        with self._lock:
+            self.db_round_trips += 1
+
+    def to_dict(self) -> dict:
+        llm = dict(self.llm)
+        llm["retries"] = max(0, llm["attempts"] - llm["calls"])
+        llm["request_s"] = round(llm["request_s"], 4)
+        llm["cost_usd"] = round(llm["cost_usd"], 6)
+        return {
+            "run_id": self.run_id,
+            **self.labels,
+            "status": self.status,
+            "error": self.error,
+            "started_at": self.started_at,
+            "duration_s": round(self.duration_s, 4),
+            "stages": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            "llm": llm,
+            "cache_hit": self.cache_hit,
+            "db_round_trips": self.db_round_trips,
+            "bytes_written": self.bytes_written,
+            "input_compaction": self.input_compaction,
+        }
+
+
+_current_run: ContextVar[Optional[RunMetrics]] = ContextVar("current_run", default=None)
+_sink_lock = threading.Lock()
+
+
+def current_run() -> Optional[RunMetrics]:
+    return _current_run.get()
+
+
+# -------------------------------------------------------
+# RUN / STAGE SCOPES
+# -------------------------------------------------------
+@contextmanager
+def track_run(**labels) -> Iterator[RunMetrics]:
+    """Collect metrics for one pipeline run and write them to the sink on exit."""
+    metrics = RunMetrics(**labels)
+    token = _current_run.set(metrics)
+    started = time.perf_counter()
+    try:
+        yield metrics
+    except Exception as exc:
+        metrics.status = "error"
+        metrics.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        metrics.duration_s = time.perf_counter() - started
+        _current_run.reset(token)
+        write_metrics(metrics.to_dict())
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as `name` on the current run (no-op outside track_run)."""
+    metrics = _current_run.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_stage(name, time.perf_counter() - started)
+
+
+# -------------------------------------------------------
+# LLM HOOKS
+# -------------------------------------------------------
+def _usage_tokens(response) -> tuple[int, int]:
+    """(input, output) tokens from an OpenAI-style or GenAI raw response."""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        return getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        return getattr(usage, "prompt_token_count", 0) or 0, getattr(usage, "candidates_token_count", 0) or 0
+    return 0, 0
+
+
+def attach_llm_hooks(client):
+    """Count attempts, request time, tokens and cost for every call made through `client`."""
+    sent_at: ContextVar[Optional[float]] = ContextVar("llm_sent_at", default=None)
+
+    def on_kwargs(*args, **kwargs):
+        metrics = _current_run.get()
+        if metrics is not None:
+            sent_at.set(time.perf_counter())
+            metrics.add_llm(attempts=1)
+
+    def on_response(response):
+        metrics = _current_run.get()
+        started = sent_at.get()
+        if metrics is None or started is None:
+            return
+        input_tokens, output_tokens = _usage_tokens(response)
+        metrics.add_llm(
+            request_s=time.perf_counter() - started,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cost_usd=(input_tokens * settings.LLM_INPUT_PRICE_PER_MTOK
+                      + output_tokens * settings.LLM_OUTPUT_PRICE_PER_MTOK) / 1_000_000,
+        )
+
+    def on_parse_error(*args, **kwargs):
+        metrics = _current_run.get()
+        if metrics is not None:
+            metrics.add_llm(validation_errors=1)
+
+    client.on("completion:kwargs", on_kwargs)
+    client.on("completion:response", on_response)
+    client.on("parse:error", on_parse_error)
+    return client
+
+
+def record_llm_call():
+    """Mark one logical LLM call (retries = attempts − calls)."""
+    metrics = _current_run.get()
+    if metrics is not None:
+        metrics.add_llm(calls=1)
+
+
+# -------------------------------------------------------
+# DB HOOK
+# -------------------------------------------------------
+@event.listens_for(engine, "before_cursor_execute")
+def _count_round_trip(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current_run.get()
+    if metrics is not None:
+        metrics.add_db_round_trip()
+
+
+# -------------------------------------------------------
+# SINK + SUMMARY
+# -------------------------------------------------------
+def write_metrics(record: dict):
+    if not settings.METRICS_ENABLED:
+        return
+    path = Path(settings.METRICS_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _sink_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+class RunSummary(TypedDict):
+    runs: int
+    by_status: dict[str, int]
+    cache_hits: int
+    run_time_s: float
+    stages_s: dict[str, float]
+    stages_share: dict[str, float]
+    llm: dict[str, float]
+    db_round_trips: int
+    bytes_written: int
+    input_tokens_saved_est: int
+
+
+def summarise_runs(records: Iterable[dict]) -> RunSummary:
+    """Aggregate run metrics: totals, per-stage time and share of stage time."""
+    records = list(records)
+    compacted = [r["input_compaction"] for r in records if r.get("input_compaction")]
+    stages: dict[str, float] = {}
+    llm_totals: dict[str, float] = {}
+    for record in records:
+        for name, seconds in record["stages"].items():
+            stages[name] = stages.get(name, 0.0) + seconds
+        for key, value in record["llm"].items():
+            llm_totals[key] = llm_totals.get(key, 0) + value
+
+    stage_total = sum(stages.values()) or 1.0
+    return {
+        "runs": len(records),
+        "by_status": {
+            status: sum(1 for r in records if r["status"] == status)
+            for status in sorted({r["status"] for r in records})
+        },
+        "cache_hits": sum(1 for r in records if r["cache_hit"]),
+        "run_time_s": round(sum(r["duration_s"] for r in records), 3),
+        "stages_s": {name: round(seconds, 3) for name, seconds in sorted(stages.items(), key=lambda kv: -kv[1])},
+        "stages_share": {name: round(seconds / stage_total, 3) for name, seconds in stages.items()},
+        "llm": {key: round(value, 6) if isinstance(value, float) else value for key, value in llm_totals.items()},
+        "db_round_trips": sum(r["db_round_trips"] for r in records),
+        "bytes_written": sum(r["bytes_written"] for r in records),
+        "input_tokens_saved_est": sum(c["original_tokens"] - c["compact_tokens"] for c in compacted),
+    }
@@ -0,0 +1,190 @@
+# services/scrape_cache.py
+
+"""
+Persistent scrape cache for FirecrawlClient.
+
+Entries are keyed by (proxy mode, URL) and hold the page markdown, the site's
+status code, the fetch time, a content hash and the origin's HTTP validators
+(ETag / Last-Modified). Only successful scrapes are stored: an error page
+(4xx / 5xx) would otherwise be served for the whole TTL. Crawled pages live
+under their own "crawl" key so they never replace a scrape's validators.
+
+Freshness:
+    - younger than the TTL            → served from cache, no network
+    - older than the TTL (stale)      → conditional HEAD against the origin;
+                                        304 or identical validators mean the
+                                        page is unchanged and it is served
+                                        from cache with a renewed fetch time
+    - no validators / changed         → re-scrape
+
+Size is bounded with LRU eviction (diskcache).
+"""
+
+import hashlib
+import time
+from typing import Any, Optional
+
+import requests
+from diskcache import Cache
+
+from config.settings import settings
+
+CRAWL_KEY = "crawl"  # key namespace for pages recorded by remember_page
+
+
+def content_hash(markdown: str) -> str:
+    return hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+
+
+def is_error_status(status_code: int | None) -> bool:
+    return status_code is not None and status_code >= 400
+
+
+def fetch_validators(url: str) -> dict:
+    """HEAD the origin and return its ETag / Last-Modified (empty on failure)."""
+    try:
+        resp = requests.head(url, allow_redirects=True, timeout=10)
+    except requests.RequestException:
+        return {}
+    return {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    }
+
+
+class ScrapeCache:
+    def __init__(
+        self,
+        directory: str | None = None,
+        ttl_seconds: float | None = None,
+        size_limit: int | None = None,
+    ):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.SCRAPE_CACHE_TTL_HOURS * 3600
+        self._cache = Cache(
+            directory or settings.SCRAPE_CACHE_DIR,
+            size_limit=size_limit or settings.SCRAPE_CACHE_MAX_BYTES,
+            eviction_policy="least-recently-used",
+        )
+
+    @staticmethod
+    def _key(url: str, proxy: str | None) -> str:
+        return f"{proxy or 'basic'}|{url}"
+
+    # ----------------------------
+    # READ
+    # ----------------------------
+    def get(self, url: str, proxy: str | None = None) -> Optional[dict]:
+        return self._cache.get(self._key(url, proxy))
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry["fetched_at"] < self.ttl_seconds
+
+    def revalidate(self, entry: dict) -> bool:
+        """
+        Ask the origin whether a stale entry is still current.
+        Returns True (and renews the entry) if the page is unchanged.
+        """
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        if not headers:
+            return False  # nothing to revalidate with
+
+        try:
+            resp = requests.head(entry["url"], headers=headers, allow_redirects=True, timeout=10)
+        except requests.RequestException:
+            return False
+
+        unchanged = resp.status_code == 304 or (
+            resp.ok
+            and (entry.get("etag") or None) == resp.headers.get("ETag")
+            and (entry.get("last_modified") or None) == resp.headers.get("Last-Modified")
+        )
+        if unchanged:
+            self._cache.set(self._key(entry["url"], entry["proxy"]), {**entry, "fetched_at": time.time()})
+        return unchanged
+
+    def lookup(self, url: str, proxy: str | None = None, refresh: str = "if_stale") -> Optional[dict]:
+        """
+        Return a usable cached entry, or None if the caller must scrape.
+
+        refresh:
+            "never"    - any cached entry is used, however old
+            "if_stale" - fresh entries are used; stale ones are revalidated
+            "always"   - never use the cache
+        """
+        if refresh == "always":
+            return None
+
+        entry = self.get(url, proxy)
+        if entry is None:
+            return None
+        if refresh == "never" or self.is_fresh(entry) or self.revalidate(entry):
+            return entry
+        return None
+
+    # ----------------------------
+    # WRITE
+    # ----------------------------
+    def put(
+        self,
+        url: str,
+        proxy: str | None,
+        markdown: str,
+        status_code: int | None,
+        metadata: dict[str, Any] | None = None,
+        validators: dict | None = None,
+    ) -> dict:
+        """
+        Store a page. The returned entry's `unchanged` flag tells whether the
+        content matches what was cached before. Error pages are returned
+        (unchanged=False) but not stored.
+        """
+        key = self._key(url, proxy)
+        previous = self._cache.get(key)
+        digest = content_hash(markdown)
+        if is_error_status(status_code):
+            validators = {}
+        elif validators is None:
+            validators = fetch_validators(url)
+
+        entry = {
+            "url": url,
+            "proxy": proxy,
+            "markdown": markdown,
+            "status_code": status_code,
+            "metadata": metadata or {},
+            "fetched_at": time.time(),
+            "content_hash": digest,
+            "etag": validators.get("etag"),
+            "last_modified": validators.get("last_modified"),
+        }
+        if is_error_status(status_code):
+            return {**entry, "unchanged": False}
+        self._cache.set(key, entry)
+        return {**entry, "unchanged": previous is not None and previous["content_hash"] == digest}
+
+    def remember_page(self, url: str, markdown: str, status_code: int | None = None) -> bool:
+        """
+        Record a crawled page under the crawl key (no validator lookup).
+        Returns True if its content is identical to the previous crawl's copy.
+        """
+        return self.put(url, CRAWL_KEY, markdown, status_code, validators={})["unchanged"]
+
+
+def entry_to_result(entry: dict, hit: bool) -> dict:
+    """Shape a cache entry like a Firecrawl /scrape response."""
+    return {
+        "success": True,
+        "data": {
+            "markdown": entry["markdown"],
+            "metadata": {**entry["metadata"], "statusCode": entry["status_code"]},
+        },
+        "cache": {
+            "hit": hit,
+            "unchanged": hit or entry.get("unchanged", False),
+            "fetched_at": entry["fetched_at"],
+        },
+    }
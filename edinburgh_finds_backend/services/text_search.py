@@ -0,0 +1,132 @@
+# services/text_search.py
+
+"""
+Ranked keyword search over listings: name, categories, sports, summary,
+every *_summary field of the entity row and other_attributes (the search
+columns of listing_summaries, see utils/search_text.py).
+
+    with Session(engine) as session:
+        for hit in search_listings(session, "padel coaching -squash", city="Edinburgh", limit=10):
+            print(hit.rank, hit.summary.entity_name, hit.headline)
+
+Postgres: websearch_to_tsquery (quoted phrases, OR, -term) against the
+generated, GIN-indexed search_vector column; ranked with ts_rank_cd, name
+matches weighing most, then keywords, then body text. For very common
+terms only a capped candidate set is ranked, name / keyword matches first. headlines=True adds a
+ts_headline snippet (it re-parses the body, so only for the returned page).
+
+Other databases (the SQLite benchmarks): every word must occur in the name,
+keywords or body (case-insensitive substring, no stemming), ranked by the
+same weights in Python.
+
+Extra keyword filters are those of listing_summaries.summaries_query
+(category, sport, city, entity_type, flags).
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import func, literal_column, or_, union
+from sqlmodel import Session, select
+
+from database.db_models import ListingSummary
+from services.listing_summaries import summaries_query
+
+TEXT_SEARCH_CONFIG = "english"
+SEARCH_VECTOR = literal_column("listing_summaries.search_vector")
+SEARCH_HEAD_VECTOR = literal_column("listing_summaries.search_head_vector")
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=20, MinWords=8, StartSel=<b>, StopSel=</b>"
+
+# ts_rank weights for D, C (body), B (keywords), A (name); also used by the fallback
+RANK_WEIGHTS = {"entity_name": 1.0, "search_keywords": 0.4, "search_body": 0.2}
+
+# Matches ranked per query, per vector (a term in most listings would
+# otherwise rank all of them); past it, which matches are ranked is arbitrary
+MAX_RANKED_CANDIDATES = 250
+
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass
+class SearchHit:
+    summary: ListingSummary
+    rank: float
+    headline: Optional[str] = None
+
+
+def _search_postgres(session: Session, query: str, limit: int, headlines: bool, filters: dict) -> List[SearchHit]:
+    tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query)
+
+    # Ranking reads every candidate's full vector, so candidates are capped:
+    # up to MAX_RANKED_CANDIDATES name / keyword matches plus as many matches
+    # anywhere. Full rows are loaded for the returned page only.
+    def matching(vector):
+        return (
+            summaries_query(**filters)
+            .order_by(None)
+            .with_only_columns(ListingSummary.listing_id)
+            .where(vector.op("@@")(tsquery))
+            .limit(MAX_RANKED_CANDIDATES)
+        )
+
+    candidates = union(matching(SEARCH_HEAD_VECTOR), matching(SEARCH_VECTOR)).subquery()
+    # 1 = divide by 1 + log(document length), so long bodies don't win by size
+    rank = func.ts_rank_cd(SEARCH_VECTOR, tsquery, 1).label("rank")
+    page = (
+        select(ListingSummary.listing_id, rank)
+        .join(candidates, candidates.c.listing_id == ListingSummary.listing_id)
+        .order_by(rank.desc())
+        .limit(limit)
+        .subquery()
+    )
+    stmt = (
+        select(ListingSummary, page.c.rank)
+        .join(page, page.c.listing_id == ListingSummary.listing_id)
+        .order_by(page.c.rank.desc(), ListingSummary.entity_name)
+    )
+    if headlines:
+        stmt = stmt.add_columns(
+            func.ts_headline(TEXT_SEARCH_CONFIG, func.coalesce(ListingSummary.search_body, ""), tsquery, HEADLINE_OPTIONS)
+        )
+    # session.execute: select(ListingSummary) + columns still comes back as scalars from exec()
+    return [SearchHit(row[0], float(row[1]), row[2] if headlines else None) for row in session.execute(stmt)]
+
+
+def _search_fallback(session: Session, query: str, limit: int, filters: dict) -> List[SearchHit]:
+    words = list(dict.fromkeys(word.lower() for word in _WORD_RE.findall(query)))
+    if not words:
+        return []
+    stmt = summaries_query(**filters).order_by(None)
+    for word in words:
+        stmt = stmt.where(or_(*(
+            func.lower(getattr(ListingSummary, column)).contains(word, autoescape=True) for column in RANK_WEIGHTS
+        )))
+
+    hits = []
+    for summary in session.exec(stmt):
+        rank = sum(
+            weight
+            for word in words
+            for column, weight in RANK_WEIGHTS.items()
+            if word in (getattr(summary, column) or "").lower()
+        )
+        hits.append(SearchHit(summary, rank))
+    hits.sort(key=lambda hit: (-hit.rank, hit.summary.entity_name))
+    return hits[:limit]
+
+
+def search_listings(
+    session: Session,
+    query: str,
+    *,
+    limit: int = 20,
+    headlines: bool = False,
+    **filters,
+) -> List[SearchHit]:
+    """Listings matching `query`, best first (empty list for a blank query)."""
+    if not query or not query.strip():
+        return []
+    if session.get_bind().dialect.name == "postgresql":
+        return _search_postgres(session, query, limit, headlines, filters)
+    return _search_fallback(session, query, limit, filters)
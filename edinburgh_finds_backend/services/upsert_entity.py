@@ -1,34 +1,19 @@
 # services/upsert_entity.py
-import phonenumbers
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import tuple_
 from sqlmodel import Session, select
 from sqlalchemy.orm.attributes import flag_modified
 from database.engine import engine
 from database.db_models import Listing
-from core.entity_registry import get_entity_config
+from core.entity_registry import ENTITY, LISTING, EntityConfig, get_entity_config
+from services.facet_index import record_entity_change
+from services.listing_summaries import refresh_listing_summaries
 from utils.category_mapping import map_categories
+from utils.normalisation import normalise_lat_lon, normalise_phone_number  # re-exported
 
 # Minimum confidence required when replacing a value
 CHANGE_MIN_CONF = 0.7
 
-def normalise_lat_lon(lat: float | None, lon: float | None) -> tuple[float | None, float | None]:
-    if lat is not None:
-        lat = round(lat, 5)
-    if lon is not None:
-        lon = round(lon, 5)
-    return lat, lon
-
-def normalise_phone_number(phone: str, region: str = "GB") -> Optional[str]:
-    if not phone:
-        return None
-    try:
-        parsed = phonenumbers.parse(phone, region)
-        if phonenumbers.is_valid_number(parsed):
-            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-    except phonenumbers.NumberParseException:
-        pass
-    return phone  # Return original if can't normalize
-
 def _initialize_confidence(obj):
     """Ensure confidence dict exists."""
     if obj.field_confidence is None:
@@ -83,6 +68,95 @@ def _update_source_info(obj, source_info: Dict[str, Any] | None):
         obj.source_info.update(source_info)
         flag_modified(obj, "source_info")
 
+def _prepare_updates(data, entity_name: str, entity_type: str, config: EntityConfig) -> Dict[str, Any]:
+    """
+    Turn an extracted DTO into normalised listing/entity updates + confidences.
+    Pure in-memory work shared by the single and bulk upsert paths.
+    """
+    routing = config.routing
+
+    # Extract data from schema
+    dto_data = data.model_dump(exclude_none=True)
+    dto_confidences = dto_data.pop("field_confidence", {})
+    dto_source_info = dto_data.pop("source_info", None)
+
+    # Split into listing and entity updates (one pass via the routing table)
+    updates = {LISTING: {}, ENTITY: {}}
+    confidences = {LISTING: {}, ENTITY: {}}
+    for k, v in dto_data.items():
+        target = routing.get(k)
+        if target is not None:
+            updates[target][k] = v
+    for k, v in dto_confidences.items():
+        target = routing.get(k)
+        if target is not None:
+            confidences[target][k] = v
+
+    listing_updates, entity_updates = updates[LISTING], updates[ENTITY]
+    listing_confidence_updates, entity_confidence_updates = confidences[LISTING], confidences[ENTITY]
+
+    # Map LLM categories to canonical categories
+    raw_categories = listing_updates.get("categories") or []
+    canonical = sorted(set(map_categories(raw_categories)))
+    listing_updates["canonical_categories"] = canonical
+    listing_confidence_updates["canonical_categories"] = 1.0
+
+    # Add identity fields with full confidence (1.0)
+    listing_updates["entity_name"] = entity_name
+    listing_updates["entity_type"] = entity_type
+    listing_confidence_updates["entity_name"] = 1.0
+    listing_confidence_updates["entity_type"] = 1.0
+
+    # Normalize phone numbers, lat/lon, ... before processing
+    for normalise in config.listing_normalisers:
+        normalise(listing_updates)
+
+    return {
+        "listing_updates": listing_updates,
+        "entity_updates": entity_updates,
+        "listing_confidence_updates": listing_confidence_updates,
+        "entity_confidence_updates": entity_confidence_updates,
+        "source_info": dto_source_info,
+    }
+
+def _merge_listing(listing, prepared: Dict[str, Any]):
+    """Create or confidence-merge a Listing. Returns (listing, changed_fields)."""
+    listing_updates = prepared["listing_updates"]
+    listing_confidence_updates = prepared["listing_confidence_updates"]
+    dto_source_info = prepared["source_info"]
+
+    if listing is None:
+        # Create new listing
+        listing = Listing(**listing_updates)
+        _initialize_confidence(listing)
+        # Set initial confidence for all fields
+        for field, conf in listing_confidence_updates.items():
+            listing.field_confidence[field] = conf
+        if dto_source_info:
+            listing.source_info = dto_source_info
+        return listing, list(listing_updates.keys())
+
+    # Update existing listing
+    listing_changes = _apply_updates(listing, listing_updates, listing_confidence_updates)
+    _update_source_info(listing, dto_source_info)
+    return listing, listing_changes
+
+def _merge_entity(entity, entity_table, listing_id: str, prepared: Dict[str, Any]):
+    """Create or confidence-merge the entity row. Returns (entity, changed_fields)."""
+    entity_updates = prepared["entity_updates"]
+    entity_confidence_updates = prepared["entity_confidence_updates"]
+
+    if entity is None:
+        # Create new entity
+        entity = entity_table(**entity_updates, listing_id=listing_id)
+        _initialize_confidence(entity)
+        for field, conf in entity_confidence_updates.items():
+            entity.field_confidence[field] = conf
+        return entity, list(entity_updates.keys())
+
+    # Update existing entity
+    return entity, _apply_updates(entity, entity_updates, entity_confidence_updates)
+
 def upsert_from_schema(
     *,
     data,
@@ -93,49 +167,14 @@ def upsert_from_schema(
     """Upsert Listing + entity-specific record."""
     
     config = get_entity_config(entity_type)
-    entity_table = config["table"]
-    listing_fields = config["listing_fields"]
-    entity_fields = config["entity_fields"]
+    entity_table = config.table
 
     owns_session = session is None
     if owns_session:
         session = Session(engine)
 
     try:
-        # Extract data from schema
-        dto_data = data.model_dump(exclude_none=True)
-        dto_confidences = dto_data.pop("field_confidence", {})
-        dto_source_info = dto_data.pop("source_info", None)
-
-        # Split into listing and entity updates
-        listing_updates = {k: v for k, v in dto_data.items() if k in listing_fields}
-        entity_updates = {k: v for k, v in dto_data.items() if k in entity_fields}
-        
-        listing_confidence_updates = {k: v for k, v in dto_confidences.items() if k in listing_fields}
-        entity_confidence_updates = {k: v for k, v in dto_confidences.items() if k in entity_fields}
-        
-        # Map LLM categories to canonical categories
-        raw_categories = listing_updates.get("categories") or []
-        canonical = sorted(set(map_categories(raw_categories)))
-        listing_updates["canonical_categories"] = canonical
-        listing_confidence_updates["canonical_categories"] = 1.0
-
-        # Add identity fields with full confidence (1.0)
-        listing_updates["entity_name"] = entity_name
-        listing_updates["entity_type"] = entity_type
-        listing_confidence_updates["entity_name"] = 1.0
-        listing_confidence_updates["entity_type"] = 1.0
-    
-        # Normalize phone numbers before processing
-        if listing_updates.get("phone"):
-            listing_updates["phone"] = normalise_phone_number(listing_updates["phone"])
-
-        # Normalize lat/lon before processing
-        if listing_updates.get("latitude") or listing_updates.get("longitude"):
-            listing_updates["latitude"], listing_updates["longitude"] = normalise_lat_lon(
-                listing_updates.get("latitude"),
-                listing_updates.get("longitude"),
-        )
+        prepared = _prepare_updates(data, entity_name, entity_type, config)
 
         # === Handle Listing ===
         listing = session.exec(
@@ -145,42 +184,29 @@ def upsert_from_schema(
             )
         ).one_or_none()
 
-        if listing is None:
-            # Create new listing
-            listing = Listing(**listing_updates)
-            _initialize_confidence(listing)
-            # Set initial confidence for all fields
-            for field, conf in listing_confidence_updates.items():
-                listing.field_confidence[field] = conf
-            if dto_source_info:
-                listing.source_info = dto_source_info            
+        is_new_listing = listing is None
+        listing, listing_changes = _merge_listing(listing, prepared)
+        if is_new_listing:
             session.add(listing)
             session.flush()
-            listing_changes = list(listing_updates.keys())
-        else:
-            # Update existing listing
-            listing_changes = _apply_updates(listing, listing_updates, listing_confidence_updates)
-            _update_source_info(listing, dto_source_info)
-        
 
         # === Handle Entity ===
         entity = session.get(entity_table, listing.listing_id)
-        
-        if entity is None:
-            # Create new entity
-            entity = entity_table(**entity_updates, listing_id=listing.listing_id)
-            _initialize_confidence(entity)
-            for field, conf in entity_confidence_updates.items():
-                entity.field_confidence[field] = conf
+
+        is_new_entity = entity is None
+        entity, entity_changes = _merge_entity(entity, entity_table, listing.listing_id, prepared)
+        if is_new_entity:
             session.add(entity)
-            entity_changes = list(entity_updates.keys())
-        else:
-            # Update existing entity
-            entity_changes = _apply_updates(entity, entity_updates, entity_confidence_updates)
+
+        # === Summary row (same transaction) ===
+        if listing_changes or entity_changes:
+            refresh_listing_summaries(session, [(listing, entity, config)])
 
         session.commit()
         session.refresh(listing)
         session.refresh(entity)
+        if entity_changes:
+            record_entity_change(entity_type, [entity])
 
         return listing, entity, {
             "listing_changes": listing_changes,
@@ -190,3 +216,104 @@ def upsert_from_schema(
     finally:
         if owns_session:
             session.close()
+
+def upsert_many(
+    items: Iterable[Dict[str, Any]],
+    *,
+    session: Optional[Session] = None,
+    batch_size: int = 500,
+) -> List[Tuple[Any, Any, Dict[str, list[str]]]]:
+    """
+    Bulk version of upsert_from_schema.
+
+    `items` are dicts of upsert_from_schema kwargs: {"data", "entity_name", "entity_type"}.
+    Per batch: one SELECT for existing listings, one SELECT per entity table,
+    confidence merging in memory, one SELECT for the summary rows of changed
+    listings, then a single flush/commit (SQLAlchemy sends
+    the INSERTs/UPDATEs as executemany batches). Repeated entities within a
+    batch are merged in order, exactly as sequential upserts would be.
+
+    Returns (listing, entity, report) per item, in input order. Objects are
+    not refreshed after commit (no extra round-trips).
+    """
+    owns_session = session is None
+    if owns_session:
+        session = Session(engine, expire_on_commit=False)
+
+    items = list(items)
+    results: List[Tuple[Any, Any, Dict[str, list[str]]]] = []
+
+    try:
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+
+            # Pure in-memory preparation first
+            prepared_batch = []
+            for item in batch:
+                config = get_entity_config(item["entity_type"])
+                prepared = _prepare_updates(item["data"], item["entity_name"], item["entity_type"], config)
+                prepared_batch.append((item, config, prepared))
+
+            # === Prefetch existing listings (1 query) ===
+            keys = {(item["entity_name"], item["entity_type"]) for item in batch}
+            listings_by_key = {
+                (listing.entity_name, listing.entity_type): listing
+                for listing in session.exec(
+                    select(Listing).where(tuple_(Listing.entity_name, Listing.entity_type).in_(keys))
+                )
+            }
+
+            # === Prefetch existing entities (1 query per entity table) ===
+            entities_by_id: Dict[str, Any] = {}
+            listing_ids_by_table: Dict[Any, set] = {}
+            for item, config, _ in prepared_batch:
+                listing = listings_by_key.get((item["entity_name"], item["entity_type"]))
+                if listing is not None:
+                    listing_ids_by_table.setdefault(config.table, set()).add(listing.listing_id)
+            for entity_table, listing_ids in listing_ids_by_table.items():
+                for entity in session.exec(select(entity_table).where(entity_table.listing_id.in_(listing_ids))):
+                    entities_by_id[entity.listing_id] = entity
+
+            # === Merge in memory ===
+            changed_rows = []
+            for item, config, prepared in prepared_batch:
+                key = (item["entity_name"], item["entity_type"])
+
+                listing = listings_by_key.get(key)
+                is_new_listing = listing is None
+                listing, listing_changes = _merge_listing(listing, prepared)
+                if is_new_listing:
+                    session.add(listing)
+                    listings_by_key[key] = listing
+
+                entity = entities_by_id.get(listing.listing_id)
+                is_new_entity = entity is None
+                entity, entity_changes = _merge_entity(entity, config.table, listing.listing_id, prepared)
+                if is_new_entity:
+                    session.add(entity)
+                    entities_by_id[listing.listing_id] = entity
+
+                results.append((listing, entity, {
+                    "listing_changes": listing_changes,
+                    "entity_changes": entity_changes,
+                }))
+                if listing_changes or entity_changes:
+                    changed_rows.append((listing, entity, config))
+
+            # === Summary rows for the changed listings (1 query) ===
+            refresh_listing_summaries(session, changed_rows)
+
+            # === One commit per batch ===
+            session.commit()
+            for listing, entity, config in changed_rows:
+                record_entity_change(config.entity_type, [entity])
+
+        return results
+
+    except Exception:
+        session.rollback()
+        raise
+
+    finally:
+        if owns_session:
+            session.close()
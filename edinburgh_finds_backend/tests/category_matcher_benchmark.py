@@ -0,0 +1,106 @@
+"""
+Benchmarks the compiled category matcher against the previous exact-match
+map_categories, on the raw categories found in data/**/processed/*.json and
+on a synthetic taxonomy grown to thousands of synonyms.
+
+    python -m tests.category_matcher_benchmark
+"""
+import glob
+import json
+import random
+import string
+import time
+
+from utils.category_mapping import CategoryMatcher, get_taxonomy, map_categories
+
+ROUNDS = 20
+
+TAXONOMY = get_taxonomy()
+CANONICAL_CATEGORIES = TAXONOMY.canonical
+CATEGORY_SYNONYMS = dict(TAXONOMY.synonyms)
+
+
+def legacy_map_categories(raw_list, canonical=CANONICAL_CATEGORIES, synonyms=CATEGORY_SYNONYMS):
+    """map_categories as it was before the compiled matcher (exact keys only)."""
+    mapped = set()
+    for item in raw_list:
+        if not item:
+            continue
+        key = item.lower().strip()
+        if key in synonyms:
+            mapped.add(synonyms[key])
+            continue
+        if key in canonical:
+            mapped.add(key)
+    return sorted(mapped)
+
+
+# Raw strings that must map to nothing: ordinary words one edit away from a
+# taxonomy token ("slimming" / swimming, "pirates" / pilates)
+NEGATIVES = ["Slimming club", "Pirates party"]
+
+
+def check_negatives() -> None:
+    for raw in NEGATIVES:
+        mapped = map_categories([raw])
+        assert mapped == [], f"{raw!r} → {mapped}"
+    print(f"✅ {len(NEGATIVES)} near-miss categories left unmapped")
+
+
+def load_raw_categories() -> list[str]:
+    raw = []
+    for path in glob.glob("data/**/processed/*.json", recursive=True):
+        with open(path, encoding="utf-8") as f:
+            raw.extend(json.load(f)["listing"].get("categories") or [])
+    return raw
+
+
+def synthetic_synonyms(count: int) -> dict[str, str]:
+    rng = random.Random(42)
+    canonical = sorted(CANONICAL_CATEGORIES)
+    words = lambda: " ".join(
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(rng.randint(1, 3))
+    )
+    return {**CATEGORY_SYNONYMS, **{words(): rng.choice(canonical) for _ in range(count)}}
+
+
+def timed(fn, batches) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for batch in batches:
+            fn(batch)
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def main():
+    check_negatives()
+
+    raw = load_raw_categories()
+    if not raw:
+        raise SystemExit("No processed JSON found under data/")
+    batches = [raw[i:i + 20] for i in range(0, len(raw), 20)]
+    distinct = sorted(set(raw))
+
+    matcher = CategoryMatcher(CANONICAL_CATEGORIES, CATEGORY_SYNONYMS)
+    legacy_hits = sum(bool(legacy_map_categories([c])) for c in distinct)
+    matcher_hits = sum(bool(matcher.map([c])) for c in distinct)
+    print(f"Raw categories: {len(raw)} ({len(distinct)} distinct)")
+    print(f"Mapped to ≥1 canonical: legacy {legacy_hits}, matcher {matcher_hits}")
+
+    # ms per pass over all raw categories; "uncached" bypasses the per-string LRU
+    print(f"\n{'synonyms':>9} | {'legacy ms':>9} | {'uncached':>9} | {'cached':>9} | {'build ms':>9}")
+    for extra in (0, 1_000, 10_000):
+        synonyms = synthetic_synonyms(extra)
+
+        start = time.perf_counter()
+        matcher = CategoryMatcher(CANONICAL_CATEGORIES, synonyms)
+        build = time.perf_counter() - start
+
+        legacy = timed(lambda b: legacy_map_categories(b, synonyms=synonyms), batches)
+        uncached = timed(lambda b: [matcher._match(c) for c in b], batches)
+        cached = timed(matcher.map, batches)
+        print(f"{len(synonyms):>9} | {legacy * 1000:>9.2f} | {uncached * 1000:>9.2f} | {cached * 1000:>9.2f} | {build * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Streams a crawl from a local Firecrawl stand-in (no network, no API credits)
+through the dedupe/concatenate stage with a fake extractor, and checks that:
+
+    - duplicate pages and the nav / footer repeated across pages are dropped
+    - repeats within a page are kept (a timetable with the same class every day)
+    - a paragraph sharing only some lines with another page is kept whole
+      (a second table with the same header and |---| row)
+    - batches are cut at min_chars
+
+    python -m tests.crawl_pipeline_check
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from services.crawl_pipeline import stream_pages_to_extraction
+from services.firecrawl_client import FirecrawlClient
+
+NAV = "Home | Clubs | Membership | Contact"
+FOOTER = "© Stand-in Club · Privacy · Cookies"
+TABLE_HEADER = "| Court | Price per hour |\n|---|---|"
+TIMETABLE = "Monday\n\n- 09:00 Yoga\n\nTuesday\n\n- 09:00 Yoga"
+
+
+def page(url: str, body: str) -> dict:
+    return {"markdown": f"{NAV}\n\n{body}\n\n{FOOTER}", "metadata": {"sourceURL": url}}
+
+
+PAGES = [
+    page("/", f"# Edinburgh Shawfair\nIndoor tennis: 8 courts\n\n{TABLE_HEADER}\n| Tennis | £20 |"),
+    page("/padel", f"# Padel\n4 covered padel courts\n\n{TABLE_HEADER}\n| Padel | £28 |"),
+    page("/padel-copy", f"# Padel\n4 covered padel courts\n\n{TABLE_HEADER}\n| Padel | £28 |"),
+    page("/timetable", f"# Timetable\n{TIMETABLE}"),
+    page("/spa", "# Spa\nSauna, steam room, outdoor hot tub"),
+]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Mimics POST /crawl + GET /crawl/{id}, revealing two more pages per poll."""
+
+    polls = 0
+
+    def _send(self, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send({"success": True, "id": "job-1"})
+
+    def do_GET(self):
+        StandInHandler.polls += 1
+        available = PAGES[: 2 * StandInHandler.polls]
+        status = "completed" if len(available) == len(PAGES) else "scraping"
+        self._send({"status": status, "data": available, "next": None})
+
+    def log_message(self, *args):
+        pass
+
+
+def fake_extract(**kwargs) -> dict:
+    return {"raw_text": kwargs["raw_text"]}
+
+
+def main():
+    server = HTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = FirecrawlClient(api_key="local", base_url=f"http://127.0.0.1:{server.server_port}")
+    pages = client.iter_crawl("https://example.test", max_pages=10, poll_interval=0.1)
+
+    results = stream_pages_to_extraction(
+        "Stand-in Club",
+        "venue",
+        pages,
+        min_chars=150,
+        extract=fake_extract,
+    )
+    server.shutdown()
+    text = "\n".join(result["raw_text"] for result in results)
+
+    assert len(results) > 1, "no batching"
+    assert "SOURCE: /padel-copy" not in text, "duplicate page kept"
+    assert text.count(NAV) == 1, f"nav kept {text.count(NAV)}x"
+    assert text.count(FOOTER) == 2, f"footer kept {text.count(FOOTER)}x"  # dropped from the 3rd page on
+    assert TIMETABLE in text, "timetable repeats dropped"
+    assert f"{TABLE_HEADER}\n| Padel | £28 |" in text, "second table lost its header"
+    for fact in ("Indoor tennis: 8 courts", "4 covered padel courts", "Sauna, steam room, outdoor hot tub"):
+        assert text.count(fact) == 1, fact
+
+    print(text)
+    print(f"\n✅ {len(results)} batches after {StandInHandler.polls} polls; dedupe kept every fact")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Extraction hot-path benchmark (no network, no API credits).
+
+Replays the real gather files in data/venues/*/gather/ through
+process_raw_text with:
+
+    - a local OpenAI-protocol stand-in that answers with recorded responses
+      (the latest processed JSON of each venue) after --llm-latency seconds
+    - a throwaway SQLite database (or --database-url for a scratch Postgres)
+    - output files written to a temp folder, not data/
+
+and reports per-stage timings (prompt build, LLM round-trip, response
+validation, upsert, file writes + other), throughput per concurrency
+level and peak memory.
+
+    python -m tests.extraction_benchmark
+    python -m tests.extraction_benchmark --concurrency 1 4 8 --llm-latency 0.5 --trace-memory
+    python -m tests.extraction_benchmark --json bench.json   # keep for regression diffs
+"""
+import argparse
+import json
+import os
+import re
+import resource
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextvars import ContextVar
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BACKEND_DIR / "data"
+
+STAGES = ("prompt", "llm", "validation", "upsert", "write+other")
+
+
+# -------------------------------------------------------
+# RECORDED-RESPONSE LLM STAND-IN
+# -------------------------------------------------------
+def load_recordings() -> dict[str, dict]:
+    """Latest processed JSON per venue, shaped like a VenueSchema tool call."""
+    recordings = {}
+    for venue_dir in sorted((DATA_DIR / "venues").iterdir()):
+        processed = sorted(venue_dir.glob("processed/*.json"))
+        if not processed:
+            continue
+        doc = json.loads(processed[-1].read_text(encoding="utf-8"))
+        listing, entity = doc["listing"], doc["entity"]
+        payload = {**entity, **listing}
+        payload.pop("canonical_categories", None)
+        payload["field_confidence"] = {**(entity.get("field_confidence") or {}), **(listing.get("field_confidence") or {})}
+        payload["source_info"] = {"sources": ["https://example.test/" + venue_dir.name], "note": "recorded"}
+        recordings[venue_dir.name] = payload
+    return recordings
+
+
+class RecordedLLMHandler(BaseHTTPRequestHandler):
+    """POST /v1/chat/completions → recorded tool call for the venue in the prompt."""
+
+    recordings: dict[str, dict] = {}
+    latency = 0.0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        system = body["messages"][0]["content"]
+        match = re.search(r"Extract structured data for: (.+?)(?: #\d+)? \(", system)
+        slug = match.group(1).lower().replace(" ", "_") if match else ""
+        payload = self.recordings.get(slug) or next(iter(self.recordings.values()))
+
+        time.sleep(self.latency)
+        tool_name = body["tools"][0]["function"]["name"]
+        prompt_tokens = sum(len(m["content"]) for m in body["messages"]) // 4
+        data = json.dumps({
+            "id": "bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "tool_calls",
+                "message": {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [{
+                        "id": "call_bench",
+                        "type": "function",
+                        "function": {"name": tool_name, "arguments": json.dumps(payload)},
+                    }],
+                },
+            }],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 2000, "total_tokens": prompt_tokens + 2000},
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+# -------------------------------------------------------
+# STAGE TIMING (wraps the pipeline's collaborators)
+# -------------------------------------------------------
+class StageTimer:
+    """Per-run stage totals; a ContextVar so the LLM call on the shared event loop adds to its caller's run."""
+
+    def __init__(self):
+        self.current: ContextVar[dict] = ContextVar("bench_stages")
+
+    @property
+    def stages(self) -> dict:
+        return self.current.get()
+
+    def reset(self):
+        self.current.set(dict.fromkeys(STAGES, 0.0))
+
+    def add(self, stage: str, seconds: float):
+        self.stages[stage] += seconds
+
+    def wrap(self, stage: str, fn):
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - started)
+        return timed
+
+
+def instrument(timer: StageTimer):
+    from services import extraction_pipeline
+    from services.instructor_client import get_async_instructor_client, run_async
+
+    extraction_pipeline.generate_system_prompt = timer.wrap("prompt", extraction_pipeline.generate_system_prompt)
+    extraction_pipeline.upsert_from_schema = timer.wrap("upsert", extraction_pipeline.upsert_from_schema)
+
+    # LLM = request sent → response received; validation = response → DTO returned
+    async def shared_client():
+        return get_async_instructor_client()
+
+    client = run_async(shared_client())
+    client.on("completion:kwargs", lambda *a, **k: timer.stages.update(sent=time.perf_counter()))
+    client.on("completion:response", lambda *a, **k: timer.stages.update(received=time.perf_counter()))
+    create = client.create_with_completion
+
+    async def timed_create(*args, **kwargs):
+        result = await create(*args, **kwargs)
+        done = time.perf_counter()
+        timer.add("llm", timer.stages["received"] - timer.stages["sent"])
+        timer.add("validation", done - timer.stages["received"])
+        return result
+
+    client.create_with_completion = timed_create
+
+
+# -------------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------------
+def gather_workload() -> list[tuple[str, str]]:
+    from services.batch_runner import slug_to_entity_name
+
+    files = sorted((DATA_DIR / "venues").glob("*/gather/*.txt"))
+    return [(slug_to_entity_name(f.parent.parent.name), f.read_text(encoding="utf-8")) for f in files]
+
+
+def run_level(workload, concurrency: int, timer: StageTimer, run_id: int) -> dict:
+    from services.extraction_pipeline import process_raw_text
+
+    def one(index_item):
+        index, (entity_name, raw_text) = index_item
+        timer.reset()
+        started = time.perf_counter()
+        process_raw_text(
+            entity_name=f"{entity_name} #{run_id * 1000 + index}",  # distinct listing per run
+            entity_type="venue",
+            raw_text=raw_text,
+            source_type="benchmark",
+            use_cache=False,
+        )
+        total = time.perf_counter() - started
+        stages = {stage: timer.stages[stage] for stage in STAGES[:-1]}
+        stages["write+other"] = total - sum(stages.values())
+        return total, stages
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, enumerate(workload)))
+    wall = time.perf_counter() - started
+
+    def summary(values):
+        values = sorted(values)
+        return {
+            "mean_ms": round(statistics.fmean(values) * 1000, 2),
+            "p50_ms": round(values[len(values) // 2] * 1000, 2),
+            "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))] * 1000, 2),
+        }
+
+    return {
+        "concurrency": concurrency,
+        "files": len(results),
+        "wall_s": round(wall, 3),
+        "files_per_s": round(len(results) / wall, 2),
+        "total": summary([r[0] for r in results]),
+        "stages": {stage: summary([r[1][stage] for r in results]) for stage in STAGES},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extraction hot-path benchmark")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated LLM response time (s)")
+    parser.add_argument("--database-url", help="Scratch database (default: temp SQLite file)")
+    parser.add_argument("--trace-memory", action="store_true", help="tracemalloc peak (slows the run)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="ef_bench_"))
+
+    RecordedLLMHandler.recordings = load_recordings()
+    RecordedLLMHandler.latency = args.llm_latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordedLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Must be set before config.settings is imported
+    os.environ.update({
+        "LLM_PROVIDER": "laozhang-claude",
+        "LLM_MODEL": "bench-recorded",
+        "LLM_BASE_URL": f"http://127.0.0.1:{server.server_port}/v1",
+        "DATABASE_URL": args.database_url or f"sqlite:///{workdir / 'bench.db'}",
+        "CATEGORY_TAXONOMY_PATH": str(DATA_DIR / "taxonomy" / "categories.json"),
+        # The stand-in has no quota: keep the limiter out of the timings
+        "LLM_REQUESTS_PER_MINUTE": "1000000",
+        "LLM_TOKENS_PER_MINUTE": "1000000000",
+    })
+    for key in ("PERPLEXITY_API_KEY", "ANTHROPIC_API_KEY", "GEMINI_API_KEY",
+                "TAVILY_API_KEY", "LAOZHANG_API_KEY", "FIRECRAWL_API_KEY"):
+        os.environ.setdefault(key, "bench")
+
+    from database.engine import create_db_and_tables
+
+    os.chdir(workdir)  # processed/raw outputs land in the temp folder
+    create_db_and_tables()
+
+    # The model name is the tool name the LLM is asked to call
+    from schemas.venue_extraction_schema import VenueSchema
+    from services.instructor_client import prepare_response_model
+    assert VenueSchema.__name__ == "VenueSchema", VenueSchema.__name__
+    assert prepare_response_model(VenueSchema).openai_schema["name"] == "VenueSchema"
+
+    timer = StageTimer()
+    instrument(timer)
+    workload = gather_workload()
+    print(f"\n⏱️  {len(workload)} gather files, LLM latency {args.llm_latency}s, "
+          f"DB {os.environ['DATABASE_URL'].split(':')[0]}, workdir {workdir}")
+
+    run_level(workload[:1], 1, timer, run_id=0)  # warm-up: imports, schema prep, DB connect
+
+    results = []
+    for run_id, concurrency in enumerate(args.concurrency, start=1):
+        if args.trace_memory:
+            tracemalloc.start()
+        result = run_level(workload, concurrency, timer, run_id)
+        if args.trace_memory:
+            result["tracemalloc_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+            tracemalloc.stop()
+        result["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        results.append(result)
+
+        print(f"\n== concurrency {concurrency}: {result['files_per_s']} files/s "
+              f"({result['wall_s']}s wall), max RSS {result['max_rss_mb']} MB"
+              + (f", tracemalloc peak {result['tracemalloc_peak_mb']} MB" if args.trace_memory else ""))
+        print(f"   {'stage':<12} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+        for stage, stats in {**result["stages"], "total": result["total"]}.items():
+            print(f"   {stage:<12} {stats['mean_ms']:>9} {stats['p50_ms']:>9} {stats['p95_ms']:>9}")
+
+    server.shutdown()
+    if args.json:
+        out = Path(args.json)
+        out = out if out.is_absolute() else BACKEND_DIR / out
+        out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\n📄 Results → {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Runs input compaction over every gather file in data/**/gather/ and checks
+that it only removes what it should:
+
+    - no GRADE X content, zero-width characters or raw-dump markers remain
+    - within every GRADE section, each sub-heading block keeps its fact
+      lines, except lines that also appear in a higher grade
+    - known label blocks keep their "Label: value" lines (KEPT_BLOCKS)
+    - compaction is idempotent
+
+and prints the size / estimated token savings per file.
+
+    python -m tests.input_compaction_check
+"""
+import glob
+
+from utils.gather_sections import ZERO_WIDTH_RE, split_grade_sections
+from utils.input_compaction import (
+    BOILERPLATE_LINES,
+    GRADE_RANK,
+    _heading_flags,
+    compact_gather_text,
+    line_key,
+    normalise_line,
+)
+
+# file suffix → grade → sub-heading → lines that must survive under it
+# (repeated across blocks of the same section, so a per-line dedupe drops them)
+KEPT_BLOCKS = {
+    "powerleague_portobello__gather__claude__20251208_1252.txt": {
+        "B": {
+            "Wednesday 5s League Division 2": ["Format: Men's 5-a-side", "Day: Wednesday", "Time: 6:30 PM"],
+            "Thursday 7s League": ["Format: Men's 7-a-side", "Day: Thursday", "Time: 6:30 PM"],
+        },
+    },
+}
+
+
+def fact_lines(text: str) -> set[tuple[str, str, str]]:
+    """(grade, sub-heading key, line key) of every non-GRADE X fact line."""
+    facts = set()
+    for section in split_grade_sections(text):
+        if section.grade == "X":
+            continue
+        lines = [normalise_line(line) for line in section.body.splitlines()]
+        lines = [line for line in lines if line and line not in BOILERPLATE_LINES]
+        heading = ""
+        for line, is_heading in zip(lines, _heading_flags(lines)):
+            if is_heading:
+                heading = line_key(line)
+            elif line_key(line):
+                facts.add((section.grade, heading, line_key(line)))
+    return facts
+
+
+def lost_facts(text: str, compact: str) -> list[tuple[str, str, str]]:
+    """Fact lines missing from their block in `compact` without a higher-grade copy."""
+    original = fact_lines(text)
+    kept = fact_lines(compact)
+    best_rank: dict[str, int] = {}
+    for grade, _, key in original:
+        best_rank[key] = min(GRADE_RANK[grade], best_rank.get(key, GRADE_RANK[grade]))
+    return sorted(
+        (grade, heading, key) for grade, heading, key in original - kept
+        if best_rank[key] >= GRADE_RANK[grade]
+    )
+
+
+def check_kept_blocks(path: str, compact: str) -> None:
+    for suffix, grades in KEPT_BLOCKS.items():
+        if not path.endswith(suffix):
+            continue
+        kept = fact_lines(compact)
+        for grade, blocks in grades.items():
+            for heading, lines in blocks.items():
+                for line in lines:
+                    assert (grade, line_key(heading), line_key(line)) in kept, f"{path}: lost {heading!r} / {line!r}"
+
+
+def main():
+    files = sorted(glob.glob("data/**/gather/*.txt", recursive=True))
+    if not files:
+        raise SystemExit("No gather files found under data/")
+    missing = [suffix for suffix in KEPT_BLOCKS if not any(path.endswith(suffix) for path in files)]
+    assert not missing, f"KEPT_BLOCKS files not found: {missing}"
+
+    total_before = total_after = 0
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        compact, report = compact_gather_text(text)
+
+        assert not any(s.grade == "X" for s in split_grade_sections(compact)), path
+        assert not ZERO_WIDTH_RE.search(compact), path
+        assert not BOILERPLATE_LINES & set(compact.splitlines()), path
+        lost = lost_facts(text, compact)
+        assert not lost, f"{path}: lost {lost[:3]}"
+        check_kept_blocks(path, compact)
+        assert compact_gather_text(compact)[0] == compact, f"{path}: not idempotent"
+
+        total_before += report.original_tokens
+        total_after += report.compact_tokens
+        print(f"{path.split('/')[-1][:60]:<60} {report.describe()}")
+
+    print(f"\n✅ {len(files)} files: ~{total_before:,} → ~{total_after:,} input tokens "
+          f"(-{1 - total_after / total_before:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Runs rule-based pre-extraction over every gather file in data/venues/*/gather/
+and checks the parsed phone, email, postcode, lat/lon, opening hours and
+URLs against the values written in the files.
+
+Files without GRADE sections are not read by the rules, so they must come
+back empty; lines hedged with a note ("05:30 - 22:00 (some sources indicate
+22:30)") are left to the LLM. TEXT_CASES cover opening hours the gather
+files don't: a week the rules can only partly parse stays with the LLM
+(field in the remainder schema, lines in its input).
+
+    python -m tests.pre_extraction_check
+"""
+import glob
+
+from services.pre_extraction import RULE_FIELDS, get_remainder_schema, pre_extract_fields
+from utils.gather_sections import ZERO_WIDTH_RE
+
+
+def daily(open_, close, days=("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")):
+    return {day: {"open": open_, "close": close} for day in days}
+
+
+SHAWFAIR_WEBSITE = "https://www.davidlloyd.co.uk/clubs/edinburgh-shawfair/"
+SHAWFAIR_FACEBOOK = "https://www.facebook.com/p/David-Lloyd-Edinburgh-Shawfair-100088253405886/"
+
+# file suffix → expected rule values (files not listed: no values)
+EXPECTED = {
+    "david_lloyd_club_edinburgh_shawfair__gather__claude__20251207_2212.txt": {
+        "phone": "+441313882440",
+        "postcode": "EH22 1FD",
+        "latitude": 55.903,
+        "longitude": -3.102,
+        "website_url": SHAWFAIR_WEBSITE,
+        "instagram_url": "https://www.instagram.com/davidlloydshawfair/",
+    },
+    "david_lloyd_club_edinburgh_shawfair__gather__manus_ai__20251217_1038.txt": {
+        "facebook_url": SHAWFAIR_FACEBOOK,
+    },
+    "david_lloyd_club_edinburgh_shawfair__gather__perplexity__20251217_1104.txt": {
+        "phone": "+441313882440",
+        "postcode": "EH22 1FD",
+        "latitude": 55.9105,
+        "longitude": -3.0751,
+        "opening_hours": {
+            **daily("05:30", "22:00", ("monday", "tuesday", "wednesday", "thursday", "friday")),
+            **daily("07:00", "21:00", ("saturday", "sunday")),
+        },
+        "website_url": SHAWFAIR_WEBSITE,
+        "facebook_url": SHAWFAIR_FACEBOOK,  # /p/<name-id> is a page; the Instagram /reel/ is not
+    },
+    "edinburgh_sports_club__gather__claude__20251209_0016.txt": {
+        "phone": "+441315397071",
+        "postcode": "EH4 3DH",
+        "latitude": 55.95386,
+        "longitude": -3.2274,
+        "opening_hours": daily("09:00", "22:00"),  # one day per paragraph
+        "website_url": "https://www.edinburghsportsclub.co.uk",  # zero-width space after it in the file
+    },
+    "powerleague_portobello__gather__claude__20251208_1252.txt": {
+        "phone": "+441316692266",
+        "email": "portobello@powerleague.com",
+        "postcode": "EH15 1DR",
+        "latitude": 55.95473,
+        "longitude": -3.11459,
+        "opening_hours": {
+            **daily("09:00", "22:30"),
+            "friday": {"open": "09:00", "close": "22:00"},
+        },
+        "website_url": "https://www.powerleague.com/location/edinburgh-portobello",
+        "facebook_url": "https://www.facebook.com/PowerleaguePortobello/",
+        "instagram_url": "https://www.instagram.com/powerleague_portobello/",
+    },
+}
+
+
+GRADE_A = "GRADE A — High Confidence (Directly Verified)"
+
+# name → (gather text, expected rule values)
+TEXT_CASES = {
+    "partial week": (
+        f"{GRADE_A}\nPhone: 0131 561 4500\nMonday - Friday: 6am - 10pm\nSaturday & Sunday: 8am - 8pm\n",
+        {"phone": "+441315614500"},
+    ),
+    "other days closed": (
+        f"{GRADE_A}\nMonday - Friday: 6am - 10pm\nOther days: closed\n",
+        {"opening_hours": {
+            **daily("06:00", "22:00", ("monday", "tuesday", "wednesday", "thursday", "friday")),
+            "saturday": "CLOSED",
+            "sunday": "CLOSED",
+        }},
+    ),
+    "closed day": (
+        f"{GRADE_A}\nMonday - Saturday: 9am - 5pm\nSunday: Closed\n",
+        {"opening_hours": {
+            **daily("09:00", "17:00"),
+            "sunday": "CLOSED",
+        }},
+    ),
+}
+
+
+def check_text_cases() -> None:
+    for name, (text, expected) in TEXT_CASES.items():
+        result = pre_extract_fields(text)
+        assert result.values == expected, f"{name}: {result.values}"
+        if "opening_hours" not in expected:
+            assert "opening_hours" in get_remainder_schema(frozenset(result.values)).model_fields, name
+            assert "Monday - Friday: 6am - 10pm" in result.remaining_text, name
+    print(f"✅ {len(TEXT_CASES)} opening-hours cases")
+
+
+def main():
+    check_text_cases()
+
+    files = sorted(glob.glob("data/venues/*/gather/*.txt"))
+    if not files:
+        raise SystemExit("No gather files found under data/venues/")
+    missing = [suffix for suffix in EXPECTED if not any(path.endswith(suffix) for path in files)]
+    assert not missing, f"EXPECTED files not found: {missing}"
+
+    filled = 0
+    for path in files:
+        name = path.split("/")[-1]
+        with open(path, encoding="utf-8") as f:
+            result = pre_extract_fields(f.read())
+        expected = EXPECTED.get(name, {})
+
+        assert set(result.values) <= set(RULE_FIELDS), f"{name}: {sorted(result.values)}"
+        for field in RULE_FIELDS:
+            assert result.values.get(field) == expected.get(field), (
+                f"{name}: {field} = {result.values.get(field)!r}, expected {expected.get(field)!r}"
+            )
+        for value in result.values.values():
+            assert not (isinstance(value, str) and ZERO_WIDTH_RE.search(value)), f"{name}: {value!r}"
+        assert set(result.field_confidence) == set(result.values), name
+
+        filled += len(result.values)
+        print(f"{name[:60]:<60} {result.describe() if result.values else 'no GRADE A/B/C values'}")
+
+    print(f"\n✅ {len(files)} files: {filled} rule values match")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,115 +8,325 @@ Category Mapping System for Edinburgh Finds
 
 Workflow:
     raw LLM categories  -->  map_categories()  --> canonical categories
+
+Matching is token based: each raw string is normalised (lowercase, accents
+folded, hyphens/punctuation → spaces, simple plurals → singular) and scanned
+left to right against a trie of every synonym and canonical name, taking
+the longest phrase at each position. So "Indoor padel courts" → padel and
+"5 a side" → football. Tokens that match nothing can optionally fall back
+to a bounded edit distance against the trie vocabulary ("pilattes" →
+pilates). That is off by default (settings.CATEGORY_FUZZY_MAX_EDITS = 0):
+without a dictionary of ordinary words it also turns "slimming" into
+swimming and "pirates" into pilates.
+
+The taxonomy itself lives in a versioned JSON file
+(settings.CATEGORY_TAXONOMY_PATH, default data/taxonomy/categories.json):
+
+    {"version": 2, "canonical": ["padel", ...], "synonyms": {"paddle tennis": "padel", ...}}
+
+It is validated on load and recompiled whenever the file's mtime changes;
+an invalid edit (or a missing / unreadable file) is reported and the
+previous taxonomy stays in use, or the bundled copy if none loaded yet.
+To apply a taxonomy change to stored listings, run
+scripts/recanonicalize_listings.py.
 """
 
-# -------------------------------------------------------
-# FIXED TAXONOMY - Add over time 
-# -------------------------------------------------------
-CANONICAL_CATEGORIES = {
-    "padel",
-    "pickleball",
-    "badminton",
-    "tennis",
-    "squash",
-    "table_tennis",
-    "gym",
-    "swimming",
-    "spa",
-    "cafe",
-    "restaurant",
-    "chess",
-    "escape room",
-    "climbing",
-    "martial arts",
-    "yoga",
-    "pilates",
-    "football",
-}
+import json
+import os
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
 
+from config.settings import settings
 
 # -------------------------------------------------------
-# MAPPING TO CANONICAL CATEGORIES (LLM → Canonical)
+# 1. NORMALISATION
 # -------------------------------------------------------
-CATEGORY_SYNONYMS = {
-    # -----------------------
-    # RACQUET SPORTS
-    # -----------------------
-    "paddle tennis": "padel",
-    "padel tennis": "padel",
-    "glass-back squash": "squash",
-    "ping pong": "table_tennis",
-
-    # -----------------------
-    # GYM / FITNESS
-    # -----------------------
-
-    # -----------------------
-    # SWIMMING
-    # -----------------------
-    "swimming pool": "swimming",
-    "indoor pool": "swimming",
-    "outdoor pool": "swimming",
-    "aqua aerobics": "swimming",
-
-    # -----------------------
-    # SPA WELLNESS
-    # -----------------------
-    "wellness": "spa",
-    "sauna": "spa",
-    "steam room": "spa",
-    "hydro pool": "spa",
-    "hot tub": "spa",
-    "spa retreat": "spa",
-
-    # -----------------------
-    # FAMILY / KIDS
-    # -----------------------
-    "creche": "family",
-    "childcare": "family",
-    "kids": "family",
-    "kids club": "family",
-    "junior": "family",
-    "holiday club": "family",
-
-    # -----------------------
-    # FOOD & DRINK
-    # -----------------------
-    "dining": "restaurant",
-    "coffee": "cafe",
-
-    # -----------------------
-    # FOOTBALL
-    # -----------------------
-    "5-a-side football": "football",
-    "7-a-side football": "football",    
-}
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+# Words ending in "s" that are not plurals
+_SINGULAR_S_ENDINGS = ("ss", "us", "is", "ics")
+
+
+def _singular(token: str) -> str:
+    if len(token) <= 3 or not token.endswith("s") or token.endswith(_SINGULAR_S_ENDINGS):
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith(("ches", "shes", "xes")):
+        return token[:-2]
+    return token[:-1]
+
+
+def normalise_category_tokens(text: str) -> tuple[str, ...]:
+    """'Crèche-Facilities' → ('creche', 'facility')"""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return tuple(_singular(t) for t in _NON_WORD_RE.split(text.replace("'", "")) if t)
 
 
 # -------------------------------------------------------
-# 3. MAIN MAPPING FUNCTION
+# 2. COMPILED MATCHER
 # -------------------------------------------------------
-def map_categories(raw_list: list[str]) -> list[str]:
+_TERMINAL = "$"  # trie key holding the canonical category of a complete phrase
+
+
+def _deletions(token: str, limit: int) -> set[str]:
+    """Every string obtained by deleting up to `limit` characters from `token`."""
+    variants = {token}
+    for n in range(1, min(limit, len(token) - 1) + 1):
+        for positions in combinations(range(len(token)), n):
+            variants.add("".join(ch for i, ch in enumerate(token) if i not in positions))
+    return variants
+
+
+def _within_distance(a: str, b: str, limit: int) -> bool:
+    """Levenshtein(a, b) <= limit, computed in a diagonal band with early exit."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [limit + 1] * len(b)
+        lo, hi = max(1, i - limit), min(len(b), i + limit)
+        for j in range(lo, hi + 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != b[j - 1]),
+            )
+        if min(current[lo - 1:hi + 1]) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+class CategoryMatcher:
     """
-    Convert raw category strings from LLM into canonical categories.
-    Unrecognised categories are ignored (safe by design).
+    Token trie over canonical names + synonyms.
+    Matching is linear in the number of input tokens (times the longest
+    phrase length), independent of how many synonyms the taxonomy has.
+
+    The opt-in fuzzy fallback (max_edit_distance > 0) uses a deletion index
+    (SymSpell-style): two tokens within edit distance k share a variant with
+    at most k characters deleted, so a lookup costs O(len(token)^k) dict
+    probes regardless of vocabulary size.
     """
 
-    mapped = set()
+    def __init__(self, canonical: set[str], synonyms: dict[str, str], max_edit_distance: int = 0):
+        self.max_edit_distance = max_edit_distance
+        self.root: dict = {}
+        self.vocabulary: set[str] = set()
+        self.deletion_index: dict[str, set[str]] = {}  # deletion variant → vocabulary tokens
+
+        for category in canonical:
+            self._add(category.replace("_", " "), category)
+        for phrase, category in synonyms.items():
+            self._add(phrase, category)
+
+        if max_edit_distance > 0:
+            for token in self.vocabulary:
+                for variant in _deletions(token, max_edit_distance):
+                    self.deletion_index.setdefault(variant, set()).add(token)
+
+        # Per-matcher LRU over raw strings (LLM output repeats a lot)
+        self.match = lru_cache(maxsize=4096)(self._match)
+        self._correct = lru_cache(maxsize=4096)(self._correct)
+
+    def _add(self, phrase: str, category: str) -> None:
+        tokens = normalise_category_tokens(phrase)
+        if not tokens:
+            return
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token, {})
+            self.vocabulary.add(token)
+        node[_TERMINAL] = category
 
-    for item in raw_list:
-        if not item:
-            continue
+    def _correct(self, token: str) -> str | None:
+        """Closest known token within the edit budget (only for tokens of 5+ chars)."""
+        limit = self.max_edit_distance
+        if limit <= 0 or len(token) < 5:
+            return None
+        candidates = set()
+        for variant in _deletions(token, limit):
+            candidates.update(self.deletion_index.get(variant, ()))
+        matches = [c for c in candidates if _within_distance(token, c, limit)]
+        return min(matches) if matches else None  # deterministic pick
+
+    def _match(self, raw: str) -> tuple[str, ...]:
+        """Canonical categories mentioned in one raw string (cached per string)."""
+        tokens = list(normalise_category_tokens(raw))
+        if self.max_edit_distance:
+            for i, token in enumerate(tokens):
+                if token not in self.vocabulary:
+                    tokens[i] = self._correct(token) or token
+
+        found = []
+        i = 0
+        while i < len(tokens):
+            node, j, best = self.root, i, None
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if _TERMINAL in node:
+                    best = (node[_TERMINAL], j)
+            if best:
+                found.append(best[0])
+                i = best[1]
+            else:
+                i += 1
+        return tuple(found)
+
+    def map(self, raw_list: list[str]) -> list[str]:
+        mapped = set()
+        for item in raw_list:
+            if item:
+                mapped.update(self.match(item))
+        return sorted(mapped)
+
+
+# -------------------------------------------------------
+# 3. TAXONOMY STORE (versioned data file, hot-reloaded)
+# -------------------------------------------------------
+class TaxonomyError(ValueError):
+    """The taxonomy file is malformed or inconsistent."""
 
-        key = item.lower().strip()
 
-        # exact synonym -> canonical
-        if key in CATEGORY_SYNONYMS:
-            mapped.add(CATEGORY_SYNONYMS[key])
-            continue
+@dataclass(frozen=True)
+class Taxonomy:
+    version: int
+    canonical: frozenset
+    synonyms: Mapping[str, str]
 
-        # direct match
-        if key in CANONICAL_CATEGORIES:
-            mapped.add(key)
 
-    return sorted(mapped)
+def parse_taxonomy(doc: dict) -> Taxonomy:
+    """Validate a taxonomy document and return it frozen."""
+    if not isinstance(doc, dict):
+        raise TaxonomyError("taxonomy must be a JSON object")
+
+    version = doc.get("version")
+    if not isinstance(version, int):
+        raise TaxonomyError("'version' must be an integer")
+
+    canonical = doc.get("canonical")
+    if not isinstance(canonical, list) or not all(isinstance(c, str) and c.strip() for c in canonical):
+        raise TaxonomyError("'canonical' must be a list of non-empty strings")
+    if len(set(canonical)) != len(canonical):
+        raise TaxonomyError("'canonical' contains duplicates")
+
+    synonyms = doc.get("synonyms", {})
+    if not isinstance(synonyms, dict):
+        raise TaxonomyError("'synonyms' must be an object of phrase → canonical category")
+
+    # Every phrase must point at a canonical category, and no two phrases may
+    # normalise to the same tokens while disagreeing on the category.
+    phrase_targets: dict[tuple[str, ...], str] = {
+        normalise_category_tokens(c.replace("_", " ")): c for c in canonical
+    }
+    for phrase, category in synonyms.items():
+        if category not in canonical:
+            raise TaxonomyError(f"synonym '{phrase}' maps to unknown category '{category}'")
+        tokens = normalise_category_tokens(phrase)
+        if not tokens:
+            raise TaxonomyError(f"synonym '{phrase}' has no matchable words")
+        if phrase_targets.setdefault(tokens, category) != category:
+            raise TaxonomyError(
+                f"synonym '{phrase}' → '{category}' conflicts with '{phrase_targets[tokens]}'"
+            )
+
+    return Taxonomy(
+        version=version,
+        canonical=frozenset(canonical),
+        synonyms=MappingProxyType(dict(synonyms)),
+    )
+
+
+# Copy shipped with the code, used when the configured file can't be read
+BUNDLED_TAXONOMY_PATH = Path(__file__).resolve().parent.parent / "data" / "taxonomy" / "categories.json"
+
+
+def load_taxonomy(path: str | os.PathLike | None = None) -> Taxonomy:
+    path = Path(path or settings.CATEGORY_TAXONOMY_PATH)
+    try:
+        doc = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise TaxonomyError(f"{path}: invalid JSON ({e})") from e
+    return parse_taxonomy(doc)
+
+
+class _TaxonomyStore:
+    """Holds the compiled matcher and rebuilds it when the file changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path: Path | None = None
+        self._mtime: int | None = None
+        self.taxonomy: Taxonomy | None = None
+        self.matcher: CategoryMatcher | None = None
+
+    def _install(self, taxonomy: Taxonomy) -> None:
+        self.taxonomy = taxonomy
+        self.matcher = CategoryMatcher(
+            taxonomy.canonical, taxonomy.synonyms, max_edit_distance=settings.CATEGORY_FUZZY_MAX_EDITS
+        )
+
+    def get(self) -> CategoryMatcher:
+        path = Path(settings.CATEGORY_TAXONOMY_PATH)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            mtime = None  # missing / unreadable: the load below reports it once
+        if self.matcher is not None and (path, mtime) == (self._path, self._mtime):
+            return self.matcher
+
+        with self._lock:
+            if self.matcher is not None and (path, mtime) == (self._path, self._mtime):
+                return self.matcher
+            try:
+                taxonomy = load_taxonomy(path)
+            except (TaxonomyError, OSError) as e:
+                if self.matcher is None:
+                    # Nothing loaded yet: fall back to the taxonomy shipped with the code
+                    self._install(load_taxonomy(BUNDLED_TAXONOMY_PATH))
+                    print(f"⚠️ Taxonomy {path} unusable, using bundled v{self.taxonomy.version}: {e}")
+                else:
+                    print(f"❌ Taxonomy reload failed, keeping v{self.taxonomy.version}: {e}")
+                self._path, self._mtime = path, mtime  # don't retry until the file changes again
+                return self.matcher
+
+            if self.matcher is not None:
+                print(f"🔄 Taxonomy reloaded: v{self.taxonomy.version} → v{taxonomy.version}")
+            self._install(taxonomy)
+            self._path, self._mtime = path, mtime
+            return self.matcher
+
+
+_store = _TaxonomyStore()
+
+
+def get_category_matcher() -> CategoryMatcher:
+    """Compiled matcher for the current taxonomy file (reloaded if it changed)."""
+    return _store.get()
+
+
+def get_taxonomy() -> Taxonomy:
+    get_category_matcher()
+    return _store.taxonomy
+
+
+# -------------------------------------------------------
+# 4. MAIN MAPPING FUNCTION
+# -------------------------------------------------------
+def map_categories(raw_list: list[str]) -> list[str]:
+    """
+    Convert raw category strings from LLM into canonical categories.
+    Every known phrase found inside a string counts ("Kids Tennis Lessons"
+    → family, tennis). Unrecognised categories are ignored (safe by design).
+    """
+    return get_category_matcher().map(raw_list)
@@ -0,0 +1,114 @@
+# utils/gather_sections.py
+
+"""
+Helpers for gather documents organised by confidence grade:
+
+    <preamble>
+    GRADE A — High Confidence (Directly Verified)
+    ...
+    GRADE B — Medium Confidence (Strongly Supported)
+    ...
+    GRADE C — Low Confidence (Weakly Supported)
+    ...
+    GRADE X — Not Found / Too Uncertain
+    ...
+
+Headers may be plain or markdown ("## GRADE A — ...").
+"""
+
+import hashlib
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Optional
+
+GRADE_HEADER_RE = re.compile(r"^[ \t]*(?:#+[ \t]*)?GRADE[ \t]+([ABCX])\b[^\n]*$", re.MULTILINE)
+ZERO_WIDTH_RE = re.compile("[\u200b\u200c\u200d\u2060\ufeff]")
+
+# Sections the extraction prompt actually uses (GRADE X is "don't populate")
+EXTRACTED_GRADES = ("A", "B", "C")
+
+
+@dataclass(frozen=True)
+class GatherSection:
+    grade: Optional[str]  # None for text before the first GRADE header
+    header: str
+    body: str
+
+    def render(self) -> str:
+        return f"{self.header}\n{self.body}".strip() if self.header else self.body.strip()
+
+
+def split_grade_sections(text: str) -> list[GatherSection]:
+    """Split a gather document into its preamble and GRADE sections."""
+    sections = []
+    matches = list(GRADE_HEADER_RE.finditer(text))
+
+    preamble = text[: matches[0].start()] if matches else text
+    if preamble.strip():
+        sections.append(GatherSection(grade=None, header="", body=preamble))
+
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        sections.append(
+            GatherSection(
+                grade=match.group(1),
+                header=match.group(0).strip(),
+                body=text[match.end():end],
+            )
+        )
+    return sections
+
+
+def is_subheading(line: str) -> bool:
+    """Short label line such as 'Spa Retreat', '### GYM FACILITIES' or 'Children and family'."""
+    line = line.strip()
+    if line.startswith("#"):
+        return True
+    if line.startswith(("-", "*", "•")):
+        return False
+    return len(line) <= 60 and ":" not in line and not line.endswith((".", "!", "?", "]"))
+
+
+def normalise_text(text: str) -> str:
+    """Unicode-normalise, drop zero-width chars and collapse whitespace."""
+    text = unicodedata.normalize("NFKC", text)
+    text = ZERO_WIDTH_RE.sub("", text)
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def text_fingerprint(text: str) -> str:
+    """Hash that ignores formatting-only differences."""
+    return hashlib.sha256(normalise_text(text).encode("utf-8")).hexdigest()
+
+
+def changed_sections(previous: str, current: str) -> Optional[list[GatherSection]]:
+    """
+    Sections of `current` (preamble + GRADE A/B/C) whose normalised content
+    differs from `previous`. Returns None when either text has no GRADE
+    structure, in which case callers should re-extract everything.
+    """
+    prev_sections = split_grade_sections(previous)
+    curr_sections = split_grade_sections(current)
+    if not any(s.grade for s in prev_sections) or not any(s.grade for s in curr_sections):
+        return None
+
+    def fingerprints(sections: list[GatherSection]) -> dict:
+        grouped: dict[Optional[str], list[str]] = {}
+        for s in sections:
+            grouped.setdefault(s.grade, []).append(s.body)
+        return {grade: text_fingerprint("\n".join(bodies)) for grade, bodies in grouped.items()}
+
+    prev_fp = fingerprints(prev_sections)
+    curr_fp = fingerprints(curr_sections)
+
+    return [
+        s for s in curr_sections
+        if (s.grade is None or s.grade in EXTRACTED_GRADES)
+        and prev_fp.get(s.grade) != curr_fp[s.grade]
+    ]
+
+
+def render_sections(sections: list[GatherSection]) -> str:
+    return "\n\n".join(s.render() for s in sections)
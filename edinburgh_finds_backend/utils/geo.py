@@ -0,0 +1,212 @@
+# utils/geo.py
+
+"""
+Geospatial helpers for listing coordinates (WGS84 decimal degrees).
+
+    haversine_km(lat1, lon1, lat2, lon2)      great-circle distance
+    encode_geohash(lat, lon, precision=9)     'gcvwr3...' cell id
+    covering_cells(lat, lon, radius_km)       geohash prefixes whose union
+                                              contains the whole circle
+    GeoKDTree(points)                         in-memory radius / k-nearest
+
+A geohash is a base-32 string; every extra character narrows the cell, so
+all points inside a cell share its prefix and `geohash LIKE 'gcvwr%'` is an
+index range scan. Cell size per precision, E-W x N-S at Edinburgh's latitude:
+
+    4   ~20 km x 20 km      6   ~0.6 km x 0.6 km      8   ~21 m x 19 m
+    5   ~2.7 km x 4.9 km    7   ~86 m x 150 m         9   ~2.7 m x 4.8 m
+"""
+
+import heapq
+import math
+from typing import Any, Iterable, Optional
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9  # stored on listings; queries use shorter prefixes
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) enclosing the circle (no antimeridian wrap)."""
+    d_lat = radius_km / KM_PER_DEGREE_LAT
+    max_abs_lat = min(89.9, abs(lat) + d_lat)
+    d_lon = min(180.0, radius_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(max_abs_lat))))
+    return lat - d_lat, lat + d_lat, lon - d_lon, lon + d_lon
+
+
+# -------------------------------------------------------
+# GEOHASH
+# -------------------------------------------------------
+def encode_geohash(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if coord >= mid:
+            value = (value << 1) | 1
+            rng[0] = mid
+        else:
+            value <<= 1
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def geohash_or_none(lat: Optional[float], lon: Optional[float]) -> Optional[str]:
+    if lat is None or lon is None:
+        return None
+    return encode_geohash(lat, lon)
+
+
+def cell_size_degrees(precision: int) -> tuple[float, float]:
+    """(height, width) of a geohash cell in degrees."""
+    bits = 5 * precision
+    lon_bits = (bits + 1) // 2
+    return 180.0 / 2 ** (bits - lon_bits), 360.0 / 2 ** lon_bits
+
+
+def cell_min_side_km(precision: int, lat: float) -> float:
+    """Shorter side of a cell near `lat` (widths shrink towards the poles)."""
+    height, width = cell_size_degrees(precision)
+    worst_lat = min(89.9, abs(lat) + height)
+    return min(height * KM_PER_DEGREE_LAT, width * KM_PER_DEGREE_LAT * math.cos(math.radians(worst_lat)))
+
+
+def covering_precision(lat: float, radius_km: float, max_precision: int = GEOHASH_PRECISION) -> int:
+    """Finest precision whose cells are at least radius_km on every side (0 = whole world)."""
+    for precision in range(max_precision, 0, -1):
+        if cell_min_side_km(precision, lat) >= radius_km:
+            return precision
+    return 0
+
+
+def covering_cells(lat: float, lon: float, radius_km: float, max_precision: int = GEOHASH_PRECISION) -> list[str]:
+    """
+    Cell prefixes whose union contains every point within radius_km: the
+    cell holding (lat, lon) and its 8 neighbours, at a precision where a
+    cell side is at least the radius. [""] matches everything.
+    """
+    precision = covering_precision(lat, radius_km, max_precision)
+    if precision == 0:
+        return [""]
+    height, width = cell_size_degrees(precision)
+    cells = set()
+    for d_lat in (-height, 0.0, height):
+        neighbour_lat = lat + d_lat
+        if not -90.0 <= neighbour_lat <= 90.0:
+            continue
+        for d_lon in (-width, 0.0, width):
+            neighbour_lon = (lon + d_lon + 180.0) % 360.0 - 180.0
+            cells.add(encode_geohash(neighbour_lat, neighbour_lon, precision))
+    return sorted(cells)
+
+
+# -------------------------------------------------------
+# IN-MEMORY KD-TREE
+# -------------------------------------------------------
+def _unit_vector(lat: float, lon: float) -> tuple[float, float, float]:
+    phi, lam = math.radians(lat), math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+def _chord_for_km(km: float) -> float:
+    """Straight-line distance through the unit sphere for a surface distance."""
+    return 2 * math.sin(min(math.pi, km / EARTH_RADIUS_KM) / 2)
+
+
+def _km_for_chord(chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+class GeoKDTree:
+    """
+    Static 3-d tree over points on the unit sphere; chord length is monotonic
+    in great-circle distance, so nearest-in-3d is nearest-on-earth and there
+    is no antimeridian / pole special-casing.
+
+        tree = GeoKDTree([(lat, lon, payload), ...])
+        tree.within(lat, lon, 3.0)   -> [(km, payload), ...] nearest first
+        tree.nearest(lat, lon, 5)    -> [(km, payload), ...]
+    """
+
+    def __init__(self, points: Iterable[tuple[float, float, Any]]):
+        items = [(_unit_vector(lat, lon), payload) for lat, lon, payload in points]
+        self._size = len(items)
+        # Node: (vector, payload, axis, left, right)
+        self._root = self._build(items, 0)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _build(self, items: list, depth: int):
+        if not items:
+            return None
+        axis = depth % 3
+        items.sort(key=lambda item: item[0][axis])
+        mid = len(items) // 2
+        vector, payload = items[mid]
+        return (vector, payload, axis, self._build(items[:mid], depth + 1), self._build(items[mid + 1:], depth + 1))
+
+    def within(self, lat: float, lon: float, radius_km: float) -> list[tuple[float, Any]]:
+        target = _unit_vector(lat, lon)
+        limit_sq = _chord_for_km(radius_km) ** 2
+        hits, stack = [], [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            vector, payload, axis, left, right = node
+            dist_sq = sum((a - b) ** 2 for a, b in zip(vector, target))
+            if dist_sq <= limit_sq:
+                hits.append((_km_for_chord(math.sqrt(dist_sq)), payload))
+            diff = target[axis] - vector[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append(near)
+            if diff * diff <= limit_sq:
+                stack.append(far)
+        hits.sort(key=lambda hit: hit[0])
+        return hits
+
+    def nearest(self, lat: float, lon: float, k: int) -> list[tuple[float, Any]]:
+        if k <= 0:
+            return []
+        target = _unit_vector(lat, lon)
+        best: list[tuple[float, int, Any]] = []  # max-heap on -dist_sq (+ tiebreak)
+        counter = 0
+
+        def visit(node):
+            nonlocal counter
+            if node is None:
+                return
+            vector, payload, axis, left, right = node
+            dist_sq = sum((a - b) ** 2 for a, b in zip(vector, target))
+            counter += 1
+            if len(best) < k:
+                heapq.heappush(best, (-dist_sq, counter, payload))
+            elif dist_sq < -best[0][0]:
+                heapq.heapreplace(best, (-dist_sq, counter, payload))
+            diff = target[axis] - vector[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(best) < k or diff * diff < -best[0][0]:
+                visit(far)
+
+        visit(self._root)
+        hits = [(_km_for_chord(math.sqrt(-neg)), payload) for neg, _, payload in best]
+        hits.sort(key=lambda hit: hit[0])
+        return hits
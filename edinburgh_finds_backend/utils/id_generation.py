@@ -13,8 +13,11 @@ def generate_listing_id(entity_type: str) -> str:
         entity_type: Type of entity (venue, retailer, cafe, etc.)
     
     Returns:
-        Prefixed UUID like "VEN-018e12345678abcd"
-    
+        Prefixed UUID like "VEN-018e12345678a1b2c3d4"
+
+    The first 12 hex chars are the uuid7 millisecond timestamp (time-ordered);
+    the last 8 come from the random tail so IDs minted in the same millisecond
+    (e.g. bulk upserts) stay unique.
     """
     prefix_map = {
         "venue": "VEN"
@@ -22,7 +25,8 @@ def generate_listing_id(entity_type: str) -> str:
     
     prefix = prefix_map.get(entity_type, "LST")
     id_uuid = uuid7()
-    short_uuid = str(id_uuid).replace('-', '')[:16]
+    hex_uuid = str(id_uuid).replace('-', '')
+    short_uuid = hex_uuid[:12] + hex_uuid[-8:]
     
     return f"{prefix}-{short_uuid}"
 
@@ -0,0 +1,184 @@
+# utils/input_compaction.py
+
+"""
+Deterministic compaction of gather text before it is sent to the LLM.
+
+Gather dumps repeat themselves: the same fact is restated in several
+wordings, copied across GRADE sections, sprinkled with zero-width
+characters, and closed by a GRADE X section the prompt says to ignore.
+compact_gather_text() removes that without touching any remaining fact:
+
+    1. NFKC-normalise, drop zero-width characters, collapse whitespace and
+       blank lines (nested bullets keep a two-space indent)
+    2. drop the GRADE X section and the BEGIN/END_RAW_DUMP markers
+    3. drop lines already stated in a higher grade (A > B > C > ungraded
+       preamble); repeats within a grade are kept. Sub-headings (a short
+       label line followed by content) are never deduplicated, but are
+       dropped when everything under them was a duplicate
+
+Lines count as repeats when they match after case-folding and ignoring
+punctuation ("Phone: 0131 561 4500." == "phone 0131 561 4500"). Short
+"Label: value" lines only mean something under their sub-heading
+("Day: Wednesday" under one league or another), so for those the
+sub-heading is part of the match.
+
+Token counts are estimates (~4 characters per token); the exact billed
+numbers are in the run metrics (services/run_metrics.py).
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+
+from utils.gather_sections import ZERO_WIDTH_RE, is_subheading, split_grade_sections
+
+BOILERPLATE_LINES = frozenset({"BEGIN_RAW_DUMP", "END_RAW_DUMP"})
+
+# Lower rank wins when the same line appears in several sections
+GRADE_RANK = {"A": 0, "B": 1, "C": 2, None: 3}
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+# "Format: Men's 5-a-side", "- Day: Wednesday"
+_LABEL_VALUE_RE = re.compile(r"^\s*(?:[-*•]\s*)?[^:]{1,30}:\s*\S")
+LABEL_VALUE_MAX_CHARS = 60
+
+
+@dataclass(frozen=True)
+class CompactionReport:
+    original_chars: int
+    compact_chars: int
+    grade_x_lines: int
+    duplicate_lines: int
+
+    @property
+    def original_tokens(self) -> int:
+        return estimate_tokens(self.original_chars)
+
+    @property
+    def compact_tokens(self) -> int:
+        return estimate_tokens(self.compact_chars)
+
+    @property
+    def saved_ratio(self) -> float:
+        return 1 - self.compact_chars / self.original_chars if self.original_chars else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "original_chars": self.original_chars,
+            "compact_chars": self.compact_chars,
+            "original_tokens": self.original_tokens,
+            "compact_tokens": self.compact_tokens,
+            "grade_x_lines": self.grade_x_lines,
+            "duplicate_lines": self.duplicate_lines,
+            "saved_ratio": round(self.saved_ratio, 3),
+        }
+
+    def describe(self) -> str:
+        return (
+            f"{self.original_chars:,} → {self.compact_chars:,} chars "
+            f"(~{self.original_tokens:,} → ~{self.compact_tokens:,} tokens, -{self.saved_ratio:.0%}; "
+            f"{self.duplicate_lines} duplicate line(s), {self.grade_x_lines} GRADE X line(s) dropped)"
+        )
+
+
+def estimate_tokens(chars: int) -> int:
+    return (chars + 3) // 4
+
+
+def normalise_line(line: str) -> str:
+    """Unicode-normalised line with collapsed whitespace ('' for blank lines)."""
+    line = ZERO_WIDTH_RE.sub("", unicodedata.normalize("NFKC", line))
+    content = " ".join(line.split())
+    if content and line[:1].isspace():
+        return "  " + content  # keep nesting for bullets / continuations
+    return content
+
+
+def line_key(line: str) -> str:
+    """Dedupe key: case-folded words only."""
+    return _NON_WORD_RE.sub(" ", line.casefold()).strip()
+
+
+def is_label_value(line: str) -> bool:
+    return len(line.strip()) <= LABEL_VALUE_MAX_CHARS and bool(_LABEL_VALUE_RE.match(line))
+
+
+def _heading_flags(lines: list[str]) -> list[bool]:
+    """A label line only counts as a heading when content follows it."""
+    return [
+        is_subheading(line) and i + 1 < len(lines) and not is_subheading(lines[i + 1])
+        for i, line in enumerate(lines)
+    ]
+
+
+def compact_gather_text(text: str) -> tuple[str, CompactionReport]:
+    """Compacted text for the LLM plus a report of what was removed."""
+    sections = []
+    grade_x_lines = 0
+    for section in split_grade_sections(text):
+        lines = [normalise_line(line) for line in section.body.splitlines()]
+        lines = [line for line in lines if line and line not in BOILERPLATE_LINES]
+        if section.grade == "X":
+            grade_x_lines += len(lines) + 1
+            continue
+        sections.append((section, lines, _heading_flags(lines)))
+
+    # Fact keys per section: the line, plus its sub-heading for label lines
+    section_keys = []
+    for section, lines, headings in sections:
+        keys, heading = [], ""
+        for line, is_heading in zip(lines, headings):
+            if is_heading:
+                heading = line_key(line)
+                keys.append(None)
+                continue
+            key = line_key(line)
+            if key and heading and is_label_value(line):
+                key = f"{heading}\x00{key}"
+            keys.append(key or None)
+        section_keys.append(keys)
+
+    # Highest grade (lowest rank) each fact appears in
+    best: dict[str, int] = {}
+    for (section, _, _), keys in zip(sections, section_keys):
+        rank = GRADE_RANK[section.grade]
+        for key in keys:
+            if key is not None:
+                best[key] = min(rank, best.get(key, rank))
+
+    out = []
+    duplicate_lines = 0
+    for (section, lines, headings), keys in zip(sections, section_keys):
+        rank = GRADE_RANK[section.grade]
+        kept = []
+        heading_index, block_had_duplicates = None, False  # heading with nothing kept under it yet
+        for line, is_heading, key in zip(lines, headings, keys):
+            if is_heading:
+                if heading_index is not None and block_had_duplicates:
+                    del kept[heading_index]
+                heading_index, block_had_duplicates = len(kept), False
+                kept.append(line)
+                continue
+
+            if key is not None and best[key] < rank:
+                duplicate_lines += 1
+                block_had_duplicates = True
+                continue
+            kept.append(line)
+            heading_index = None
+
+        if heading_index is not None and block_had_duplicates:
+            del kept[heading_index]
+
+        if kept:
+            header = [normalise_line(section.header)] if section.header else []
+            out.append("\n".join(header + kept))
+
+    compact = "\n\n".join(out)
+    return compact, CompactionReport(
+        original_chars=len(text),
+        compact_chars=len(compact),
+        grade_x_lines=grade_x_lines,
+        duplicate_lines=duplicate_lines,
+    )
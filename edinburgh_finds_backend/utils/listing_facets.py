@@ -0,0 +1,77 @@
+# utils/listing_facets.py
+
+"""
+Facets derived from an entity row for the listing_summaries table: which
+sports a venue offers, its court/pitch counts and a handful of has_* flags.
+
+A facet is "on" when any of its boolean fields is True or any of its count
+fields is > 0 (venues often report "6 courts" without the matching flag).
+Unknown (None) counts as off.
+
+    venue_summary_facets(venue)
+    -> {"sports": ["padel", "tennis"], "court_counts": {"padel": 4, "tennis": 6},
+        "total_courts": 10, "has_spa": True, "has_parking": False, ...}
+"""
+
+from typing import Any, Dict, Tuple
+
+# sport → (boolean fields, court / pitch / table count fields)
+VENUE_SPORTS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "tennis": (("tennis",), ("tennis_total_courts",)),
+    "padel": (("padel",), ("padel_total_courts",)),
+    "pickleball": (("pickleball",), ("pickleball_total_courts",)),
+    "badminton": (("badminton",), ("badminton_total_courts",)),
+    "squash": (("squash",), ("squash_total_courts",)),
+    "table_tennis": (("table_tennis",), ("table_tennis_total_tables",)),
+    "football": (
+        ("football_5_a_side", "football_7_a_side", "football_11_a_side"),
+        ("football_5_a_side_total_pitches", "football_7_a_side_total_pitches",
+         "football_11_a_side_total_pitches"),
+    ),
+    "swimming": (("indoor_pool", "outdoor_pool", "swimming_lessons"), ()),
+}
+
+# listing_summaries column → (boolean fields, count fields)
+VENUE_FLAGS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "has_pool": (("indoor_pool", "outdoor_pool"), ()),
+    "has_gym": (("gym_available",), ("gym_size",)),
+    "has_classes": (
+        ("hiit_classes", "yoga_classes", "pilates_classes", "strength_classes", "cycling_studio"),
+        ("classes_per_week",),
+    ),
+    "has_spa": (
+        ("spa_available", "sauna", "steam_room", "hydro_pool", "hot_tub", "outdoor_spa", "ice_cold_plunge"),
+        (),
+    ),
+    "has_food_and_drink": (("restaurant", "bar", "cafe"), ()),
+    "has_creche": (("creche_available",), ()),
+    "has_parking": (("disabled_parking", "parent_child_parking"), ("parking_spaces",)),
+    "has_ev_charging": (("ev_charging_available",), ("ev_charging_connectors",)),
+}
+
+
+def _count(entity: Any, fields: Tuple[str, ...]) -> int:
+    return sum(getattr(entity, field, None) or 0 for field in fields)
+
+
+def _is_on(entity: Any, bool_fields: Tuple[str, ...], count_fields: Tuple[str, ...]) -> bool:
+    return any(getattr(entity, field, None) is True for field in bool_fields) or _count(entity, count_fields) > 0
+
+
+def venue_summary_facets(venue: Any) -> Dict[str, Any]:
+    sports, court_counts = [], {}
+    for sport, (bool_fields, count_fields) in VENUE_SPORTS.items():
+        if not _is_on(venue, bool_fields, count_fields):
+            continue
+        sports.append(sport)
+        if count_fields and _count(venue, count_fields):
+            court_counts[sport] = _count(venue, count_fields)
+
+    facets: Dict[str, Any] = {
+        "sports": sorted(sports),
+        "court_counts": court_counts,
+        "total_courts": sum(court_counts.values()),
+    }
+    for column, (bool_fields, count_fields) in VENUE_FLAGS.items():
+        facets[column] = _is_on(venue, bool_fields, count_fields)
+    return facets
@@ -1,18 +1,63 @@
+import hashlib
+import json
+from functools import lru_cache
+from typing import Iterable, Optional
 from sqlmodel import SQLModel
-from pydantic import create_model
+from pydantic import BaseModel, create_model
 
-def to_pydantic_model(sqlmodels: list[type[SQLModel]]) -> type:
+# Generated models, keyed by model_definition_hash()
+_MODEL_CACHE: dict[str, type[BaseModel]] = {}
+
+def model_definition_hash(sqlmodels: Iterable[type[SQLModel]]) -> str:
+    """Hash of the field definitions (name, type, default, exclude) of `sqlmodels`."""
+    digest = hashlib.sha256()
+    for cls in sqlmodels:
+        digest.update(f"{cls.__module__}.{cls.__qualname__}".encode("utf-8"))
+        for name, field in cls.model_fields.items():
+            parts = (name, repr(field.annotation), repr(field.default), repr(getattr(field, "exclude", False)))
+            digest.update("\x00".join(parts).encode("utf-8"))
+    return digest.hexdigest()
+
+def to_pydantic_model(sqlmodels: list[type[SQLModel]], name: str = "VenueSchema") -> type:
     """
     Combine multiple SQLModel classes into a single pure Pydantic model.
     Uses the `exclude=True` flag as the only signal for skipping fields.
+
+    Built once per distinct set of definitions: repeat calls return the same
+    class, so everything cached per model class (JSON schema, Instructor's
+    prepared tool schema) is reused.
     """
+    key = f"{name}:{model_definition_hash(sqlmodels)}"
+    if key not in _MODEL_CACHE:
+        _MODEL_CACHE[key] = _build_pydantic_model(sqlmodels, name)
+    return _MODEL_CACHE[key]
+
+def _build_pydantic_model(sqlmodels: list[type[SQLModel]], name: str) -> type:
     fields = {}
     for cls in sqlmodels:
-        for name, field in cls.model_fields.items():
+        for field_name, field in cls.model_fields.items():
             # ✅ Skip only fields explicitly marked as excluded
             if getattr(field, "exclude", False):
                 continue
-            if name not in fields:
-                fields[name] = (field.annotation, field.default)
+            if field_name not in fields:
+                fields[field_name] = (field.annotation, field.default)
 
-    return create_model("VenueSchema", **fields)
+    return create_model(name, **fields)
+
+
+@lru_cache(maxsize=None)
+def schema_json(model: type[BaseModel]) -> str:
+    """Canonical (sorted-key) JSON schema of `model`, generated once per class."""
+    return json.dumps(model.model_json_schema(), sort_keys=True)
+
+
+def to_partial_model(model: type[BaseModel], field_names: Iterable[str], name: str) -> type[BaseModel]:
+    """
+    Build a smaller model containing only `field_names` from `model`.
+    Every field becomes optional (default None) so partial extractions validate.
+    """
+    fields = {
+        field_name: (Optional[model.model_fields[field_name].annotation], None)
+        for field_name in field_names
+    }
+    return create_model(name, **fields)
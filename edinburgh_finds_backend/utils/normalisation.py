@@ -0,0 +1,46 @@
+# utils/normalisation.py
+
+"""
+Field normalisers applied to extracted values before they are upserted.
+
+The `normalise_*_fields` hooks take the listing update dict and rewrite it in
+place; entity types list the hooks they need in core/entity_registry.py.
+"""
+
+from typing import Any, Dict, Optional
+
+import phonenumbers
+
+
+def normalise_lat_lon(lat: float | None, lon: float | None) -> tuple[float | None, float | None]:
+    if lat is not None:
+        lat = round(lat, 5)
+    if lon is not None:
+        lon = round(lon, 5)
+    return lat, lon
+
+def normalise_phone_number(phone: str, region: str = "GB") -> Optional[str]:
+    if not phone:
+        return None
+    try:
+        parsed = phonenumbers.parse(phone, region)
+        if phonenumbers.is_valid_number(parsed):
+            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    except phonenumbers.NumberParseException:
+        pass
+    return phone  # Return original if can't normalize
+
+
+# -------------------------------------------------------
+# Update-dict hooks
+# -------------------------------------------------------
+def normalise_phone_fields(updates: Dict[str, Any]) -> None:
+    if updates.get("phone"):
+        updates["phone"] = normalise_phone_number(updates["phone"])
+
+def normalise_coordinate_fields(updates: Dict[str, Any]) -> None:
+    if updates.get("latitude") or updates.get("longitude"):
+        updates["latitude"], updates["longitude"] = normalise_lat_lon(
+            updates.get("latitude"),
+            updates.get("longitude"),
+        )
@@ -1,30 +1,213 @@
 # utils/query_compressor.py
 
-from google import genai
+"""
+Rewrite long search queries (e.g. Tavily queries) under a character limit.
+
+    compress_query_with_gemini(query, max_chars=300)     # one query
+    compress_queries([...], max_chars=300)               # a whole venue list
+
+Rewrites are memoised on disk (QUERY_CACHE_DIR), keyed on the query text,
+max_chars and model, so regenerating queries for the same venues costs
+nothing. Cache misses are sent to Gemini in batches (one request per
+QUERY_BATCH_SIZE queries). When Gemini is unavailable, or with
+offline=True, compress_query_locally() gives a deterministic rewrite
+instead; local rewrites are not cached, so a later online run still
+upgrades them.
+
+The Gemini client is built lazily, on the first cache miss.
+"""
+
+import hashlib
+import json
+import re
+from functools import lru_cache
+from typing import Iterable
+
+from diskcache import Cache
+
 from config.settings import settings
 
 # We *always* use Gemini Flash for query rewriting:
 # - it's cheap
 # - excellent at summarizing/search phrasing
 # - stable / deterministic
-gemini_client = genai.Client(api_key=settings.GEMINI_API_KEY)
+QUERY_REWRITE_MODEL = "gemini-2.5-flash"
+
+# Dropped by the local fallback (longest phrases first)
+FILLER_PHRASES = (
+    "please provide", "please find", "i am looking for", "i want to know", "can you find",
+    "comprehensive information about", "detailed information about", "information about",
+    "information on", "details about", "details of", "details on", "as well as",
+    "any available", "all available", "if available", "including", "such as", "please",
+)
+STOPWORDS = frozenset({
+    "a", "an", "the", "and", "or", "of", "for", "to", "in", "on", "at", "with", "by",
+    "about", "any", "all", "its", "their", "is", "are", "be", "this", "that", "e.g", "etc",
+})
+
+_QUOTED_OR_WORD_RE = re.compile(r'"[^"]*"|\S+')
+
+
+# -------------------------------------------------------
+# LAZY RESOURCES
+# -------------------------------------------------------
+@lru_cache(maxsize=1)
+def get_gemini_client():
+    from google import genai
 
-def compress_query_with_gemini(long_query: str, max_chars: int = 300) -> str:
+    return genai.Client(api_key=settings.GEMINI_API_KEY)
+
+
+@lru_cache(maxsize=1)
+def get_query_cache() -> Cache:
+    return Cache(settings.QUERY_CACHE_DIR)
+
+
+def query_cache_key(query: str, max_chars: int) -> str:
+    digest = hashlib.sha256()
+    for part in (QUERY_REWRITE_MODEL, str(max_chars), query):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+# -------------------------------------------------------
+# LOCAL FALLBACK
+# -------------------------------------------------------
+def _truncate_words(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[: max_chars + 1].rsplit(" ", 1)[0]
+    return (cut if cut and len(cut) <= max_chars else text[:max_chars]).rstrip(" ,;:")
+
+
+def compress_query_locally(long_query: str, max_chars: int = 300) -> str:
     """
-    Use Gemini directly (not Instructor) to rewrite a long Tavily query
-    into a concise version under the character limit, preserving meaning.
+    Deterministic rewrite: drop filler phrases and stopwords, then repeated
+    words (quoted phrases are kept whole), then cut at a word boundary.
     """
-    prompt = f"""
+    query = " ".join(long_query.split())
+    if len(query) <= max_chars:
+        return query
+
+    for phrase in FILLER_PHRASES:
+        query = re.sub(rf"\b{re.escape(phrase)}\b", " ", query, flags=re.IGNORECASE)
+
+    kept, seen = [], set()
+    for token in _QUOTED_OR_WORD_RE.findall(query):
+        if token.startswith('"'):
+            kept.append(token)
+            continue
+        key = token.strip(".,;:!?()").lower()
+        if not key or key in STOPWORDS or key in seen:
+            continue
+        seen.add(key)
+        kept.append(token)
+
+    return _truncate_words(" ".join(kept), max_chars)
+
+
+# -------------------------------------------------------
+# GEMINI
+# -------------------------------------------------------
+def _rewrite_prompt(long_query: str, max_chars: int) -> str:
+    return f"""
 You are an expert query re-writing assistant.
 You will rewrite this search query to reduce the character count to around {max_chars} characters.
 ** It is critical that the query is no longer than {max_chars} **.
 Now rewrite accordingly: {long_query}
 """
 
-    result = gemini_client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=prompt,
+
+def _batch_prompt(queries: list[str], max_chars: int) -> str:
+    return f"""
+You are an expert query re-writing assistant.
+Rewrite each search query in the JSON list below to reduce its character count to around {max_chars} characters, preserving its meaning.
+** It is critical that no rewritten query is longer than {max_chars} **.
+Return only a JSON array of strings: one rewrite per input query, in the same order.
+Queries: {json.dumps(queries, ensure_ascii=False)}
+"""
+
+
+def _gemini_rewrite_batch(queries: list[str], max_chars: int) -> list[str]:
+    from google.genai import types
+
+    if len(queries) == 1:
+        result = get_gemini_client().models.generate_content(
+            model=QUERY_REWRITE_MODEL,
+            contents=_rewrite_prompt(queries[0], max_chars),
+        )
+        return [result.candidates[0].content.parts[0].text.strip()]
+
+    result = get_gemini_client().models.generate_content(
+        model=QUERY_REWRITE_MODEL,
+        contents=_batch_prompt(queries, max_chars),
+        config=types.GenerateContentConfig(response_mime_type="application/json"),
     )
+    rewrites = json.loads(result.candidates[0].content.parts[0].text)
+    if not isinstance(rewrites, list) or len(rewrites) != len(queries):
+        raise ValueError(f"expected {len(queries)} rewrites, got {rewrites!r:.200}")
+    return [str(r).strip() for r in rewrites]
+
 
-    concise_query = result.candidates[0].content.parts[0].text.strip()
-    return concise_query
+# -------------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------------
+def compress_queries(
+    queries: Iterable[str],
+    max_chars: int = 300,
+    *,
+    offline: bool = False,
+    batch_size: int | None = None,
+) -> list[str]:
+    """
+    Rewrite every query to at most `max_chars` characters (results in input
+    order). Cached rewrites are reused; misses go to Gemini in batches,
+    falling back to compress_query_locally() offline or on API errors.
+    """
+    queries = list(queries)
+    batch_size = batch_size or settings.QUERY_BATCH_SIZE
+    cache = get_query_cache()
+
+    rewrites: dict[str, str] = {}
+    misses: list[str] = []
+    for query in dict.fromkeys(queries):
+        if len(query) <= max_chars:
+            rewrites[query] = query
+            continue
+        cached = cache.get(query_cache_key(query, max_chars))
+        if cached is not None:
+            rewrites[query] = cached
+        else:
+            misses.append(query)
+
+    for start in range(0, len(misses), batch_size):
+        batch = misses[start:start + batch_size]
+        if offline:
+            results = None
+        else:
+            try:
+                results = _gemini_rewrite_batch(batch, max_chars)
+            except Exception as e:  # offline / quota / malformed batch → local rewrite
+                print(f"⚠️  Gemini query rewrite failed ({type(e).__name__}: {e}); using local fallback")
+                results = None
+
+        for i, query in enumerate(batch):
+            if results is None:
+                rewrites[query] = compress_query_locally(query, max_chars)
+                continue
+            # The model occasionally overshoots the limit: tighten its answer locally
+            rewrite = compress_query_locally(results[i], max_chars)
+            cache.set(query_cache_key(query, max_chars), rewrite)
+            rewrites[query] = rewrite
+
+    return [rewrites[query] for query in queries]
+
+
+def compress_query_with_gemini(long_query: str, max_chars: int = 300, *, offline: bool = False) -> str:
+    """
+    Use Gemini directly (not Instructor) to rewrite a long Tavily query
+    into a concise version under the character limit, preserving meaning.
+    Cached per (query, max_chars); see compress_queries for the fallback.
+    """
+    return compress_queries([long_query], max_chars, offline=offline)[0]
@@ -0,0 +1,54 @@
+# utils/search_text.py
+
+"""
+Plain-text documents for full-text search, built from a listing and its
+entity row and stored on listing_summaries:
+
+    search_keywords   categories, canonical categories, sports, city
+    search_body       summary, every *_summary field of the entity row and
+                      other_attributes flattened to "key: value" lines
+
+Postgres weights them (entity_name A, keywords B, body C) in the generated
+search_vector column; see database/db_models.py.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def flatten_attributes(value: Any, prefix: str = "") -> List[str]:
+    """other_attributes → ["parking: free for members", "courts indoor: 4", ...]"""
+    if isinstance(value, dict):
+        lines = []
+        for key, item in value.items():
+            label = f"{prefix} {key}".replace("_", " ").strip()
+            lines.extend(flatten_attributes(item, label))
+        return lines
+    if isinstance(value, (list, tuple)):
+        return [line for item in value for line in flatten_attributes(item, prefix)]
+    if value is None or value == "":
+        return []
+    return [f"{prefix}: {value}" if prefix else str(value)]
+
+
+def _join(parts: Iterable[Optional[str]], sep: str) -> Optional[str]:
+    text = sep.join(part.strip() for part in parts if part and part.strip())
+    return text or None
+
+
+def search_fields(listing: Any, entity: Any, sports: Iterable[str] = ()) -> Dict[str, Optional[str]]:
+    keywords = [*(listing.categories or []), *(listing.canonical_categories or [])]
+    keywords += [sport.replace("_", " ") for sport in sports]
+    keywords.append(listing.city)
+
+    body = [listing.summary]
+    if entity is not None:
+        body += [
+            getattr(entity, name) for name in type(entity).model_fields
+            if name.endswith("_summary") and isinstance(getattr(entity, name), str)
+        ]
+    body += flatten_attributes(listing.other_attributes or {})
+
+    return {
+        "search_keywords": _join(dict.fromkeys(keywords), " "),
+        "search_body": _join(body, "\n"),
+    }